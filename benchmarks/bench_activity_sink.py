@@ -0,0 +1,151 @@
+"""
+Benchmark: write-endpoint latency per activity sink mode.
+
+Sends ``PATCH /api/v1/deals/{id}`` requests that change status and stage
+(two activities each) through the application, ``--concurrency`` at a
+time, once per ``ACTIVITY_SINK_MODE``. In ``outbox`` mode the outbox
+worker runs alongside, as it would in the application.
+
+Usage:
+    poetry run python benchmarks/bench_activity_sink.py --requests 2000 --concurrency 16
+
+Uses DATABASE_URL; the seeded organization is removed afterwards.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from app.core.activity_sink import activity_sink
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import async_session_factory, engine
+from app.main import app
+from app.services.activity_outbox import activity_outbox_worker
+
+MODES = ("direct", "commit", "outbox")
+
+SEED_SQL = """
+WITH org AS (
+    INSERT INTO organizations (name) VALUES ('bench-activity-sink') RETURNING id
+), usr AS (
+    INSERT INTO users (email, hashed_password, name)
+    VALUES ('bench-activity-sink-' || md5(random()::text) || '@example.com', 'x', 'bench')
+    RETURNING id
+), member AS (
+    INSERT INTO organization_members (organization_id, user_id, role)
+    SELECT org.id, usr.id, 'owner' FROM org, usr RETURNING organization_id, user_id
+), contact AS (
+    INSERT INTO contacts (organization_id, owner_id, name)
+    SELECT organization_id, user_id, 'bench' FROM member
+    RETURNING id, organization_id, owner_id
+)
+INSERT INTO deals (organization_id, contact_id, owner_id, title, amount, currency, status, stage)
+SELECT c.organization_id, c.id, c.owner_id, 'deal ' || g, 1000, 'USD', 'new', 'qualification'
+FROM contact c, generate_series(1, :deals) AS g
+RETURNING id, organization_id, owner_id
+"""
+
+# Alternating bodies, so every request changes both status and stage
+BODIES = (
+    {"status": "in_progress", "stage": "proposal"},
+    {"status": "new", "stage": "qualification"},
+)
+
+
+async def run_mode(
+    client: AsyncClient,
+    deal_ids: list[int],
+    requests: int,
+    concurrency: int,
+) -> list[float]:
+    timings: list[float] = []
+
+    # One deal per concurrent sender, so requests don't wait on row locks
+    async def send(deal_id: int, count: int) -> None:
+        for body in itertools.islice(itertools.cycle(BODIES), count):
+            started = time.perf_counter()
+            response = await client.patch(f"/api/v1/deals/{deal_id}", json=body)
+            timings.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+
+    per_sender = requests // concurrency
+    await asyncio.gather(*(send(deal_id, per_sender) for deal_id in deal_ids))
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+
+    def percentile(p: float) -> float:
+        return timings[max(int(len(timings) * p) - 1, 0)]
+
+    print(
+        f"{name:<8} p50={statistics.median(timings):7.2f} ms  "
+        f"p95={percentile(0.95):7.2f} ms  p99={percentile(0.99):7.2f} ms  "
+        f"mean={statistics.fmean(timings):7.2f} ms"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    async with async_session_factory() as session:
+        rows = (await session.execute(
+            text(SEED_SQL), {"deals": concurrency}
+        )).all()
+        await session.commit()
+    org_id, user_id = rows[0].organization_id, rows[0].owner_id
+    deal_ids = [row.id for row in rows]
+
+    headers = {
+        "Authorization": f"Bearer {create_access_token(subject=user_id)}",
+        "X-Organization-Id": str(org_id),
+    }
+    print(
+        f"{requests} requests, concurrency {concurrency}, "
+        f"batch size {settings.ACTIVITY_SINK_BATCH_SIZE}"
+    )
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://bench",
+            headers=headers,
+        ) as client:
+            for mode in MODES:
+                activity_sink.mode = mode
+                if mode == "outbox":
+                    activity_outbox_worker.start()
+                await run_mode(client, deal_ids, concurrency * 4, concurrency)  # warm up
+                timings = await run_mode(client, deal_ids, requests, concurrency)
+                if mode == "outbox":
+                    await activity_outbox_worker.close()
+                report(mode, timings)
+    finally:
+        async with async_session_factory() as session:
+            await session.execute(
+                text(
+                    "DELETE FROM activity_outbox WHERE deal_id IN "
+                    "(SELECT id FROM deals WHERE organization_id = :id)"
+                ),
+                {"id": org_id},
+            )
+            await session.execute(
+                text("DELETE FROM organizations WHERE id = :id"), {"id": org_id}
+            )
+            await session.execute(
+                text("DELETE FROM users WHERE email LIKE 'bench-activity-sink-%'")
+            )
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,113 @@
+"""
+Benchmark: deals summary cache-miss latency.
+
+Compares the single aggregate query (``DealRepository.get_summary``)
+with the previous three round trips (by-status summary, won average and
+new-deals count) on a seeded organization.
+
+Usage:
+    poetry run python benchmarks/bench_analytics_summary.py --deals 100000
+
+Uses DATABASE_URL; the seeded organization is removed afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, func, select, text
+
+from app.db.session import async_session_factory, engine
+from app.models.deal import Deal
+from app.repositories.deal import DealRepository
+
+SEED_SQL = """
+WITH org AS (
+    INSERT INTO organizations (name) VALUES ('bench-summary') RETURNING id
+), usr AS (
+    INSERT INTO users (email, hashed_password, name)
+    VALUES ('bench-summary-' || md5(random()::text) || '@example.com', 'x', 'bench')
+    RETURNING id
+), contact AS (
+    INSERT INTO contacts (organization_id, owner_id, name)
+    SELECT org.id, usr.id, 'bench' FROM org, usr RETURNING id, organization_id, owner_id
+)
+INSERT INTO deals (
+    organization_id, contact_id, owner_id, title, amount, currency,
+    status, stage, created_at
+)
+SELECT c.organization_id, c.id, c.owner_id, 'deal ' || g,
+       (random() * 10000)::numeric(15, 2), 'USD',
+       (ARRAY['new', 'in_progress', 'won', 'lost'])[1 + g % 4],
+       (ARRAY['qualification', 'proposal', 'negotiation', 'closed'])[1 + g % 4],
+       now() - (g % 365) * interval '1 day'
+FROM contact c, generate_series(1, :deals) AS g
+RETURNING organization_id
+"""
+
+
+async def three_queries(repo: DealRepository, org_id: int, since: datetime) -> None:
+    await repo.get_summary_by_status(org_id)
+    await repo.get_avg_won_amount(org_id)
+    query = select(func.count()).select_from(Deal).where(
+        and_(Deal.organization_id == org_id, Deal.created_at >= since)
+    )
+    await repo.session.execute(query)
+
+
+async def single_query(repo: DealRepository, org_id: int, since: datetime) -> None:
+    await repo.get_summary(org_id, since)
+
+
+async def measure(fn, repo, org_id, since, iterations: int) -> list[float]:
+    await fn(repo, org_id, since)  # warm up
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn(repo, org_id, since)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<14} p50={statistics.median(timings):8.2f} ms  "
+        f"p95={p95:8.2f} ms  mean={statistics.fmean(timings):8.2f} ms"
+    )
+
+
+async def main(deals: int, iterations: int) -> None:
+    async with async_session_factory() as session:
+        result = await session.execute(text(SEED_SQL), {"deals": deals})
+        org_id = result.scalars().first()
+        await session.commit()
+        await session.execute(text("ANALYZE deals"))
+
+        try:
+            repo = DealRepository(session)
+            since = datetime.now(UTC) - timedelta(days=30)
+            print(f"organization {org_id}: {deals} deals, {iterations} iterations")
+            report("three queries", await measure(three_queries, repo, org_id, since, iterations))
+            report("single query", await measure(single_query, repo, org_id, since, iterations))
+        finally:
+            await session.execute(
+                text("DELETE FROM organizations WHERE id = :id"), {"id": org_id}
+            )
+            await session.execute(
+                text("DELETE FROM users WHERE email LIKE 'bench-summary-%'")
+            )
+            await session.commit()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--deals", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.deals, args.iterations))
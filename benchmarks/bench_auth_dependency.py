@@ -0,0 +1,63 @@
+"""
+Microbenchmark: auth dependency overhead per request.
+
+Times ``get_access_token_payload`` and ``get_current_user`` (token
+verification, the revocation check and the principal cache lookup) with
+the verified token cache on and off. The user is in the principal cache,
+as for most requests, so no database query is made.
+
+Usage:
+    poetry run python benchmarks/bench_auth_dependency.py --iterations 50000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+
+from app.api.v1.dependencies import get_access_token_payload, get_current_user
+from app.core import security
+from app.core.cache import SimpleCache
+from app.core.principal_cache import principal_cache
+from app.core.revocation import token_revocations
+from app.core.security import create_access_token
+from app.core.token_cache import TokenCache
+from app.models.user import User
+
+
+async def authenticate(authorization: str) -> User:
+    payload = await get_access_token_payload(authorization=authorization)
+    return await get_current_user(payload=payload, session=None)
+
+
+async def measure(authorization: str, iterations: int) -> float:
+    """Mean microseconds per authenticated request."""
+    for _ in range(1000):  # warm up
+        await authenticate(authorization)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await authenticate(authorization)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+async def main(iterations: int) -> None:
+    await principal_cache.set_user(User(
+        id=1, email="bench@example.com", name="bench", created_at=datetime.now(UTC),
+    ))
+    authorization = f"Bearer {create_access_token(subject=1)}"
+
+    for name, cache in (
+        ("off", TokenCache(None)),
+        ("on", TokenCache(SimpleCache(max_entries=10_000))),
+    ):
+        cache.add_check(token_revocations.check)
+        security.token_cache = cache
+        per_call = await measure(authorization, iterations)
+        print(f"token cache {name:<3} {per_call:7.2f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,105 @@
+"""
+Benchmark: contact search latency per search backend.
+
+Runs a search page (list + count, as ContactService.get_contacts does)
+with each backend on a seeded organization. The trigram backend is
+skipped when pg_trgm isn't installed.
+
+Usage:
+    poetry run python benchmarks/bench_contact_search.py --contacts 1000000
+
+Uses DATABASE_URL (migrated to head); the seeded organization is removed
+afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.db.session import async_session_factory, engine
+from app.repositories.contact import ContactRepository
+from app.repositories.contact_search import CONTACT_SEARCH_BACKENDS, get_contact_search
+
+SEED_SQL = """
+WITH org AS (
+    INSERT INTO organizations (name) VALUES ('bench-search') RETURNING id
+), usr AS (
+    INSERT INTO users (email, hashed_password, name)
+    VALUES ('bench-search-' || md5(random()::text) || '@example.com', 'x', 'bench')
+    RETURNING id
+)
+INSERT INTO contacts (organization_id, owner_id, name, email)
+SELECT org.id, usr.id,
+       (ARRAY['John', 'Mary', 'Alex', 'Olga', 'Ivan', 'Kate', 'Li', 'Sam'])[1 + g % 8]
+       || ' ' || 'Surname' || (g % 50000),
+       'user' || g || '@' || (ARRAY['acme.io', 'example.com', 'mail.org'])[1 + g % 3]
+FROM org, usr, generate_series(1, :contacts) AS g
+RETURNING organization_id
+"""
+
+TERMS = ["john", "surname123", "acme", "user99999"]
+
+
+async def measure(repo: ContactRepository, org_id: int, iterations: int) -> list[float]:
+    async def search_page(term: str) -> None:
+        await repo.get_by_organization(org_id, limit=20, search=term)
+        await repo.count_by_organization(org_id, search=term)
+
+    for term in TERMS:  # warm up
+        await search_page(term)
+    timings = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        await search_page(TERMS[i % len(TERMS)])
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<10} p50={statistics.median(timings):8.2f} ms  "
+        f"p95={p95:8.2f} ms  mean={statistics.fmean(timings):8.2f} ms"
+    )
+
+
+async def main(contacts: int, iterations: int) -> None:
+    async with async_session_factory() as session:
+        result = await session.execute(text(SEED_SQL), {"contacts": contacts})
+        org_id = result.scalars().first()
+        await session.commit()
+        await session.execute(text("ANALYZE contacts"))
+        trigram = await session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        )
+        backends = list(CONTACT_SEARCH_BACKENDS)
+        if trigram.first() is None:
+            backends.remove("trigram")
+
+        try:
+            print(f"organization {org_id}: {contacts} contacts, {iterations} iterations")
+            for backend in backends:
+                repo = ContactRepository(session, search=get_contact_search(backend))
+                report(backend, await measure(repo, org_id, iterations))
+        finally:
+            await session.execute(
+                text("DELETE FROM organizations WHERE id = :id"), {"id": org_id}
+            )
+            await session.execute(
+                text("DELETE FROM users WHERE email LIKE 'bench-search-%'")
+            )
+            await session.commit()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main(args.contacts, args.iterations))
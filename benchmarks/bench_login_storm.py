@@ -0,0 +1,155 @@
+"""
+Benchmark: request latency during a login storm.
+
+Runs ``--logins`` concurrent login loops against the application for
+``--duration`` seconds while probing ``GET /health`` and
+``GET /api/v1/deals``, once with bcrypt inline on the event loop (as
+before the password hashing pool) and once on the pool. Reports probe
+latency and login throughput.
+
+Usage:
+    poetry run python benchmarks/bench_login_storm.py --logins 32 --duration 10
+
+Uses DATABASE_URL; the seeded organization and user are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import math
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+import app.services.auth as auth_service
+from app.core.password_hasher import password_hasher
+from app.core.security import create_access_token, hash_password, verify_password
+from app.db.session import async_session_factory, engine
+from app.main import app
+
+PASSWORD = "bench-password"
+
+SEED_SQL = """
+WITH org AS (
+    INSERT INTO organizations (name) VALUES ('bench-login-storm') RETURNING id
+), usr AS (
+    INSERT INTO users (email, hashed_password, name)
+    VALUES ('bench-login-storm@example.com', :hashed, 'bench')
+    RETURNING id
+), member AS (
+    INSERT INTO organization_members (organization_id, user_id, role)
+    SELECT org.id, usr.id, 'owner' FROM org, usr RETURNING organization_id, user_id
+), contact AS (
+    INSERT INTO contacts (organization_id, owner_id, name)
+    SELECT organization_id, user_id, 'bench' FROM member
+    RETURNING id, organization_id, owner_id
+)
+INSERT INTO deals (organization_id, contact_id, owner_id, title, amount, currency, status, stage)
+SELECT c.organization_id, c.id, c.owner_id, 'deal ' || g, 1000, 'USD', 'new', 'qualification'
+FROM contact c, generate_series(1, 50) AS g
+RETURNING organization_id, owner_id
+"""
+
+
+class InlineHasher:
+    """bcrypt on the event loop, as AuthService did before the pool."""
+
+    async def hash(self, password: str) -> str:
+        return hash_password(password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return verify_password(plain_password, hashed_password)
+
+
+def percentile(timings: list[float], p: float) -> float:
+    timings = sorted(timings)
+    return timings[max(math.ceil(len(timings) * p) - 1, 0)]
+
+
+async def storm(
+    client: AsyncClient,
+    headers: dict[str, str],
+    logins: int,
+    duration: float,
+) -> None:
+    deadline = time.perf_counter() + duration
+    statuses: dict[int, int] = {}
+    probes: dict[str, list[float]] = {"/health": [], "/api/v1/deals": []}
+
+    async def login() -> None:
+        while time.perf_counter() < deadline:
+            response = await client.post(
+                "/api/v1/auth/login",
+                json={"email": "bench-login-storm@example.com", "password": PASSWORD},
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 503:
+                await asyncio.sleep(0.05)
+
+    async def probe() -> None:
+        while time.perf_counter() < deadline:
+            for path, timings in probes.items():
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                timings.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(probe(), *(login() for _ in range(logins)))
+
+    for path, timings in probes.items():
+        print(
+            f"  {path:<14} n={len(timings):5d}  "
+            f"p50={statistics.median(timings):8.2f} ms  "
+            f"p99={percentile(timings, 0.99):8.2f} ms"
+        )
+    print(
+        f"  logins/s={statuses.get(200, 0) / duration:7.1f}  "
+        f"refused (503)={statuses.get(503, 0)}"
+    )
+
+
+async def main(logins: int, duration: float) -> None:
+    async with async_session_factory() as session:
+        row = (await session.execute(
+            text(SEED_SQL), {"hashed": hash_password(PASSWORD)}
+        )).first()
+        await session.commit()
+
+    headers = {
+        "Authorization": f"Bearer {create_access_token(subject=row.owner_id)}",
+        "X-Organization-Id": str(row.organization_id),
+    }
+    print(
+        f"{logins} concurrent logins for {duration:g} s, "
+        f"{password_hasher.workers} hashing threads"
+    )
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            for name, hasher in (("inline", InlineHasher()), ("pool", password_hasher)):
+                auth_service.password_hasher = hasher
+                print(name)
+                await storm(client, headers, logins, duration)
+    finally:
+        password_hasher.close()
+        async with async_session_factory() as session:
+            await session.execute(
+                text("DELETE FROM organizations WHERE id = :id"),
+                {"id": row.organization_id},
+            )
+            await session.execute(
+                text("DELETE FROM users WHERE id = :id"), {"id": row.owner_id}
+            )
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.duration))
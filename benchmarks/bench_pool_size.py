@@ -0,0 +1,176 @@
+"""
+Load test: throughput and latency by connection pool size.
+
+Runs ``--concurrency`` concurrent request loops (``GET /api/v1/deals`` and
+``GET /api/v1/contacts``) against one application worker for
+``--duration`` seconds per pool size in ``--pool-sizes``, with no overflow.
+Reports requests/s, latency and the pool's checkout wait and timeouts, so
+the smallest pool that doesn't make requests queue for connections can be
+read off. With ``--workers``, also prints the total connections
+(``workers * pool size``) against the server's ``max_connections``.
+
+Usage:
+    poetry run python benchmarks/bench_pool_size.py --concurrency 32 \\
+        --pool-sizes 1,2,4,8,16 --duration 10 --workers 4
+
+Uses DATABASE_URL; the seeded organization and user are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import math
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.security import create_access_token, hash_password
+from app.db.session import async_session_factory, engine, engine_options, get_session
+from app.main import app
+
+PATHS = ("/api/v1/deals", "/api/v1/contacts")
+
+SEED_SQL = """
+WITH org AS (
+    INSERT INTO organizations (name) VALUES ('bench-pool-size') RETURNING id
+), usr AS (
+    INSERT INTO users (email, hashed_password, name)
+    VALUES ('bench-pool-size@example.com', :hashed, 'bench')
+    RETURNING id
+), member AS (
+    INSERT INTO organization_members (organization_id, user_id, role)
+    SELECT org.id, usr.id, 'owner' FROM org, usr RETURNING organization_id, user_id
+), contact AS (
+    INSERT INTO contacts (organization_id, owner_id, name)
+    SELECT organization_id, user_id, 'bench ' || g FROM member, generate_series(1, 50) AS g
+    RETURNING id, organization_id, owner_id
+)
+INSERT INTO deals (organization_id, contact_id, owner_id, title, amount, currency, status, stage)
+SELECT c.organization_id, c.id, c.owner_id, 'deal ' || c.id, 1000, 'USD', 'new', 'qualification'
+FROM contact c
+RETURNING organization_id, owner_id
+"""
+
+
+def percentile(timings: list[float], p: float) -> float:
+    timings = sorted(timings)
+    return timings[max(math.ceil(len(timings) * p) - 1, 0)]
+
+
+async def run(
+    headers: dict[str, str],
+    pool_size: int,
+    concurrency: int,
+    duration: float,
+) -> None:
+    pool_engine = create_async_engine(
+        settings.DATABASE_URL,
+        **engine_options(settings.model_copy(update={
+            "DB_POOL_SIZE": pool_size,
+            "DB_MAX_OVERFLOW": 0,
+        })),
+    )
+    factory = async_sessionmaker(
+        bind=pool_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False,
+    )
+
+    async def pool_session():
+        async with factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_session] = pool_session
+    timings: list[float] = []
+    errors = 0
+
+    async def loop(client: AsyncClient, offset: int) -> None:
+        nonlocal errors
+        deadline = time.perf_counter() + duration
+        i = offset
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(PATHS[i % len(PATHS)], headers=headers)
+            if response.status_code == 200:
+                timings.append((time.perf_counter() - started) * 1000)
+            else:
+                errors += 1
+            i += 1
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://bench",
+        ) as client:
+            await asyncio.gather(*(loop(client, i) for i in range(concurrency)))
+        stats = pool_engine.pool.stats()
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+        await pool_engine.dispose()
+
+    print(
+        f"  pool={pool_size:3d}  req/s={len(timings) / duration:7.1f}  "
+        f"p50={statistics.median(timings):7.2f} ms  "
+        f"p99={percentile(timings, 0.99):8.2f} ms  "
+        f"wait avg={stats['wait_ms_avg']:7.2f} ms  max={stats['wait_ms_max']:8.2f} ms  "
+        f"timeouts={stats['timeouts']:.0f}  errors={errors}"
+    )
+
+
+async def main(
+    concurrency: int,
+    pool_sizes: list[int],
+    duration: float,
+    workers: int,
+) -> None:
+    async with async_session_factory() as session:
+        row = (await session.execute(
+            text(SEED_SQL), {"hashed": hash_password("bench-password")}
+        )).first()
+        max_connections = (await session.execute(text("SHOW max_connections"))).scalar()
+        await session.commit()
+
+    headers = {
+        "Authorization": f"Bearer {create_access_token(subject=row.owner_id)}",
+        "X-Organization-Id": str(row.organization_id),
+    }
+    print(f"{concurrency} concurrent requests per worker for {duration:g} s per pool size")
+    try:
+        for pool_size in pool_sizes:
+            await run(headers, pool_size, concurrency, duration)
+    finally:
+        async with async_session_factory() as session:
+            await session.execute(
+                text("DELETE FROM organizations WHERE id = :id"),
+                {"id": row.organization_id},
+            )
+            await session.execute(
+                text("DELETE FROM users WHERE id = :id"), {"id": row.owner_id}
+            )
+            await session.commit()
+        await engine.dispose()
+
+    print(f"{workers} workers, max_connections={max_connections}")
+    for pool_size in pool_sizes:
+        print(f"  pool={pool_size:3d}  connections={workers * pool_size:5d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--pool-sizes", default="1,2,4,8,16")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(
+        args.concurrency,
+        [int(size) for size in args.pool_sizes.split(",")],
+        args.duration,
+        args.workers,
+    ))
@@ -12,6 +12,7 @@ from app.models import (  # noqa: F401
     Activity,
     Contact,
     Deal,
+    DealStats,
     Organization,
     OrganizationMember,
     Task,
@@ -0,0 +1,45 @@
+"""Add contact search indexes
+
+Revision ID: 682135dd2620
+Revises: d9376669294a
+Create Date: 2026-10-17 05:06:03.384005
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '682135dd2620'
+down_revision: Union[str, Sequence[str], None] = 'd9376669294a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trigram indexes back CONTACT_SEARCH_BACKEND=trigram; skipped where
+    # pg_trgm isn't available (the other backends don't need it, and the
+    # app refuses to start with trigram search but no extension)
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first()
+    if available is not None:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Build indexes without blocking writes. The full-text document is an
+    # expression index: a stored generated column would rewrite contacts
+    # under an exclusive lock.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_search_document', 'contacts', [sa.text("to_tsvector('simple'::regconfig, name || ' ' || coalesce(email, '') || ' ' || translate(coalesce(email, ''), '@.', '  '))")], unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+        if available is not None:
+            op.create_index('ix_contacts_email_trgm', 'contacts', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+            op.create_index('ix_contacts_name_trgm', 'contacts', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_search_document', table_name='contacts', postgresql_using='gin')
+    op.drop_index('ix_contacts_name_trgm', table_name='contacts', if_exists=True)
+    op.drop_index('ix_contacts_email_trgm', table_name='contacts', if_exists=True)
@@ -0,0 +1,34 @@
+"""Add activity timeline index
+
+Revision ID: a7d2c4e9f318
+Revises: 3c5e8f1a2b47
+Create Date: 2026-10-17 06:41:09.274615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2c4e9f318'
+down_revision: Union[str, Sequence[str], None] = '3c5e8f1a2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the index without blocking writes, then drop the deal_id index
+    # it replaces (its prefix)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_activities_deal_created_at', 'activities', ['deal_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+    op.drop_index(op.f('ix_activities_deal_id'), table_name='activities')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_activities_deal_id'), 'activities', ['deal_id'], unique=False)
+    op.drop_index('ix_activities_deal_created_at', table_name='activities')
@@ -0,0 +1,28 @@
+"""Add user membership version
+
+Revision ID: b5f1d3a7c824
+Revises: e4b8f2a6c913
+Create Date: 2026-10-17 14:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f1d3a7c824'
+down_revision: Union[str, Sequence[str], None] = 'e4b8f2a6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('membership_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'membership_version')
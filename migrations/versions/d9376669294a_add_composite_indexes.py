@@ -0,0 +1,55 @@
+"""Add composite indexes for tenant-scoped queries
+
+Revision ID: d9376669294a
+Revises: 8bfe30d84b7a
+Create Date: 2026-10-17 05:02:34.807699
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9376669294a'
+down_revision: Union[str, Sequence[str], None] = '8bfe30d84b7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build indexes without blocking writes, and before dropping the
+    # single-column indexes they replace (which are their prefixes)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_org_owner', 'contacts', ['organization_id', 'owner_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_deals_org_amount', 'deals', ['organization_id', 'amount', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_deals_org_created_at', 'deals', ['organization_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_deals_org_owner_created_at', 'deals', ['organization_id', 'owner_id', sa.literal_column('created_at DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_deals_org_stage_status', 'deals', ['organization_id', 'stage', 'status'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_deals_org_status_created_at', 'deals', ['organization_id', 'status', sa.literal_column('created_at DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_deals_org_updated_at', 'deals', ['organization_id', sa.literal_column('updated_at DESC'), sa.literal_column('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_deal_due_date', 'tasks', ['deal_id', 'due_date'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_open_deal_due_date', 'tasks', ['deal_id', 'due_date'], unique=False, postgresql_where=sa.text('NOT is_done'), postgresql_concurrently=True, if_not_exists=True)
+
+    op.drop_index(op.f('ix_contacts_organization_id'), table_name='contacts')
+    op.drop_index(op.f('ix_deals_organization_id'), table_name='deals')
+    op.drop_index(op.f('ix_tasks_deal_id'), table_name='tasks')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_tasks_deal_id'), 'tasks', ['deal_id'], unique=False)
+    op.create_index(op.f('ix_deals_organization_id'), 'deals', ['organization_id'], unique=False)
+    op.create_index(op.f('ix_contacts_organization_id'), 'contacts', ['organization_id'], unique=False)
+
+    op.drop_index('ix_tasks_open_deal_due_date', table_name='tasks', postgresql_where=sa.text('NOT is_done'))
+    op.drop_index('ix_tasks_deal_due_date', table_name='tasks')
+    op.drop_index('ix_deals_org_updated_at', table_name='deals')
+    op.drop_index('ix_deals_org_status_created_at', table_name='deals')
+    op.drop_index('ix_deals_org_stage_status', table_name='deals')
+    op.drop_index('ix_deals_org_owner_created_at', table_name='deals')
+    op.drop_index('ix_deals_org_created_at', table_name='deals')
+    op.drop_index('ix_deals_org_amount', table_name='deals')
+    op.drop_index('ix_contacts_org_owner', table_name='contacts')
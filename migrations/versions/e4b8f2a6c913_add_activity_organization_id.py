@@ -0,0 +1,110 @@
+"""Add activity organization_id
+
+Revision ID: e4b8f2a6c913
+Revises: a7d2c4e9f318
+Create Date: 2026-10-17 08:12:37.519204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8f2a6c913'
+down_revision: Union[str, Sequence[str], None] = 'a7d2c4e9f318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+INDEX_COLUMNS = "organization_id, created_at DESC, id DESC"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('activities', sa.Column('organization_id', sa.Integer(), nullable=True))
+    op.add_column('activity_outbox', sa.Column('organization_id', sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    # activities may be partitioned (app.db.activity_partitions), which
+    # rules out CONCURRENTLY and NOT VALID foreign keys on the table itself
+    partitions = bind.execute(
+        sa.text(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = 'activities'::regclass ORDER BY 1"
+        )
+    ).scalars().all()
+    partitioned = bind.execute(
+        sa.text("SELECT relkind = 'p' FROM pg_class WHERE oid = 'activities'::regclass")
+    ).scalar()
+
+    # Every step commits on its own, so no lock is held across the backfill
+    # or the validation scans, and NOT NULL is set without a scan of its own
+    with op.get_context().autocommit_block():
+        # Queued outbox rows of deleted deals would be dropped by the worker
+        # anyway
+        for table in ('activities', 'activity_outbox'):
+            backfill_organization_id(table)
+        op.execute("DELETE FROM activity_outbox WHERE organization_id IS NULL")
+
+        for table in ('activities', 'activity_outbox'):
+            set_not_null(table)
+
+        if partitioned:
+            # Per partition, then the parent adopts the validated foreign
+            # keys and attaches the indexes
+            op.execute(f"CREATE INDEX IF NOT EXISTS ix_activities_organization_created_at ON ONLY activities ({INDEX_COLUMNS})")
+            for partition in partitions:
+                add_organization_fk(partition, f'{partition}_organization_id_fkey')
+                index = f'{partition}_organization_created_at_idx'
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {partition} ({INDEX_COLUMNS})")
+                op.execute(f"ALTER INDEX ix_activities_organization_created_at ATTACH PARTITION {index}")
+            op.create_foreign_key('activities_organization_id_fkey', 'activities', 'organizations', ['organization_id'], ['id'], ondelete='CASCADE')
+        else:
+            add_organization_fk('activities', 'activities_organization_id_fkey')
+            op.create_index('ix_activities_organization_created_at', 'activities', ['organization_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def backfill_organization_id(table: str) -> None:
+    """Copy organization_id from the deals, one id range per transaction."""
+    bind = op.get_bind()
+    low, high = bind.execute(sa.text(f"SELECT min(id), max(id) FROM {table}")).one()
+    if low is None:
+        return
+    for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+        bind.execute(
+            sa.text(
+                f"""
+                UPDATE {table}
+                SET organization_id = deals.organization_id
+                FROM deals
+                WHERE deals.id = {table}.deal_id
+                  AND {table}.id >= :start AND {table}.id < :stop
+                  AND {table}.organization_id IS NULL
+                """
+            ),
+            {"start": start, "stop": start + BACKFILL_BATCH_SIZE},
+        )
+
+
+def set_not_null(table: str) -> None:
+    """SET NOT NULL behind a validated CHECK, which spares its full-lock scan."""
+    check = f'{table}_organization_id_not_null'
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {check} CHECK (organization_id IS NOT NULL) NOT VALID")
+    op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}")
+    op.alter_column(table, 'organization_id', existing_type=sa.Integer(), nullable=False)
+    op.drop_constraint(check, table, type_='check')
+
+
+def add_organization_fk(table: str, name: str) -> None:
+    """Add the organizations foreign key NOT VALID, then validate it."""
+    op.create_foreign_key(name, table, 'organizations', ['organization_id'], ['id'], ondelete='CASCADE', postgresql_not_valid=True)
+    op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activities_organization_created_at', table_name='activities')
+    op.drop_column('activity_outbox', 'organization_id')
+    op.drop_column('activities', 'organization_id')
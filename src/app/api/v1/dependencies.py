@@ -1,4 +1,23 @@
-from typing import Annotated
+"""
+Request dependencies.
+
+FastAPI resolves each dependency callable once per request and reuses the
+result for every parameter that depends on it (``use_cache=True``, the
+default). So although ``CurrentMembership``, ``OrganizationId`` and
+``DbSession`` are declared side by side, a request opens one session and
+authenticates once. All of them derive from ``get_request_context``, which
+loads the user, checks the ``X-Organization-Id`` header and loads the
+membership in one place.
+
+With ``TOKEN_MEMBERSHIP_CLAIMS`` on, access tokens carry the user's role in
+each organization (``orgs``) and the membership version they were issued at
+(``mv``). While ``mv`` matches the user's current version, the membership
+comes from the token; otherwise (a role changed since the token was issued)
+it's loaded as usual until the client refreshes its tokens.
+"""
+
+from dataclasses import dataclass
+from typing import Annotated, Any
 
 from fastapi import Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,19 +26,20 @@ from app.core.exceptions import (
     OrganizationAccessDeniedException,
     UnauthorizedException,
 )
+from app.core.principal_cache import principal_cache
 from app.core.security import verify_access_token
 from app.db.session import get_session
+from app.models.enums import OrganizationRole
 from app.models.organization_member import OrganizationMember
 from app.models.user import User
 from app.repositories.organization import OrganizationMemberRepository
 from app.repositories.user import UserRepository
 
 
-async def get_current_user(
+async def get_access_token_payload(
         authorization: Annotated[str | None, Header()] = None,
-        session: AsyncSession = Depends(get_session),
-) -> User:
-    """Get current authenticated user from JWT token."""
+) -> dict[str, Any]:
+    """Get the verified payload of the request's access token."""
     if not authorization:
         raise UnauthorizedException()
 
@@ -28,16 +48,26 @@ async def get_current_user(
     if len(parts) != 2 or parts[0].lower() != "bearer":
         raise UnauthorizedException(message="Invalid authorization header")
 
-    token = parts[1]
-    payload = verify_access_token(token)
+    return verify_access_token(parts[1])
+
 
+async def get_current_user(
+        payload: Annotated[dict[str, Any], Depends(get_access_token_payload)],
+        session: AsyncSession = Depends(get_session),
+) -> User:
+    """Get current authenticated user from JWT token."""
     user_id = int(payload["sub"])
+    user = await principal_cache.get_user(user_id)
+    if user:
+        return user
+
     user_repo = UserRepository(session)
     user = await user_repo.get_by_id(user_id)
 
     if not user:
         raise UnauthorizedException(message="User not found")
 
+    await principal_cache.set_user(user)
     return user
 
 
@@ -48,12 +78,57 @@ async def get_organization_id_header(
     return x_organization_id
 
 
-async def get_current_membership(
+@dataclass
+class RequestContext:
+    """Authenticated principal of an organization-scoped request."""
+
+    user: User
+    membership: OrganizationMember
+    session: AsyncSession
+
+    @property
+    def organization_id(self) -> int:
+        return self.membership.organization_id
+
+
+def membership_from_claims(
+        payload: dict[str, Any],
+        user: User,
+        organization_id: int,
+) -> OrganizationMember | None:
+    """
+    Membership signed into the access token, if its claims are current.
+
+    Returns None if the token has no membership claims or they predate the
+    user's last membership change.
+
+    Raises:
+        OrganizationAccessDeniedException: If current claims have no role
+            in the organization
+    """
+    roles = payload.get("orgs")
+    if roles is None or payload.get("mv") != user.membership_version:
+        return None
+
+    role = roles.get(str(organization_id))
+    if role is None:
+        raise OrganizationAccessDeniedException()
+
+    # Not loaded from the database, so it has no id
+    return OrganizationMember(
+        organization_id=organization_id,
+        user_id=user.id,
+        role=OrganizationRole(role),
+    )
+
+
+async def get_request_context(
+        payload: Annotated[dict[str, Any], Depends(get_access_token_payload)],
         current_user: Annotated[User, Depends(get_current_user)],
         organization_id: Annotated[int | None, Depends(get_organization_id_header)],
         session: AsyncSession = Depends(get_session),
-) -> OrganizationMember:
-    """Get current user's membership in the organization.
+) -> RequestContext:
+    """Resolve the user, organization and membership of a request.
 
     Auth check (401) happens first via get_current_user dependency.
     Then org access check (403) happens here.
@@ -64,32 +139,42 @@ async def get_current_membership(
             message="X-Organization-Id header is required"
         )
 
-    member_repo = OrganizationMemberRepository(session)
-    membership = await member_repo.get_membership(
-        organization_id,
-        current_user.id
-    )
-
+    membership = membership_from_claims(payload, current_user, organization_id)
     if not membership:
-        raise OrganizationAccessDeniedException()
+        membership = await principal_cache.get_membership(
+            current_user.id, organization_id
+        )
+    if not membership:
+        member_repo = OrganizationMemberRepository(session)
+        membership = await member_repo.get_membership(
+            organization_id,
+            current_user.id
+        )
+
+        if not membership:
+            raise OrganizationAccessDeniedException()
 
-    return membership
+        await principal_cache.set_membership(membership)
+
+    return RequestContext(user=current_user, membership=membership, session=session)
+
+
+async def get_current_membership(
+        context: Annotated[RequestContext, Depends(get_request_context)],
+) -> OrganizationMember:
+    """Get current user's membership in the organization."""
+    return context.membership
 
 
-# For endpoints that only need org_id (after auth check)
 async def get_organization_id(
-        current_user: Annotated[User, Depends(get_current_user)],
-        organization_id: Annotated[int | None, Depends(get_organization_id_header)],
+        context: Annotated[RequestContext, Depends(get_request_context)],
 ) -> int:
-    """Get organization ID, ensuring user is authenticated first."""
-    if not organization_id:
-        raise OrganizationAccessDeniedException(
-            message="X-Organization-Id header is required"
-        )
-    return organization_id
+    """Get organization ID of a verified membership."""
+    return context.organization_id
 
 
 # Type aliases for cleaner dependency injection
+AccessTokenPayload = Annotated[dict[str, Any], Depends(get_access_token_payload)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 OrganizationId = Annotated[int, Depends(get_organization_id)]
 CurrentMembership = Annotated[OrganizationMember, Depends(get_current_membership)]
@@ -1,4 +1,5 @@
 
+from app.api.v1.endpoints.activities import org_router as org_activities_router
 from app.api.v1.endpoints.activities import router as activities_router
 from app.api.v1.endpoints.analytics import router as analytics_router
 from app.api.v1.endpoints.auth import router as auth_router
@@ -13,6 +14,7 @@ __all__ = [
     "auth_router",
     "contacts_router",
     "deals_router",
+    "org_activities_router",
     "organizations_router",
     "tasks_router",
 ]
\ No newline at end of file
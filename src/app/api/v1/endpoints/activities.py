@@ -1,13 +1,26 @@
-from fastapi import APIRouter, Query
+from datetime import datetime
 
-from app.api.v1.dependencies import CurrentMembership, DbSession, OrganizationId
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies import (
+    CurrentMembership,
+    CurrentUser,
+    DbSession,
+    OrganizationId,
+)
 from app.api.v1.schemas import (
     ActivityCreate,
     ActivityDetailResponse,
     ActivityListResponse,
 )
 from app.api.v1.schemas.user import UserBriefResponse
-from app.core.exceptions import ForbiddenException
+from app.core.config import settings
+from app.core.exceptions import DealNotFoundException, ForbiddenException
+from app.core.exports import ExportFormat, export_response
+from app.core.pagination import Cursor
+from app.models.activity import Activity
 from app.models.enums import ActivityType
 from app.repositories.activity import ActivityRepository
 from app.repositories.deal import DealRepository
@@ -15,6 +28,41 @@ from app.services.deal import DealService
 
 router = APIRouter(prefix="/deals/{deal_id}/activities", tags=["Activities"])
 
+# Organization-wide activity routes
+org_router = APIRouter(prefix="/activities", tags=["Activities"])
+
+
+async def ensure_deal_in_organization(
+    session: AsyncSession,
+    deal_id: int,
+    organization_id: int,
+) -> None:
+    deal_repo = DealRepository(session)
+    owner_id = await deal_repo.get_owner_id_in_organization(deal_id, organization_id)
+
+    if owner_id is None:
+        raise DealNotFoundException()
+
+
+def activity_detail(activity: Activity) -> ActivityDetailResponse:
+    author = None
+    if activity.author:
+        author = UserBriefResponse(
+            id=activity.author.id,
+            name=activity.author.name,
+            email=activity.author.email,
+        )
+
+    return ActivityDetailResponse(
+        id=activity.id,
+        deal_id=activity.deal_id,
+        author_id=activity.author_id,
+        type=activity.type,
+        payload=activity.payload,
+        created_at=activity.created_at,
+        author=author,
+    )
+
 
 @router.get("", response_model=ActivityListResponse)
 async def list_activities(
@@ -24,47 +72,29 @@ async def list_activities(
     session: DbSession,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = None,
 ) -> ActivityListResponse:
-    # Verify deal belongs to organization
-    deal_repo = DealRepository(session)
-    deal = await deal_repo.get_by_id(deal_id)
-
-    if not deal or deal.organization_id != organization_id:
-        from app.core.exceptions import DealNotFoundException
-        raise DealNotFoundException()
-
     activity_repo = ActivityRepository(session)
-    activities = await activity_repo.get_by_deal(
-        deal_id=deal_id,
+    activities = await activity_repo.get_by_deal_in_organization(
+        deal_id,
+        organization_id,
         skip=skip,
         limit=limit,
+        cursor=Cursor.decode(cursor) if cursor else None,
     )
 
-    items = []
-    for activity in activities:
-        author = None
-        if activity.author:
-            author = UserBriefResponse(
-                id=activity.author.id,
-                name=activity.author.name,
-                email=activity.author.email,
-            )
-
-        items.append(
-            ActivityDetailResponse(
-                id=activity.id,
-                deal_id=activity.deal_id,
-                author_id=activity.author_id,
-                type=activity.type,
-                payload=activity.payload,
-                created_at=activity.created_at,
-                author=author,
-            )
-        )
+    # No rows: verify deal belongs to organization
+    if not activities:
+        await ensure_deal_in_organization(session, deal_id, organization_id)
+
+    next_cursor = None
+    if len(activities) == limit:
+        next_cursor = ActivityRepository.make_cursor(activities[-1]).encode()
 
     return ActivityListResponse(
-        items=items,
-        total=len(items),
+        items=[activity_detail(activity) for activity in activities],
+        total=len(activities),
+        next_cursor=next_cursor,
     )
 
 
@@ -74,6 +104,7 @@ async def create_activity(
     data: ActivityCreate,
     organization_id: OrganizationId,
     membership: CurrentMembership,
+    current_user: CurrentUser,
     session: DbSession,
 ) -> ActivityDetailResponse:
     # Only comments can be created manually
@@ -83,27 +114,18 @@ async def create_activity(
         )
 
     # Verify deal belongs to organization
-    deal_repo = DealRepository(session)
-    deal = await deal_repo.get_by_id(deal_id)
-
-    if not deal or deal.organization_id != organization_id:
-        from app.core.exceptions import DealNotFoundException
-        raise DealNotFoundException()
+    await ensure_deal_in_organization(session, deal_id, organization_id)
 
     activity_repo = ActivityRepository(session)
 
     text = data.payload.get("text", "")
     activity = await activity_repo.create_comment(
         deal_id=deal_id,
+        organization_id=organization_id,
         author_id=membership.user_id,
         text=text,
     )
 
-    # Refresh to get author relation
-    from app.repositories.user import UserRepository
-    user_repo = UserRepository(session)
-    author = await user_repo.get_by_id(membership.user_id)
-
     return ActivityDetailResponse(
         id=activity.id,
         deal_id=activity.deal_id,
@@ -112,8 +134,63 @@ async def create_activity(
         payload=activity.payload,
         created_at=activity.created_at,
         author=UserBriefResponse(
-            id=author.id,
-            name=author.name,
-            email=author.email,
-        ) if author else None,
-    )
\ No newline at end of file
+            id=current_user.id,
+            name=current_user.name,
+            email=current_user.email,
+        ),
+    )
+
+
+@org_router.get("", response_model=ActivityListResponse)
+async def list_organization_activities(
+    organization_id: OrganizationId,
+    membership: CurrentMembership,
+    session: DbSession,
+    type: ActivityType | None = None,
+    author_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = None,
+) -> ActivityListResponse:
+    activity_repo = ActivityRepository(session)
+    activities = await activity_repo.get_by_organization(
+        organization_id,
+        type=type,
+        author_id=author_id,
+        since=since,
+        until=until,
+        limit=limit,
+        cursor=Cursor.decode(cursor) if cursor else None,
+    )
+
+    next_cursor = None
+    if len(activities) == limit:
+        next_cursor = ActivityRepository.make_cursor(activities[-1]).encode()
+
+    return ActivityListResponse(
+        items=[activity_detail(activity) for activity in activities],
+        total=len(activities),
+        next_cursor=next_cursor,
+    )
+
+
+@org_router.get("/export", response_class=StreamingResponse)
+async def export_activities(
+    organization_id: OrganizationId,
+    membership: CurrentMembership,
+    session: DbSession,
+    format: ExportFormat = Query(default="csv"),
+    deal_id: int | None = None,
+) -> StreamingResponse:
+    activity_repo = ActivityRepository(session)
+
+    rows = activity_repo.stream_by_organization(
+        organization_id,
+        deal_id=deal_id,
+        batch_size=settings.EXPORT_BATCH_SIZE,
+    )
+
+    return export_response(
+        "activities", format, ActivityRepository.EXPORT_COLUMNS, rows
+    )
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Query
 from app.api.v1.dependencies import CurrentMembership, DbSession, OrganizationId
 from app.api.v1.schemas import DealsSummaryResponse, FunnelResponse
 from app.repositories.deal import DealRepository
+from app.repositories.deal_stats import DealStatsRepository
 from app.services.analytics import AnalyticsService
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
@@ -13,6 +14,7 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 def get_analytics_service(session: DbSession) -> AnalyticsService:
     return AnalyticsService(
         deal_repo=DealRepository(session),
+        stats_repo=DealStatsRepository(session),
         session=session,
     )
 
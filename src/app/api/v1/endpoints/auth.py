@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.dependencies import AccessTokenPayload
 from app.api.v1.schemas import (
     LoginRequest,
+    LogoutRequest,
     RefreshRequest,
     RegisterRequest,
     RegisterResponse,
@@ -70,4 +72,13 @@ async def refresh_tokens(
     auth_service: AuthService = Depends(get_auth_service),
 ) -> TokenResponse:
     tokens = await auth_service.refresh_tokens(data.refresh_token)
-    return TokenResponse(**tokens)
\ No newline at end of file
+    return TokenResponse(**tokens)
+
+
+@router.post("/logout", status_code=204)
+async def logout(
+    payload: AccessTokenPayload,
+    data: LogoutRequest | None = None,
+    auth_service: AuthService = Depends(get_auth_service),
+) -> None:
+    await auth_service.logout(payload, data.refresh_token if data else None)
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.api.v1.dependencies import CurrentMembership, DbSession, OrganizationId
 from app.api.v1.schemas import (
     ContactCreate,
+    ImportResponse,
     ContactListResponse,
     ContactResponse,
     ContactUpdate,
 )
+from app.core.exports import ExportFormat, export_response
+from app.core.imports import IMPORT_OPENAPI, read_import_rows
+from app.core.pagination import CountMode
 from app.repositories.contact import ContactRepository
 from app.services.contact import ContactService
 
@@ -26,16 +31,18 @@ async def list_contacts(
     page_size: int = Query(default=20, ge=1, le=100),
     search: str | None = None,
     owner_id: int | None = None,
+    count: CountMode = Query(default="exact"),
 ) -> ContactListResponse:
     contact_service = get_contact_service(session)
 
-    contacts, total = await contact_service.get_contacts(
+    contacts, total, total_exact = await contact_service.get_contacts(
         organization_id=organization_id,
         membership=membership,
         page=page,
         page_size=page_size,
         search=search,
         owner_id=owner_id,
+        count_mode=count,
     )
 
     pages = (total + page_size - 1) // page_size
@@ -46,6 +53,7 @@ async def list_contacts(
         page=page,
         page_size=page_size,
         pages=pages,
+        total_estimated=not total_exact,
     )
 
 
@@ -69,6 +77,56 @@ async def create_contact(
     return ContactResponse.model_validate(contact)
 
 
+@router.post(
+    "/import",
+    response_model=ImportResponse,
+    openapi_extra=IMPORT_OPENAPI,
+)
+async def import_contacts(
+    request: Request,
+    organization_id: OrganizationId,
+    membership: CurrentMembership,
+    session: DbSession,
+) -> ImportResponse:
+    contact_service = get_contact_service(session)
+
+    result = await contact_service.import_contacts(
+        organization_id=organization_id,
+        owner_id=membership.user_id,
+        rows=read_import_rows(request.stream(), request.headers.get("content-type")),
+        schema=ContactCreate,
+    )
+
+    return ImportResponse(
+        created=result.created,
+        failed=result.failed,
+        errors=result.errors,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_contacts(
+    organization_id: OrganizationId,
+    membership: CurrentMembership,
+    session: DbSession,
+    format: ExportFormat = Query(default="csv"),
+    search: str | None = None,
+    owner_id: int | None = None,
+) -> StreamingResponse:
+    contact_service = get_contact_service(session)
+
+    rows = contact_service.export_contacts(
+        organization_id=organization_id,
+        membership=membership,
+        search=search,
+        owner_id=owner_id,
+    )
+
+    return export_response(
+        "contacts", format, ContactRepository.EXPORT_COLUMNS, rows
+    )
+
+
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def get_contact(
     contact_id: int,
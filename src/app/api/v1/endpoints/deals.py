@@ -1,18 +1,27 @@
 from decimal import Decimal
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.api.v1.dependencies import CurrentMembership, DbSession, OrganizationId
 from app.api.v1.schemas import (
+    DealBulkUpdate,
+    DealBulkUpdateResponse,
     DealCreate,
+    ImportResponse,
     DealListResponse,
     DealResponse,
     DealUpdate,
 )
+from app.core.exports import ExportFormat, export_response
+from app.core.imports import IMPORT_OPENAPI, read_import_rows
+from app.core.pagination import CountMode
 from app.models.enums import DealStage, DealStatus
 from app.repositories.activity import ActivityRepository
 from app.repositories.contact import ContactRepository
 from app.repositories.deal import DealRepository
+from app.repositories.deal_stats import DealStatsRepository
+from app.repositories.organization import OrganizationMemberRepository
 from app.services.deal import DealService
 
 router = APIRouter(prefix="/deals", tags=["Deals"])
@@ -23,6 +32,8 @@ def get_deal_service(session: DbSession) -> DealService:
         deal_repo=DealRepository(session),
         contact_repo=ContactRepository(session),
         activity_repo=ActivityRepository(session),
+        stats_repo=DealStatsRepository(session),
+        member_repo=OrganizationMemberRepository(session),
     )
 
 
@@ -40,10 +51,12 @@ async def list_deals(
     max_amount: Decimal | None = None,
     order_by: str = Query(default="created_at"),
     order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    cursor: str | None = None,
+    count: CountMode = Query(default="exact"),
 ) -> DealListResponse:
     deal_service = get_deal_service(session)
 
-    deals, total = await deal_service.get_deals(
+    deals, total, total_exact, next_cursor = await deal_service.get_deals(
         organization_id=organization_id,
         membership=membership,
         page=page,
@@ -55,6 +68,8 @@ async def list_deals(
         max_amount=max_amount,
         order_by=order_by,
         order=order,
+        cursor=cursor,
+        count_mode=count,
     )
 
     pages = (total + page_size - 1) // page_size
@@ -65,6 +80,8 @@ async def list_deals(
         page=page,
         page_size=page_size,
         pages=pages,
+        next_cursor=next_cursor,
+        total_estimated=not total_exact,
     )
 
 
@@ -89,6 +106,91 @@ async def create_deal(
     return DealResponse.model_validate(deal)
 
 
+@router.post(
+    "/import",
+    response_model=ImportResponse,
+    openapi_extra=IMPORT_OPENAPI,
+)
+async def import_deals(
+    request: Request,
+    organization_id: OrganizationId,
+    membership: CurrentMembership,
+    session: DbSession,
+) -> ImportResponse:
+    deal_service = get_deal_service(session)
+
+    result = await deal_service.import_deals(
+        organization_id=organization_id,
+        owner_id=membership.user_id,
+        rows=read_import_rows(request.stream(), request.headers.get("content-type")),
+        schema=DealCreate,
+    )
+
+    return ImportResponse(
+        created=result.created,
+        failed=result.failed,
+        errors=result.errors,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_deals(
+    organization_id: OrganizationId,
+    membership: CurrentMembership,
+    session: DbSession,
+    format: ExportFormat = Query(default="csv"),
+    status: list[DealStatus] | None = Query(default=None),
+    stage: DealStage | None = None,
+    owner_id: int | None = None,
+    min_amount: Decimal | None = None,
+    max_amount: Decimal | None = None,
+    order_by: str = Query(default="created_at"),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+) -> StreamingResponse:
+    deal_service = get_deal_service(session)
+
+    rows = deal_service.export_deals(
+        organization_id=organization_id,
+        membership=membership,
+        status=status,
+        stage=stage,
+        owner_id=owner_id,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        order_by=order_by,
+        order=order,
+    )
+
+    return export_response("deals", format, DealRepository.EXPORT_COLUMNS, rows)
+
+
+@router.patch("/bulk", response_model=DealBulkUpdateResponse)
+async def bulk_update_deals(
+    data: DealBulkUpdate,
+    organization_id: OrganizationId,
+    membership: CurrentMembership,
+    session: DbSession,
+) -> DealBulkUpdateResponse:
+    deal_service = get_deal_service(session)
+
+    result = await deal_service.bulk_update_deals(
+        organization_id=organization_id,
+        membership=membership,
+        ids=data.ids,
+        filters=data.filter.model_dump(exclude_none=True) if data.filter else None,
+        status=data.status,
+        stage=data.stage,
+        owner_id=data.owner_id,
+    )
+
+    return DealBulkUpdateResponse(
+        updated=result.updated,
+        unchanged=result.unchanged,
+        failed=result.failed,
+        errors=result.errors,
+    )
+
+
 @router.get("/{deal_id}", response_model=DealResponse)
 async def get_deal(
     deal_id: int,
@@ -6,6 +6,7 @@ from app.api.v1.endpoints import (
     auth_router,
     contacts_router,
     deals_router,
+    org_activities_router,
     organizations_router,
     tasks_router,
 )
@@ -23,6 +24,7 @@ api_router.include_router(contacts_router)
 api_router.include_router(deals_router)
 api_router.include_router(tasks_router)
 api_router.include_router(activities_router)
+api_router.include_router(org_activities_router)
 
 # Analytics routes
 api_router.include_router(analytics_router)
\ No newline at end of file
@@ -12,6 +12,7 @@ from app.api.v1.schemas.analytics import (
 )
 from app.api.v1.schemas.auth import (
     LoginRequest,
+    LogoutRequest,
     RefreshRequest,
     RegisterRequest,
     RegisterResponse,
@@ -31,12 +32,20 @@ from app.api.v1.schemas.contact import (
     ContactUpdate,
 )
 from app.api.v1.schemas.deal import (
+    DealBulkFilter,
+    DealBulkUpdate,
+    DealBulkUpdateError,
+    DealBulkUpdateResponse,
     DealCreate,
     DealDetailResponse,
     DealListResponse,
     DealResponse,
     DealUpdate,
 )
+from app.api.v1.schemas.imports import (
+    ImportResponse,
+    ImportRowError,
+)
 from app.api.v1.schemas.organization import (
     AddMemberRequest,
     MemberResponse,
@@ -61,8 +70,12 @@ __all__ = [
     "ErrorResponse",
     "PaginatedResponse",
     "PaginationParams",
+    # Import
+    "ImportResponse",
+    "ImportRowError",
     # Auth
     "LoginRequest",
+    "LogoutRequest",
     "RefreshRequest",
     "RegisterRequest",
     "RegisterResponse",
@@ -83,6 +96,10 @@ __all__ = [
     "ContactResponse",
     "ContactUpdate",
     # Deal
+    "DealBulkFilter",
+    "DealBulkUpdate",
+    "DealBulkUpdateError",
+    "DealBulkUpdateResponse",
     "DealCreate",
     "DealDetailResponse",
     "DealListResponse",
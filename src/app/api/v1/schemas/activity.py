@@ -36,4 +36,5 @@ class ActivityDetailResponse(ActivityResponse):
 
 class ActivityListResponse(BaseSchema):
     items: list[ActivityDetailResponse]
-    total: int
\ No newline at end of file
+    total: int
+    next_cursor: str | None = None
\ No newline at end of file
@@ -21,6 +21,11 @@ class RefreshRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+
+    refresh_token: str | None = None
+
+
 class TokenResponse(BaseModel):
 
     access_token: str
@@ -30,6 +30,9 @@ class PaginatedResponse(BaseSchema):
     page: int
     page_size: int
     pages: int
+    # True when total comes from planner statistics (count=estimated and
+    # the page doesn't show where the rows end)
+    total_estimated: bool = False
 
 
 class ErrorResponse(BaseModel):
@@ -2,7 +2,7 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.api.v1.schemas.base import BaseSchema, PaginatedResponse
 from app.api.v1.schemas.user import UserBriefResponse
@@ -12,19 +12,48 @@ from app.models.enums import DealStage, DealStatus
 class DealCreate(BaseModel):
     contact_id: int
     title: str = Field(min_length=1, max_length=255)
-    amount: Decimal = Field(default=Decimal("0"), ge=0)
+    # Numeric(15, 2) column: larger or finer amounts are validation errors
+    amount: Decimal = Field(
+        default=Decimal("0"), ge=0, max_digits=15, decimal_places=2
+    )
     currency: str = Field(default="USD", min_length=3, max_length=3)
 
 
 class DealUpdate(BaseModel):
     title: str | None = Field(default=None, min_length=1, max_length=255)
-    amount: Decimal | None = Field(default=None, ge=0)
+    amount: Decimal | None = Field(
+        default=None, ge=0, max_digits=15, decimal_places=2
+    )
     currency: str | None = Field(default=None, min_length=3, max_length=3)
     status: DealStatus | None = None
     stage: DealStage | None = None
     contact_id: int | None = None
 
 
+class DealBulkFilter(BaseModel):
+    status: list[DealStatus] | None = None
+    stage: DealStage | None = None
+    owner_id: int | None = None
+
+
+class DealBulkUpdate(BaseModel):
+    # Deals to change: explicit ids or a filter, not both
+    ids: list[int] | None = Field(default=None, min_length=1)
+    filter: DealBulkFilter | None = None
+    # Change applied to every deal
+    status: DealStatus | None = None
+    stage: DealStage | None = None
+    owner_id: int | None = None
+
+    @model_validator(mode="after")
+    def check_target_and_change(self) -> "DealBulkUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Pass either ids or filter")
+        if self.status is None and self.stage is None and self.owner_id is None:
+            raise ValueError("Pass at least one of status, stage or owner_id")
+        return self
+
+
 class DealResponse(BaseSchema):
     id: int
     organization_id: int
@@ -44,4 +73,18 @@ class DealDetailResponse(DealResponse):
 
 
 class DealListResponse(PaginatedResponse):
-    items: list[DealResponse]
\ No newline at end of file
+    items: list[DealResponse]
+    next_cursor: str | None = None
+
+class DealBulkUpdateError(BaseModel):
+    id: int
+    code: str
+    message: str
+
+
+class DealBulkUpdateResponse(BaseSchema):
+    updated: int
+    # Deals already in the requested state
+    unchanged: int
+    failed: int
+    errors: list[DealBulkUpdateError]
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+from app.api.v1.schemas.base import BaseSchema
+
+
+class ImportRowError(BaseModel):
+    row: int
+    field: str | None = None
+    message: str
+
+
+class ImportResponse(BaseSchema):
+    created: int
+    failed: int
+    # First IMPORT_MAX_ERRORS errors; ``failed`` counts every rejected row
+    errors: list[ImportRowError]
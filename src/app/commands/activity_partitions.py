@@ -0,0 +1,65 @@
+"""
+Manage monthly partitions of the activities table.
+
+Usage:
+    # One-time conversion (maintenance window: locks activities)
+    poetry run python -m app.commands.activity_partitions convert --months-ahead 3
+
+    # Add partitions for the coming months (e.g. from a monthly cron job)
+    poetry run python -m app.commands.activity_partitions create --months-ahead 3
+
+    # Detach partitions of months before a date, for archiving
+    poetry run python -m app.commands.activity_partitions detach --before 2025-01-01
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from app.db.activity_partitions import (
+    create_partitions,
+    detach_partitions,
+    is_partitioned,
+    month_start,
+    next_month,
+    partition_activities,
+)
+from app.db.session import engine
+
+
+async def run(args: argparse.Namespace) -> list[str]:
+    """Run a subcommand in a single transaction."""
+    async with engine.begin() as conn:
+        if args.command == "convert":
+            return await partition_activities(conn, months_ahead=args.months_ahead)
+
+        if not await is_partitioned(conn):
+            raise SystemExit("activities is not partitioned; run 'convert' first")
+        if args.command == "create":
+            end = month_start(date.today())
+            for _ in range(args.months_ahead + 1):
+                end = next_month(end)
+            return await create_partitions(conn, date.today(), end)
+        return await detach_partitions(conn, args.before)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage activities partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("convert", "create"):
+        command = commands.add_parser(name)
+        command.add_argument("--months-ahead", type=int, default=3)
+    detach = commands.add_parser("detach")
+    detach.add_argument("--before", type=date.fromisoformat, required=True)
+    args = parser.parse_args()
+
+    try:
+        tables = await run(args)
+    finally:
+        await engine.dispose()
+
+    print(f"{args.command}: {', '.join(tables) or 'nothing to do'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
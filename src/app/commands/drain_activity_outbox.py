@@ -0,0 +1,27 @@
+"""
+Move all pending outbox activities to the activities table.
+
+Run after switching ACTIVITY_SINK_MODE away from ``outbox`` with rows
+still queued, or to catch up without a running application.
+
+Usage:
+    poetry run python -m app.commands.drain_activity_outbox
+"""
+
+import asyncio
+
+from app.db.session import engine
+from app.services.activity_outbox import activity_outbox_worker
+
+
+async def main() -> None:
+    try:
+        moved = await activity_outbox_worker.drain()
+    finally:
+        await engine.dispose()
+
+    print(f"activity outbox drained ({moved} rows)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
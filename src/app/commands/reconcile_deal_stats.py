@@ -0,0 +1,38 @@
+"""
+Rebuild the deal_stats rollup from the deals table.
+
+Usage:
+    poetry run python -m app.commands.reconcile_deal_stats
+    poetry run python -m app.commands.reconcile_deal_stats --organization-id 42
+"""
+
+import argparse
+import asyncio
+
+from app.db.session import async_session_factory, engine
+from app.repositories.deal_stats import DealStatsRepository
+
+
+async def reconcile(organization_id: int | None = None) -> None:
+    """Recompute rollup rows in a single transaction."""
+    async with async_session_factory() as session:
+        await DealStatsRepository(session).rebuild(organization_id)
+        await session.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild deal_stats rollup")
+    parser.add_argument("--organization-id", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        await reconcile(args.organization_id)
+    finally:
+        await engine.dispose()
+
+    scope = f"organization {args.organization_id}" if args.organization_id else "all"
+    print(f"deal_stats rebuilt ({scope})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Activity log sink.
+
+Status, stage and task activities are fire-and-forget rows written by
+every deal and task mutation. ``ACTIVITY_SINK_MODE`` selects how they
+reach the database:
+
+- ``direct``: inserted right away, one INSERT per call;
+- ``commit``: buffered on the session and written to ``activities`` with
+  one multi-row INSERT when the transaction commits (earlier once
+  ``ACTIVITY_SINK_BATCH_SIZE`` rows are buffered). Nothing is written if
+  the transaction rolls back;
+- ``outbox``: buffered the same way, but written to ``activity_outbox``,
+  an append-only table without foreign keys or secondary indexes. The
+  outbox worker moves them to ``activities`` in batches, so timelines lag
+  by up to ``ACTIVITY_SINK_FLUSH_INTERVAL`` seconds. Outbox rows commit
+  with the request, so none are lost if the process dies.
+
+Buffered activities aren't visible to queries of the same transaction.
+"""
+
+from typing import Any, Literal
+
+from sqlalchemy import Table, event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import settings
+from app.models.activity import Activity
+from app.models.activity_outbox import ActivityOutbox
+
+ActivitySinkMode = Literal["direct", "commit", "outbox"]
+
+# Session.info key of the rows buffered in a transaction
+BUFFER_KEY = "activity_sink_buffer"
+
+
+class ActivitySink:
+    """Writes activity rows as configured by ``mode``."""
+
+    def __init__(self, mode: ActivitySinkMode, batch_size: int) -> None:
+        self.mode = mode
+        self.batch_size = batch_size
+
+        # Counters
+        self.rows = 0
+        self.statements = 0
+
+    @property
+    def table(self) -> Table:
+        """Table buffered rows are written to."""
+        if self.mode == "outbox":
+            return ActivityOutbox.__table__
+        return Activity.__table__
+
+    async def add(self, session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        """Write activity rows now or at commit, depending on the mode."""
+        if not rows:
+            return
+        if self.mode == "direct":
+            await session.run_sync(self.write, rows, Activity.__table__)
+            return
+
+        buffer = session.info.setdefault(BUFFER_KEY, [])
+        buffer.extend(rows)
+        if len(buffer) >= self.batch_size:
+            del session.info[BUFFER_KEY]
+            await session.run_sync(self.write, buffer, self.table)
+
+    def write(
+        self,
+        session: Session,
+        rows: list[dict[str, Any]],
+        table: Table | None = None,
+    ) -> None:
+        """Insert rows with one multi-row INSERT per ``batch_size`` rows."""
+        table = self.table if table is None else table
+        for start in range(0, len(rows), self.batch_size):
+            session.execute(insert(table).values(rows[start:start + self.batch_size]))
+            self.statements += 1
+        self.rows += len(rows)
+
+    def stats(self) -> dict[str, float]:
+        """Rows and INSERT statements written since startup."""
+        return {"rows": self.rows, "statements": self.statements}
+
+
+# Global activity sink (mode selected by ACTIVITY_SINK_MODE)
+activity_sink = ActivitySink(
+    mode=settings.ACTIVITY_SINK_MODE,
+    batch_size=settings.ACTIVITY_SINK_BATCH_SIZE,
+)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_buffered(session: Session) -> None:
+    rows = session.info.pop(BUFFER_KEY, None)
+    if rows:
+        activity_sink.write(session, rows)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_buffered(session: Session, transaction: SessionTransaction) -> None:
+    # Rows still buffered when the outermost transaction ends were rolled back
+    if transaction.parent is None:
+        session.info.pop(BUFFER_KEY, None)
@@ -1,46 +1,600 @@
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+import threading
 import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Any
 
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
 
 class SimpleCache:
-    """Thread-safe in-memory cache with TTL."""
+    """
+    Thread-safe in-memory LRU cache with TTL.
+
+    Optionally bounded by entry count and/or approximate size in bytes;
+    least recently used entries are evicted first. Expired entries are
+    dropped on read and by a periodic sweep. Keys are indexed by their
+    ``:``-delimited prefixes, so invalidating e.g. ``summary:42:`` only
+    touches that organization's keys.
+    """
 
-    def __init__(self, default_ttl: int = 60) -> None:
-        self._cache: dict[str, tuple[Any, float]] = {}
+    def __init__(
+        self,
+        default_ttl: int = 60,
+        *,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        sweep_interval: float = 30.0,
+    ) -> None:
+        self._cache: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()
+        self._prefix_index: dict[str, set[str]] = {}
         self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+        self._size = 0
+        self._lock = threading.RLock()
+        self._sweeper: asyncio.Task[None] | None = None
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
     def get(self, key: str) -> Any | None:
         """Get value from cache if not expired."""
-        if key not in self._cache:
-            return None
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
 
-        value, expires_at = self._cache[key]
-        if time.time() > expires_at:
-            del self._cache[key]
-            return None
+            value, expires_at, _ = entry
+            if time.time() > expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
 
-        return value
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
 
     def set(self, key: str, value: Any, ttl: int | None = None) -> None:
-        """Set value in cache with TTL."""
+        """Set value in cache with TTL, evicting LRU entries if over budget."""
         ttl = ttl or self._default_ttl
         expires_at = time.time() + ttl
-        self._cache[key] = (value, expires_at)
+        size = _approx_size(key) + _approx_size(value)
+
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+
+            self._cache[key] = (value, expires_at, size)
+            self._size += size
+            for prefix in _key_prefixes(key):
+                self._prefix_index.setdefault(prefix, set()).add(key)
+
+            self._maybe_sweep()
+            self._evict()
 
     def delete(self, key: str) -> None:
         """Delete key from cache."""
-        self._cache.pop(key, None)
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
 
     def clear(self) -> None:
         """Clear all cache."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._prefix_index.clear()
+            self._size = 0
 
     def invalidate_prefix(self, prefix: str) -> None:
         """Invalidate all keys starting with prefix."""
-        keys_to_delete = [k for k in self._cache if k.startswith(prefix)]
-        for key in keys_to_delete:
-            del self._cache[key]
+        with self._lock:
+            if prefix.endswith(":"):
+                keys_to_delete = list(self._prefix_index.get(prefix, ()))
+            else:
+                keys_to_delete = [k for k in self._cache if k.startswith(prefix)]
+            for key in keys_to_delete:
+                self._remove(key)
+
+    def sweep(self) -> int:
+        """Remove all expired entries. Returns number of removed entries."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, exp, _) in self._cache.items() if now > exp]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            self._last_sweep = time.monotonic()
+            return len(expired)
+
+    def stats(self) -> dict[str, int]:
+        """Cache counters and current usage."""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    async def run_sweeper(self) -> None:
+        """Sweep expired entries every ``sweep_interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            self.sweep()
+
+    def start_sweeper(self) -> None:
+        """Start the background sweep task on the running event loop."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self.run_sweeper())
+
+    async def stop_sweeper(self) -> None:
+        """Stop the background sweep task."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._cache.pop(key)
+        self._size -= size
+        for prefix in _key_prefixes(key):
+            keys = self._prefix_index.get(prefix)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._prefix_index[prefix]
+
+    def _over_budget(self) -> bool:
+        if self._max_entries is not None and len(self._cache) > self._max_entries:
+            return True
+        return self._max_bytes is not None and self._size > self._max_bytes
+
+    def _evict(self) -> None:
+        while self._cache and self._over_budget():
+            oldest = next(iter(self._cache))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _maybe_sweep(self) -> None:
+        # Amortized sweep for caches used without a running sweeper task
+        if time.monotonic() - self._last_sweep >= self._sweep_interval:
+            self.sweep()
+
+
+def _key_prefixes(key: str) -> list[str]:
+    """All ``:``-terminated prefixes of a key (``a:b:c`` -> ``a:``, ``a:b:``)."""
+    prefixes = []
+    position = key.find(":")
+    while position != -1:
+        prefixes.append(key[: position + 1])
+        position = key.find(":", position + 1)
+    return prefixes
+
+
+def _approx_size(value: Any) -> int:
+    """Approximate memory footprint of a (JSON-like) value in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_approx_size(item) for item in value)
+    return size
+
+
+# Serialization: one tag byte, then JSON (plain or zlib-compressed)
+_PLAIN = b"j"
+_COMPRESSED = b"z"
+COMPRESS_THRESHOLD = 1024
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a JSON-compatible value compactly."""
+    data = json.dumps(value, separators=(",", ":")).encode()
+    if len(data) >= COMPRESS_THRESHOLD:
+        return _COMPRESSED + zlib.compress(data)
+    return _PLAIN + data
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize a value produced by ``dumps``."""
+    tag, body = data[:1], data[1:]
+    if tag == _COMPRESSED:
+        body = zlib.decompress(body)
+    return json.loads(body)
+
+
+def _escape_pattern(prefix: str) -> str:
+    """Escape glob special characters for Redis SCAN MATCH."""
+    for char in "\\*?[]":
+        prefix = prefix.replace(char, "\\" + char)
+    return prefix
+
+
+# Raised by a backend whose server is unreachable or failing
+CACHE_BACKEND_ERRORS = (RedisError, OSError)
+
+
+class CacheBackend(ABC):
+    """Async cache interface used by services."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Get value or None if missing/expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Set JSON-compatible value with TTL."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete key."""
+
+    @abstractmethod
+    async def invalidate_prefix(self, prefix: str) -> None:
+        """Invalidate all keys starting with prefix."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Clear all cache."""
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        """
+        Try to take a short-lived lock for key.
+
+        Returns a token to release it with, or None if someone else holds
+        it. Process-local backends always succeed: in-process
+        coalescing is enough when the cache isn't shared.
+        """
+        return "local"
+
+    async def release_lock(self, key: str, token: str) -> None:
+        """Release a lock taken with ``acquire_lock``."""
+
+    async def start(self) -> None:
+        """Start background work (called on application startup)."""
+
+    async def close(self) -> None:
+        """Release resources (called on application shutdown)."""
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the local cache tier (empty if there is none)."""
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Process-local backend on top of SimpleCache."""
+
+    def __init__(self, cache: SimpleCache) -> None:
+        self.cache = cache
+
+    async def get(self, key: str) -> Any | None:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        self.cache.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    async def invalidate_prefix(self, prefix: str) -> None:
+        self.cache.invalidate_prefix(prefix)
+
+    async def clear(self) -> None:
+        self.cache.clear()
+
+    async def start(self) -> None:
+        self.cache.start_sweeper()
+
+    async def close(self) -> None:
+        await self.cache.stop_sweeper()
+
+    def stats(self) -> dict[str, int]:
+        return self.cache.stats()
+
+
+# Deletes the lock only if it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend shared by all workers through Redis."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        namespace: str = "cache:",
+        default_ttl: int = 60,
+    ) -> None:
+        self.redis = redis
+        self.namespace = namespace
+        self._default_ttl = default_ttl
+        self._release_lock = redis.register_script(RELEASE_LOCK_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return self.namespace + key
+
+    async def get(self, key: str) -> Any | None:
+        data = await self.redis.get(self._key(key))
+        if data is None:
+            return None
+        return loads(data)
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        ttl = ttl or self._default_ttl
+        await self.redis.set(self._key(key), dumps(value), ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.redis.delete(self._key(key))
+
+    async def invalidate_prefix(self, prefix: str) -> None:
+        await self._unlink_matching(_escape_pattern(self._key(prefix)) + "*")
+
+    async def clear(self) -> None:
+        await self._unlink_matching(_escape_pattern(self.namespace) + "*")
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        token = uuid.uuid4().hex
+        acquired = await self.redis.set(
+            self._key(f"lock:{key}"), token, nx=True, px=int(ttl * 1000)
+        )
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        # Compare and delete atomically: the lock may expire and be taken
+        # by another worker between a GET and a DELETE
+        await self._release_lock(keys=[self._key(f"lock:{key}")], args=[token])
+
+    async def _unlink_matching(self, pattern: str) -> None:
+        batch: list[Any] = []
+        async for key in self.redis.scan_iter(match=pattern, count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                await self.redis.unlink(*batch)
+                batch = []
+        if batch:
+            await self.redis.unlink(*batch)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Two-tier backend: process-local L1 in front of shared Redis L2.
+
+    L1 entries live for a short TTL. Invalidations are applied to L2 and
+    broadcast over Redis pub/sub so every worker drops its L1 copies.
+    The listener resubscribes with backoff when Redis drops, and clears
+    L1 on every subscription, since broadcasts may have been missed.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        namespace: str = "cache:",
+        default_ttl: int = 60,
+        l1_ttl: int = 5,
+        l1_max_entries: int | None = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        start_timeout: float = 10.0,
+    ) -> None:
+        self.l1 = SimpleCache(default_ttl=l1_ttl, max_entries=l1_max_entries)
+        self.l2 = RedisCacheBackend(redis, namespace, default_ttl)
+        self.channel = f"{namespace}invalidate"
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.start_timeout = start_timeout
+        self._l1_ttl = l1_ttl
+        self._instance_id = uuid.uuid4().hex
+        self._listener: asyncio.Task[None] | None = None
+
+        # Listener health
+        self.connected = False
+        self.subscriptions = 0
+        self.disconnects = 0
+
+    async def get(self, key: str) -> Any | None:
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+
+        value = await self.l2.get(key)
+        if value is not None:
+            self.l1.set(key, value, self._l1_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        await self.l2.set(key, value, ttl)
+        self.l1.set(key, value, min(ttl or self._l1_ttl, self._l1_ttl))
+
+    async def delete(self, key: str) -> None:
+        await self.l2.delete(key)
+        self.l1.delete(key)
+        await self._publish("delete", key)
+
+    async def invalidate_prefix(self, prefix: str) -> None:
+        await self.l2.invalidate_prefix(prefix)
+        self.l1.invalidate_prefix(prefix)
+        await self._publish("prefix", prefix)
+
+    async def clear(self) -> None:
+        await self.l2.clear()
+        self.l1.clear()
+        await self._publish("clear", "")
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        return await self.l2.acquire_lock(key, ttl)
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self.l2.release_lock(key, token)
+
+    async def _publish(self, op: str, key: str) -> None:
+        message = json.dumps({"op": op, "key": key, "src": self._instance_id})
+        await self.l2.redis.publish(self.channel, message)
+
+    def apply_invalidation(self, message: dict[str, str]) -> None:
+        """Apply an invalidation broadcast by another worker to L1."""
+        if message.get("src") == self._instance_id:
+            return
+        op, key = message.get("op"), message.get("key", "")
+        if op == "delete":
+            self.l1.delete(key)
+        elif op == "prefix":
+            self.l1.invalidate_prefix(key)
+        elif op == "clear":
+            self.l1.clear()
+
+    async def listen(self, ready: asyncio.Event | None = None) -> None:
+        """
+        Consume invalidation messages until the connection drops.
+
+        L1 is cleared once subscribed: entries cached while no broadcasts
+        arrived may have been invalidated elsewhere.
+        """
+        pubsub = self.l2.redis.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            self.l1.clear()
+            self.connected = True
+            self.subscriptions += 1
+            if ready is not None:
+                ready.set()
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                with contextlib.suppress(ValueError, TypeError):
+                    self.apply_invalidation(json.loads(message["data"]))
+        finally:
+            self.connected = False
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+    async def supervise(self, ready: asyncio.Event | None = None) -> None:
+        """Listen until cancelled, resubscribing with backoff when Redis drops."""
+        delay = self.reconnect_delay
+        while True:
+            subscriptions = self.subscriptions
+            try:
+                await self.listen(ready)
+            except Exception:
+                logger.warning(
+                    "Cache invalidation listener lost Redis, resubscribing in %.1f s",
+                    delay,
+                    exc_info=True,
+                )
+            self.disconnects += 1
+            # Back off while Redis stays unreachable
+            if self.subscriptions > subscriptions:
+                delay = self.reconnect_delay
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def stats(self) -> dict[str, int]:
+        """L1 counters and listener health."""
+        return {
+            **self.l1.stats(),
+            "listener_connected": int(self.connected),
+            "listener_disconnects": self.disconnects,
+        }
+
+    async def start(self) -> None:
+        """
+        Start the L1 sweeper and the invalidation listener.
+
+        Raises:
+            RuntimeError: If the listener can't subscribe within
+                ``start_timeout`` seconds (Redis unreachable)
+        """
+        self.l1.start_sweeper()
+        if self._listener is None:
+            ready = asyncio.Event()
+            self._listener = asyncio.create_task(self.supervise(ready))
+            try:
+                await asyncio.wait_for(ready.wait(), self.start_timeout)
+            except TimeoutError:
+                await self.close()
+                raise RuntimeError(
+                    f"Cache invalidation listener couldn't subscribe to "
+                    f"{self.channel} within {self.start_timeout:g} s"
+                ) from None
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        await self.l1.stop_sweeper()
+        await self.l2.close()
+
+
+def create_cache_backend(
+    kind: str,
+    *,
+    redis_url: str,
+    namespace: str,
+    default_ttl: int,
+    l1_ttl: int = 5,
+    max_entries: int | None = None,
+    max_bytes: int | None = None,
+) -> CacheBackend:
+    """Build a cache backend by name: ``memory``, ``redis`` or ``tiered``."""
+    if kind == "memory":
+        return MemoryCacheBackend(
+            SimpleCache(
+                default_ttl=default_ttl,
+                max_entries=max_entries,
+                max_bytes=max_bytes,
+            )
+        )
+    if kind == "redis":
+        return RedisCacheBackend(Redis.from_url(redis_url), namespace, default_ttl)
+    if kind == "tiered":
+        return TieredCacheBackend(
+            Redis.from_url(redis_url), namespace, default_ttl, l1_ttl, max_entries
+        )
+    raise ValueError(f"Unknown cache backend: {kind}")
 
 
-# Global cache instance (60 seconds TTL for analytics)
-analytics_cache = SimpleCache(default_ttl=60)
\ No newline at end of file
+# Global analytics cache (backend selected by ANALYTICS_CACHE_BACKEND)
+analytics_cache = create_cache_backend(
+    settings.ANALYTICS_CACHE_BACKEND,
+    redis_url=settings.REDIS_URL,
+    namespace="analytics:",
+    default_ttl=settings.ANALYTICS_CACHE_TTL,
+    l1_ttl=settings.ANALYTICS_CACHE_L1_TTL,
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+    max_bytes=settings.ANALYTICS_CACHE_MAX_BYTES,
+)
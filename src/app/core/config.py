@@ -27,11 +27,83 @@ class Settings(BaseSettings):
     DATABASE_URL_SYNC: str
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
+    # Seconds a request waits for a connection before failing
+    DB_POOL_TIMEOUT: float = 30.0
+    # Replace connections older than this many seconds (-1 = never)
+    DB_POOL_RECYCLE: int = -1
+    # Test each connection with a round trip on checkout
+    DB_POOL_PRE_PING: bool = False
+    # Prepared statements cached per connection (0 = off)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Behind PgBouncer in transaction mode: no cached prepared statements,
+    # unique statement names
+    DB_PGBOUNCER: bool = False
     DB_ECHO: bool = False
 
     # Redis
     REDIS_URL: str
 
+    # Analytics cache: "memory" (per process), "redis" (shared) or
+    # "tiered" (local L1 in front of Redis L2 with pub/sub invalidation)
+    ANALYTICS_CACHE_BACKEND: Literal["memory", "redis", "tiered"] = "memory"
+    ANALYTICS_CACHE_TTL: int = 60
+    ANALYTICS_CACHE_L1_TTL: int = 5
+    # Bounds of the in-process cache (None = unbounded)
+    ANALYTICS_CACHE_MAX_ENTRIES: int | None = 10_000
+    ANALYTICS_CACHE_MAX_BYTES: int | None = None
+    # Serve expired entries for this long while one refresh runs (0 = off)
+    ANALYTICS_CACHE_STALE_TTL: int = 0
+    # Max time a cache miss holds the cluster-wide recompute lock / waits on it
+    ANALYTICS_LOCK_TIMEOUT: float = 10.0
+    # Read summary/funnel from the deal_stats rollup (run reconcile first)
+    ANALYTICS_USE_ROLLUP: bool = False
+
+    # Cache of authenticated users/memberships: same backends as analytics;
+    # TTL bounds staleness of changes not invalidated explicitly (0 = off)
+    PRINCIPAL_CACHE_BACKEND: Literal["memory", "redis", "tiered"] = "memory"
+    PRINCIPAL_CACHE_TTL: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int | None = 100_000
+
+    # Verified access token payloads kept until the token expires (0 = off)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Revoked tokens: "memory" (this worker only) or "redis" (shared, with
+    # pub/sub to every worker's local copy)
+    TOKEN_REVOCATION_BACKEND: Literal["memory", "redis"] = "memory"
+
+    # Sign the user's organization roles into access tokens, so requests
+    # resolve their membership without a lookup (stale claims fall back
+    # to the database). Only as fresh as the principal cache's users
+    TOKEN_MEMBERSHIP_CLAIMS: bool = False
+
+    # Contact search: "ilike" (no extension), "trigram" (pg_trgm indexes)
+    # or "fulltext" (tsvector word-prefix search)
+    CONTACT_SEARCH_BACKEND: Literal["ilike", "trigram", "fulltext"] = "ilike"
+
+    # Bulk import: rows per INSERT and max row errors reported
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000
+
+    # Exports: rows fetched per server-side cursor round trip
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Bulk deal updates: max deals one request may change
+    BULK_UPDATE_MAX_DEALS: int = 1000
+
+    # Activity log writes: "direct" (INSERT per activity), "commit" (one
+    # INSERT per transaction at commit) or "outbox" (buffered into
+    # activity_outbox at commit, moved to activities by a background worker)
+    ACTIVITY_SINK_MODE: Literal["direct", "commit", "outbox"] = "direct"
+    ACTIVITY_SINK_BATCH_SIZE: int = 500
+    ACTIVITY_SINK_FLUSH_INTERVAL: float = 1.0
+
+    # Password hashing: bcrypt runs on PASSWORD_HASH_WORKERS threads; up to
+    # PASSWORD_HASH_MAX_WAITING calls wait for one (at most
+    # PASSWORD_HASH_QUEUE_TIMEOUT seconds), further calls are refused (503)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_WAITING: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
+
     # JWT Authentication
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -7,6 +7,7 @@ class AppException(Exception):
     status_code: int = 500
     error_code: str = "INTERNAL_ERROR"
     message: str = "An unexpected error occurred"
+    headers: dict[str, str] | None = None
 
     def __init__(
         self,
@@ -149,6 +150,27 @@ class CrossOrganizationException(ValidationException):
     message = "Cannot link entities from different organizations"
 
 
+class InvalidCursorException(ValidationException):
+    """Pagination cursor is malformed or doesn't match the request."""
+
+    error_code = "INVALID_CURSOR"
+    message = "Invalid pagination cursor"
+
+
+class TooManyDealsException(ValidationException):
+    """Bulk operation targets more deals than allowed."""
+
+    error_code = "TOO_MANY_DEALS"
+    message = "Too many deals for one bulk update"
+
+
+class UnsupportedMediaTypeException(AppException):
+    """Request body format is not supported."""
+
+    status_code = 415
+    error_code = "UNSUPPORTED_MEDIA_TYPE"
+    message = "Unsupported request body format"
+
 
 class ConflictException(AppException):
     """Resource conflict."""
@@ -176,4 +198,20 @@ class MemberAlreadyExistsException(ConflictException):
     """User is already a member of this organization."""
 
     error_code = "MEMBER_ALREADY_EXISTS"
-    message = "User is already a member of this organization"
\ No newline at end of file
+    message = "User is already a member of this organization"
+
+
+class ServiceUnavailableException(AppException):
+    """Service is temporarily overloaded."""
+
+    status_code = 503
+    error_code = "SERVICE_UNAVAILABLE"
+    message = "Service is temporarily unavailable"
+    headers = {"Retry-After": "1"}
+
+
+class PasswordHasherBusyException(ServiceUnavailableException):
+    """Too many password hashing calls are waiting."""
+
+    error_code = "AUTH_BUSY"
+    message = "Too many authentication requests, retry shortly"
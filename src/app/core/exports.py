@@ -0,0 +1,111 @@
+"""Streaming serializers for data exports (CSV and NDJSON)."""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Mapping, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+
+ExportFormat = Literal["csv", "ndjson"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Serialized rows are sent in pieces of about this size
+FLUSH_BYTES = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+async def stream_csv(
+    columns: Sequence[str],
+    rows: AsyncIterable[Mapping[str, Any]],
+) -> AsyncIterator[bytes]:
+    """Serialize rows as CSV with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+async def stream_ndjson(
+    columns: Sequence[str],
+    rows: AsyncIterable[Mapping[str, Any]],
+) -> AsyncIterator[bytes]:
+    """Serialize rows as one JSON object per line."""
+    parts: list[str] = []
+    size = 0
+    async for row in rows:
+        line = json.dumps(
+            {column: row[column] for column in columns},
+            default=_json_default,
+            separators=(",", ":"),
+        )
+        parts.append(line)
+        size += len(line) + 1
+        if size >= FLUSH_BYTES:
+            yield ("\n".join(parts) + "\n").encode()
+            parts, size = [], 0
+    if parts:
+        yield ("\n".join(parts) + "\n").encode()
+
+
+def stream_export(
+    export_format: ExportFormat,
+    columns: Sequence[str],
+    rows: AsyncIterable[Mapping[str, Any]],
+) -> AsyncIterator[bytes]:
+    """Serialize rows in the requested export format."""
+    if export_format == "csv":
+        return stream_csv(columns, rows)
+    return stream_ndjson(columns, rows)
+
+
+def export_response(
+    name: str,
+    export_format: ExportFormat,
+    columns: Sequence[Any],
+    rows: AsyncIterable[Mapping[str, Any]],
+) -> StreamingResponse:
+    """Stream rows of the given columns as a downloadable file."""
+    column_names = [column.key for column in columns]
+    return StreamingResponse(
+        stream_export(export_format, column_names, rows),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{export_format}"',
+        },
+    )
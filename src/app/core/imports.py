@@ -0,0 +1,138 @@
+"""Streaming readers for bulk import bodies (NDJSON and CSV)."""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.exceptions import UnsupportedMediaTypeException
+
+NDJSON_CONTENT_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+}
+CSV_CONTENT_TYPES = {"text/csv"}
+
+# Request body of import endpoints, for the OpenAPI schema (the body is
+# read as a stream, so FastAPI can't derive it)
+IMPORT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            content_type: {"schema": {"type": "string"}}
+            for content_type in sorted(NDJSON_CONTENT_TYPES | CSV_CONTENT_TYPES)
+        },
+    },
+}
+
+
+@dataclass
+class ImportRow:
+    """
+    One record of an import body.
+
+    ``number`` is the 1-based record number (a CSV header isn't counted).
+    Records that can't be parsed carry ``error`` instead of ``data``.
+    """
+
+    number: int
+    data: dict[str, Any] | None
+    error: str | None = None
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream into lines (newlines kept, BOM dropped)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def read_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    """Read one JSON object per line; blank lines are skipped."""
+    number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield ImportRow(number, None, f"Invalid JSON: {exc.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRow(number, None, "Expected a JSON object")
+            continue
+        yield ImportRow(number, data)
+
+
+async def read_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    """
+    Read CSV with a header row; empty cells become None.
+
+    Quoted values may span lines.
+    """
+    header: list[str] | None = None
+    number = 0
+    record = ""
+    async for line in iter_lines(chunks):
+        record += line
+        # An odd number of quotes means a quoted value continues
+        if record.count('"') % 2:
+            continue
+        if not record.strip():
+            record = ""
+            continue
+        values = next(csv.reader([record]))
+        record = ""
+
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        number += 1
+        if len(values) != len(header):
+            yield ImportRow(
+                number,
+                None,
+                f"Expected {len(header)} columns, got {len(values)}",
+            )
+            continue
+        yield ImportRow(
+            number,
+            {
+                name: value or None
+                for name, value in zip(header, values, strict=True)
+            },
+        )
+
+    if record.strip():
+        yield ImportRow(number + 1, None, "Unterminated quoted value")
+
+
+def read_import_rows(
+    chunks: AsyncIterable[bytes],
+    content_type: str | None,
+) -> AsyncIterator[ImportRow]:
+    """
+    Pick a reader by content type.
+
+    Raises:
+        UnsupportedMediaTypeException: If the body is neither NDJSON nor CSV
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        return read_ndjson(chunks)
+    if media_type in CSV_CONTENT_TYPES:
+        return read_csv(chunks)
+    raise UnsupportedMediaTypeException(
+        details={"supported": sorted(NDJSON_CONTENT_TYPES | CSV_CONTENT_TYPES)}
+    )
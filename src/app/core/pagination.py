@@ -0,0 +1,122 @@
+"""Pagination helpers: keyset cursors and total count modes."""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from typing import Any, Literal
+
+from app.core.exceptions import InvalidCursorException
+
+# How list endpoints compute ``total``: "exact" (window count in the page
+# query) or "estimated" (planner statistics, for very large tenants)
+CountMode = Literal["exact", "estimated"]
+
+
+def _dump_value(value: Any) -> list[Any]:
+    """Serialize a sort value together with a type tag."""
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["dec", str(value)]
+    if isinstance(value, Enum):
+        return ["str", value.value]
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise TypeError(f"Unsupported cursor value type: {type(value).__name__}")
+    return ["int" if isinstance(value, int) else "str", value]
+
+
+def _load_value(tagged: Any) -> Any:
+    """Restore a sort value serialized by ``_dump_value``."""
+    tag, raw = tagged
+    if tag == "dt" and isinstance(raw, str):
+        return datetime.fromisoformat(raw)
+    if tag == "dec" and isinstance(raw, str):
+        return Decimal(raw)
+    # bool is an int subclass, but never a sort value
+    if tag == "int" and isinstance(raw, int) and not isinstance(raw, bool):
+        return raw
+    if tag == "str" and isinstance(raw, str):
+        return raw
+    raise ValueError(f"Unknown cursor value tag: {tag}")
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Position of the last row of a page.
+
+    Holds the value of the sort column and the row ``id`` (tie-breaker),
+    plus the ordering the cursor was produced for, so a cursor cannot be
+    replayed against a differently sorted listing.
+    """
+
+    order_by: str
+    order: str
+    value: Any
+    id: int
+
+    def encode(self) -> str:
+        """Encode cursor into an opaque URL-safe string."""
+        data = {
+            "o": [self.order_by, self.order],
+            "v": _dump_value(self.value),
+            "id": self.id,
+        }
+        raw = json.dumps(data, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "Cursor":
+        """
+        Decode an opaque cursor string.
+
+        Raises:
+            InvalidCursorException: If cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            order_by, order = data["o"]
+            row_id = data["id"]
+            if (
+                not isinstance(row_id, int)
+                or isinstance(row_id, bool)
+                or order not in ("asc", "desc")
+            ):
+                raise ValueError("Invalid cursor payload")
+            return cls(
+                order_by=order_by,
+                order=order,
+                value=_load_value(data["v"]),
+                id=row_id,
+            )
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            ValueError,
+            KeyError,
+            TypeError,
+            InvalidOperation,
+        ):
+            raise InvalidCursorException()
+
+    def check_ordering(self, order_by: str, order: str, value_type: type) -> None:
+        """
+        Ensure cursor was produced for the requested ordering.
+
+        ``value_type`` is the Python type of the sort column; a value of
+        another type would only fail in the database.
+
+        Raises:
+            InvalidCursorException: If ordering or value type differs
+        """
+        if self.order_by != order_by or self.order != order:
+            raise InvalidCursorException(
+                message="Cursor does not match the requested ordering"
+            )
+        if not isinstance(self.value, value_type):
+            raise InvalidCursorException()
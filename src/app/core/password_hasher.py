@@ -0,0 +1,99 @@
+"""
+Password hashing off the event loop.
+
+bcrypt takes tens to hundreds of milliseconds per call by design. Run
+inline, a burst of logins blocks every other request of the worker.
+``PasswordHasher`` runs it on a small thread pool instead. bcrypt
+releases the GIL while hashing, so threads run in parallel, and the
+event loop keeps serving other requests.
+
+At most ``workers`` calls run at a time. Up to ``max_waiting`` more wait
+for a thread, each for at most ``queue_timeout`` seconds. Calls beyond
+that are refused with ``PasswordHasherBusyException`` (503), so a login
+storm sheds load instead of queueing without bound.
+"""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from app.core.config import settings
+from app.core.exceptions import PasswordHasherBusyException
+from app.core.security import hash_password, verify_password
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Bounded thread pool for bcrypt hashing and verification."""
+
+    def __init__(self, workers: int, max_waiting: int, queue_timeout: float) -> None:
+        self.workers = workers
+        self.max_waiting = max_waiting
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._slots = asyncio.Semaphore(workers)
+        self._waiting = 0
+
+        # Counters
+        self.calls = 0
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        """Hash a password."""
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        """
+        Run func on the pool once a thread is free.
+
+        Raises:
+            PasswordHasherBusyException: If too many calls are waiting or
+                no thread got free within ``queue_timeout``
+        """
+        if self._slots.locked() and self._waiting >= self.max_waiting:
+            self.rejected += 1
+            raise PasswordHasherBusyException()
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except TimeoutError:
+            self.rejected += 1
+            raise PasswordHasherBusyException()
+        finally:
+            self._waiting -= 1
+
+        try:
+            self.calls += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict[str, float]:
+        """Calls run and refused since startup, and calls waiting now."""
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "waiting": self._waiting,
+        }
+
+    def close(self) -> None:
+        """Stop the pool after running calls finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global password hasher (sized by PASSWORD_HASH_* settings)
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_waiting=settings.PASSWORD_HASH_MAX_WAITING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
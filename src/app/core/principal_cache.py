@@ -0,0 +1,169 @@
+"""
+Short-lived cache of authenticated principals.
+
+Every authenticated request needs the user behind the token and, for
+organization routes, that user's membership. Both are cached per
+``(user_id, organization_id)`` so most requests reach the endpoint without
+a database round trip. Entries are dropped explicitly when a membership or
+user changes; the TTL bounds staleness for anything missed (e.g. changes
+made directly in the database, or by another worker on the ``memory``
+backend).
+
+Keys: ``{user_id}:user`` and ``{user_id}:{organization_id}``, so all
+entries of a user share the ``{user_id}:`` prefix.
+"""
+
+import threading
+from datetime import datetime
+from typing import Any
+
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+from app.models.organization_member import OrganizationMember
+from app.models.user import User
+
+
+def _user_key(user_id: int) -> str:
+    return f"{user_id}:user"
+
+
+def _membership_key(user_id: int, organization_id: int) -> str:
+    return f"{user_id}:{organization_id}"
+
+
+def _dump_user(user: User) -> dict[str, Any]:
+    # The password hash is deliberately not cached
+    return {
+        "id": user.id,
+        "email": user.email,
+        "name": user.name,
+        "membership_version": user.membership_version,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+    }
+
+
+def _load_user(data: dict[str, Any]) -> User:
+    created_at = data.get("created_at")
+    return User(
+        id=data["id"],
+        email=data["email"],
+        name=data["name"],
+        # Entries cached before the column existed never match a token
+        membership_version=data.get("membership_version"),
+        created_at=datetime.fromisoformat(created_at) if created_at else None,
+    )
+
+
+def _dump_membership(membership: OrganizationMember) -> dict[str, Any]:
+    return {
+        "id": membership.id,
+        "organization_id": membership.organization_id,
+        "user_id": membership.user_id,
+        "role": membership.role,
+    }
+
+
+def _load_membership(data: dict[str, Any]) -> OrganizationMember:
+    return OrganizationMember(**data)
+
+
+class PrincipalCache:
+    """
+    Cache of users and memberships for request authentication.
+
+    Cached objects are detached copies: read their columns, but don't add
+    them to a session or rely on their relationships. A TTL of 0 disables
+    caching.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get_user(self, user_id: int) -> User | None:
+        """Cached user, or None on a miss."""
+        data = await self._get(_user_key(user_id))
+        return _load_user(data) if data is not None else None
+
+    async def set_user(self, user: User) -> None:
+        if not self.ttl:
+            return
+        await self.backend.set(_user_key(user.id), _dump_user(user), self.ttl)
+
+    async def get_membership(
+        self,
+        user_id: int,
+        organization_id: int,
+    ) -> OrganizationMember | None:
+        """Cached membership, or None on a miss."""
+        data = await self._get(_membership_key(user_id, organization_id))
+        return _load_membership(data) if data is not None else None
+
+    async def set_membership(self, membership: OrganizationMember) -> None:
+        if not self.ttl:
+            return
+        await self.backend.set(
+            _membership_key(membership.user_id, membership.organization_id),
+            _dump_membership(membership),
+            self.ttl,
+        )
+
+    async def invalidate_membership(self, user_id: int, organization_id: int) -> None:
+        """Drop a membership after its role changed or it was removed."""
+        self._count("invalidations")
+        await self.backend.delete(_membership_key(user_id, organization_id))
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Drop a user and all of their memberships."""
+        self._count("invalidations")
+        await self.backend.invalidate_prefix(f"{user_id}:")
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict[str, float]:
+        """Lookup counters and hit rate since startup."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+    async def _get(self, key: str) -> dict[str, Any] | None:
+        if not self.ttl:
+            return None
+        data = await self.backend.get(key)
+        self._count("hits" if data is not None else "misses")
+        return data
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+# Global principal cache (backend selected by PRINCIPAL_CACHE_BACKEND)
+principal_cache = PrincipalCache(
+    create_cache_backend(
+        settings.PRINCIPAL_CACHE_BACKEND,
+        redis_url=settings.REDIS_URL,
+        namespace="principal:",
+        default_ttl=settings.PRINCIPAL_CACHE_TTL,
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ),
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
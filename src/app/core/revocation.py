@@ -0,0 +1,316 @@
+"""
+Revocation of issued tokens.
+
+Tokens carry a ``jti`` (unique id) and an ``iat`` (issue time). Logging
+out revokes a token by ``jti``. Removing a member revokes every token of
+the user issued before that moment.
+
+``verify_access_token`` checks every request against a process-local
+replica of the revocations: two dict lookups, no I/O. Entries are kept
+only as long as the tokens they revoke could still be valid, so the
+replica stays small.
+
+- ``memory``: the replica is all there is (single worker, tests).
+- ``redis``: Redis is the source of truth. Revocations are stored there
+  with a TTL and broadcast over pub/sub to the other workers' replicas.
+  Each worker loads the current revocations whenever it (re)subscribes,
+  so a broadcast missed while disconnected is picked up on reconnect.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.exceptions import InvalidTokenException
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    """Process-local revocations, checked without I/O."""
+
+    def __init__(self, sweep_interval: float = 60.0) -> None:
+        # jti -> exp of the revoked token
+        self._tokens: dict[str, float] = {}
+        # user_id -> (revoked before, entry expiry)
+        self._users: dict[int, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+
+        # Counters
+        self.rejected = 0
+
+    def check(self, payload: dict[str, Any]) -> None:
+        """
+        Reject a revoked token (a token cache check).
+
+        Raises:
+            InvalidTokenException: If the token has been revoked
+        """
+        self._maybe_sweep()
+        if self.is_revoked(payload):
+            with self._lock:
+                self.rejected += 1
+            raise InvalidTokenException(message="Token has been revoked")
+
+    def is_revoked(self, payload: dict[str, Any]) -> bool:
+        """Whether a verified token payload has been revoked."""
+        jti = payload.get("jti")
+        if jti is not None and jti in self._tokens:
+            return True
+        user = self._users.get(int(payload["sub"]))
+        return user is not None and payload.get("iat", 0) < user[0]
+
+    async def revoke_token(self, jti: str, expires_at: float) -> None:
+        """Revoke one token until it expires."""
+        self.apply_token(jti, expires_at)
+
+    async def revoke_user(self, user_id: int) -> None:
+        """Revoke all tokens of a user issued until now."""
+        self.apply_user(user_id, time.time(), _user_entry_expiry())
+
+    def apply_token(self, jti: str, expires_at: float) -> None:
+        """Add a token revocation to the local replica."""
+        with self._lock:
+            self._tokens[jti] = expires_at
+
+    def apply_user(self, user_id: int, revoked_before: float, expires_at: float) -> None:
+        """Add a user revocation to the local replica."""
+        with self._lock:
+            current = self._users.get(user_id)
+            if current is None or current[0] < revoked_before:
+                self._users[user_id] = (revoked_before, expires_at)
+
+    def sweep(self) -> int:
+        """Drop entries whose tokens have expired anyway. Returns their number."""
+        now = time.time()
+        with self._lock:
+            tokens = [jti for jti, exp in self._tokens.items() if exp <= now]
+            for jti in tokens:
+                del self._tokens[jti]
+            users = [uid for uid, (_, exp) in self._users.items() if exp <= now]
+            for uid in users:
+                del self._users[uid]
+            self._last_sweep = time.monotonic()
+        return len(tokens) + len(users)
+
+    async def clear(self) -> None:
+        """Forget all revocations."""
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+
+    async def start(self) -> None:
+        """Start background work (called on application startup)."""
+
+    async def close(self) -> None:
+        """Release resources (called on application shutdown)."""
+
+    def stats(self) -> dict[str, int]:
+        """Revocations held locally and tokens rejected since startup."""
+        with self._lock:
+            return {
+                "tokens": len(self._tokens),
+                "users": len(self._users),
+                "rejected": self.rejected,
+            }
+
+    def _maybe_sweep(self) -> None:
+        if time.monotonic() - self._last_sweep >= self._sweep_interval:
+            self.sweep()
+
+
+class RedisRevocationStore(RevocationStore):
+    """Revocations stored in Redis and replicated to every worker."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        namespace: str = "revoked:",
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        start_timeout: float = 10.0,
+    ) -> None:
+        super().__init__()
+        self.redis = redis
+        self.namespace = namespace
+        self.channel = f"{namespace}broadcast"
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.start_timeout = start_timeout
+        self._listener: asyncio.Task[None] | None = None
+
+        # Listener health
+        self.connected = False
+        self.subscriptions = 0
+        self.disconnects = 0
+
+    async def revoke_token(self, jti: str, expires_at: float) -> None:
+        await self.redis.set(
+            f"{self.namespace}token:{jti}", expires_at, exat=_exat(expires_at)
+        )
+        await self._publish({"token": jti, "exp": expires_at})
+        self.apply_token(jti, expires_at)
+
+    async def revoke_user(self, user_id: int) -> None:
+        revoked_before, expires_at = time.time(), _user_entry_expiry()
+        await self.redis.set(
+            f"{self.namespace}user:{user_id}", revoked_before, exat=_exat(expires_at)
+        )
+        await self._publish({"user": user_id, "before": revoked_before, "exp": expires_at})
+        self.apply_user(user_id, revoked_before, expires_at)
+
+    def apply_message(self, message: dict[str, Any]) -> None:
+        """Apply a revocation broadcast by a worker."""
+        if "token" in message:
+            self.apply_token(message["token"], message["exp"])
+        elif "user" in message:
+            self.apply_user(message["user"], message["before"], message["exp"])
+
+    async def load(self) -> None:
+        """Copy the revocations stored in Redis into the local replica."""
+        async for key in self.redis.scan_iter(match=f"{self.namespace}*:*", count=500):
+            name = key.decode()[len(self.namespace):]
+            kind, _, ident = name.partition(":")
+            value = await self.redis.get(key)
+            ttl = await self.redis.ttl(key)
+            if value is None or ttl <= 0:
+                continue
+            expires_at = time.time() + ttl
+            if kind == "token":
+                self.apply_token(ident, expires_at)
+            elif kind == "user":
+                self.apply_user(int(ident), float(value), expires_at)
+
+    async def listen(self, ready: asyncio.Event | None = None) -> None:
+        """
+        Consume revocation broadcasts until the connection drops.
+
+        Stored revocations are loaded once subscribed, so nothing revoked
+        before (or while disconnected) is missed.
+        """
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            await self.load()
+            self.connected = True
+            self.subscriptions += 1
+            if ready is not None:
+                ready.set()
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                with contextlib.suppress(ValueError, TypeError, KeyError):
+                    self.apply_message(json.loads(message["data"]))
+        finally:
+            self.connected = False
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+    async def supervise(self, ready: asyncio.Event | None = None) -> None:
+        """Listen until cancelled, resubscribing with backoff when Redis drops."""
+        delay = self.reconnect_delay
+        while True:
+            subscriptions = self.subscriptions
+            try:
+                await self.listen(ready)
+            except Exception:
+                logger.warning(
+                    "Revocation listener lost Redis, resubscribing in %.1f s",
+                    delay,
+                    exc_info=True,
+                )
+            self.disconnects += 1
+            # Back off while Redis stays unreachable
+            if self.subscriptions > subscriptions:
+                delay = self.reconnect_delay
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def clear(self) -> None:
+        await super().clear()
+        batch = [key async for key in self.redis.scan_iter(match=f"{self.namespace}*")]
+        if batch:
+            await self.redis.unlink(*batch)
+
+    async def start(self) -> None:
+        """
+        Start the listener once its first subscription (and load) succeeds.
+
+        Raises:
+            RuntimeError: If that takes longer than ``start_timeout``
+                seconds (Redis unreachable)
+        """
+        if self._listener is None:
+            ready = asyncio.Event()
+            self._listener = asyncio.create_task(self.supervise(ready))
+            try:
+                await asyncio.wait_for(ready.wait(), self.start_timeout)
+            except TimeoutError:
+                await self.close()
+                raise RuntimeError(
+                    f"Revocation listener couldn't subscribe to {self.channel} "
+                    f"within {self.start_timeout:g} s"
+                ) from None
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        await self.redis.aclose()
+
+    def stats(self) -> dict[str, int]:
+        """Local revocations, rejections and listener health."""
+        return {
+            **super().stats(),
+            "listener_connected": int(self.connected),
+            "listener_disconnects": self.disconnects,
+        }
+
+    async def _publish(self, message: dict[str, Any]) -> None:
+        await self.redis.publish(self.channel, json.dumps(message))
+
+
+def _user_entry_expiry() -> float:
+    # A user revocation matters while tokens issued before it can be valid
+    lifetime = max(
+        settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+    )
+    return time.time() + lifetime
+
+
+def _exat(expires_at: float) -> int:
+    return max(int(expires_at) + 1, int(time.time()) + 1)
+
+
+def create_revocation_store(kind: str, *, redis_url: str) -> RevocationStore:
+    """Build a revocation store by name: ``memory`` or ``redis``."""
+    if kind == "memory":
+        return RevocationStore()
+    if kind == "redis":
+        return RedisRevocationStore(Redis.from_url(redis_url))
+    raise ValueError(f"Unknown revocation backend: {kind}")
+
+
+def new_token_id() -> str:
+    """Unique ``jti`` for a new token."""
+    return uuid.uuid4().hex
+
+
+# Global revocation store (backend selected by TOKEN_REVOCATION_BACKEND)
+token_revocations = create_revocation_store(
+    settings.TOKEN_REVOCATION_BACKEND,
+    redis_url=settings.REDIS_URL,
+)
@@ -8,9 +8,14 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 from app.core.exceptions import InvalidTokenException
+from app.core.revocation import new_token_id, token_revocations
+from app.core.token_cache import token_cache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Every verified access token is checked against revocations
+token_cache.add_check(token_revocations.check)
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
@@ -41,11 +46,15 @@ def create_access_token(
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    expire = datetime.now(timezone.utc) + expires_delta
+    now = datetime.now(timezone.utc)
+    expire = now + expires_delta
 
     to_encode: dict[str, Any] = {
         "sub": str(subject),
         "exp": expire,
+        # Sub-second issue time, so user revocations cut off precisely
+        "iat": now.timestamp(),
+        "jti": new_token_id(),
         "type": "access",
     }
 
@@ -72,11 +81,14 @@ def create_refresh_token(
     if expires_delta is None:
         expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
-    expire = datetime.now(timezone.utc) + expires_delta
+    now = datetime.now(timezone.utc)
+    expire = now + expires_delta
 
     to_encode = {
         "sub": str(subject),
         "exp": expire,
+        "iat": now.timestamp(),
+        "jti": new_token_id(),
         "type": "refresh",
     }
 
@@ -113,6 +125,9 @@ def verify_access_token(token: str) -> dict[str, Any]:
     """
     Verify an access token.
 
+    Payloads of verified tokens are cached until the token expires; the
+    token cache checks (e.g. revocation) run either way.
+
     Args:
         token: JWT token string
 
@@ -120,13 +135,19 @@ def verify_access_token(token: str) -> dict[str, Any]:
         Decoded token payload
 
     Raises:
-        InvalidTokenException: If token is invalid or not an access token
+        InvalidTokenException: If token is invalid, not an access token
+            or rejected by a token cache check
     """
-    payload = decode_token(token)
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
 
-    if payload.get("type") != "access":
-        raise InvalidTokenException(message="Invalid token type")
+        if payload.get("type") != "access":
+            raise InvalidTokenException(message="Invalid token type")
+
+        token_cache.set(token, payload)
 
+    token_cache.run_checks(payload)
     return payload
 
 
@@ -141,11 +162,14 @@ def verify_refresh_token(token: str) -> dict[str, Any]:
         Decoded token payload
 
     Raises:
-        InvalidTokenException: If token is invalid or not a refresh token
+        InvalidTokenException: If token is invalid, not a refresh token
+            or revoked
     """
     payload = decode_token(token)
 
     if payload.get("type") != "refresh":
         raise InvalidTokenException(message="Invalid token type")
 
+    token_revocations.check(payload)
+
     return payload
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""Request coalescing for expensive computations."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time within the process.
+
+    Callers arriving while a computation for the same key is in flight
+    wait for its result instead of starting their own. The computation
+    runs in its own task, so a cancelled caller doesn't cancel it for
+    the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Task[Any]] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Check if a computation for key is running."""
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for key, or join the computation already running."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
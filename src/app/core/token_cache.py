@@ -0,0 +1,86 @@
+"""
+Cache of verified access token payloads.
+
+Clients send the same access token with every request until it expires,
+so ``verify_access_token`` keeps the payloads it verified, keyed by the
+token's SHA-256 digest. An entry expires at the token's own ``exp``, so
+a cached payload is never served for an expired token. The cache holds
+at most ``TOKEN_CACHE_MAX_ENTRIES`` tokens, evicting least recently used
+ones.
+
+Checks registered with ``add_check`` run for every verified token,
+cached or not. They can reject a still-valid token, e.g. a revoked one.
+"""
+
+import hashlib
+import math
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.core.cache import SimpleCache
+from app.core.config import settings
+
+# Raises InvalidTokenException to reject a verified payload
+TokenCheck = Callable[[dict[str, Any]], None]
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    """Verified token payloads by token digest (disabled without a cache)."""
+
+    def __init__(self, cache: SimpleCache | None) -> None:
+        self.cache = cache
+        self.checks: list[TokenCheck] = []
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Payload of an already verified, unexpired token."""
+        if self.cache is None:
+            return None
+        payload = self.cache.get(_key(token))
+        return dict(payload) if payload is not None else None
+
+    def set(self, token: str, payload: dict[str, Any]) -> None:
+        """Keep a verified payload until the token expires."""
+        if self.cache is None or "exp" not in payload:
+            return
+        ttl = math.floor(payload["exp"] - time.time())
+        if ttl > 0:
+            self.cache.set(_key(token), dict(payload), ttl=ttl)
+
+    def add_check(self, check: TokenCheck) -> None:
+        """Run check for every verified token."""
+        self.checks.append(check)
+
+    def run_checks(self, payload: dict[str, Any]) -> None:
+        """
+        Run the registered checks.
+
+        Raises:
+            InvalidTokenException: If a check rejects the token
+        """
+        for check in self.checks:
+            check(payload)
+
+    def clear(self) -> None:
+        """Drop all cached payloads."""
+        if self.cache is not None:
+            self.cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the underlying cache (empty if disabled)."""
+        return self.cache.stats() if self.cache is not None else {}
+
+
+def create_token_cache() -> TokenCache:
+    """Build the token cache from settings."""
+    if not settings.TOKEN_CACHE_MAX_ENTRIES:
+        return TokenCache(None)
+    return TokenCache(SimpleCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES))
+
+
+# Global token cache (TOKEN_CACHE_MAX_ENTRIES=0 disables it)
+token_cache = create_token_cache()
@@ -0,0 +1,177 @@
+"""
+Monthly range partitioning of ``activities`` (opt-in).
+
+``partition_activities`` converts the table once into one partitioned by
+``created_at`` month. Run it in a maintenance window, because it holds an
+exclusive lock while rows are copied. It creates one partition per month
+of existing data, ``months_ahead`` future months, and a default
+partition for rows outside them. After that:
+
+- ``create_partitions`` adds upcoming months (run e.g. monthly);
+- ``detach_partitions`` detaches months before a date. Detached
+  partitions become plain tables that can be archived or dropped without
+  touching live rows.
+
+Partitions are named ``activities_pYYYYMM``, with month bounds in UTC.
+The primary key becomes ``(id, created_at)``, because unique keys of a
+partitioned table must include the partition column. Ids still come
+from one sequence, so the ORM keeps using ``id`` alone. Timeline pages
+past the first bound ``created_at``, so they only read the partitions
+they need.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.schema import AddConstraint, CreateIndex
+
+from app.models.activity import Activity
+
+TABLE = "activities"
+PARTITION_PREFIX = "activities_p"
+DEFAULT_PARTITION = "activities_default"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month of a monthly partition, or None for other tables."""
+    if not name.startswith(PARTITION_PREFIX):
+        return None
+    return datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m").date()
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    """Check whether ``activities`` is a partitioned table."""
+    result = await conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": TABLE},
+    )
+    return bool(result.scalar())
+
+
+async def list_partitions(conn: AsyncConnection) -> list[str]:
+    """Names of the attached partitions (monthly and default)."""
+    result = await conn.execute(
+        text(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = to_regclass(:table) ORDER BY 1"
+        ),
+        {"table": TABLE},
+    )
+    return list(result.scalars())
+
+
+async def create_partitions(conn: AsyncConnection, start: date, end: date) -> list[str]:
+    """
+    Create the missing monthly partitions from start's month up to end.
+
+    Rows of a new month already in the default partition are moved into
+    the new partition.
+    """
+    existing = set(await list_partitions(conn))
+    has_default = DEFAULT_PARTITION in existing
+    created = []
+    month = month_start(start)
+    while month < end:
+        upper = next_month(month)
+        name = partition_name(month)
+        if name not in existing:
+            in_range = f"created_at >= {_bound(month)} AND created_at < {_bound(upper)}"
+            stray = has_default and (await conn.execute(text(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"
+            ))).scalar()
+            if stray:
+                await conn.execute(text(
+                    f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}"
+                ))
+            await conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(upper)})"
+            ))
+            if stray:
+                await conn.execute(text(
+                    f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"
+                ))
+                await conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+                await conn.execute(text(
+                    f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+                ))
+            created.append(name)
+        month = upper
+    return created
+
+
+async def detach_partitions(conn: AsyncConnection, before: date) -> list[str]:
+    """Detach monthly partitions whose months end on or before before."""
+    cutoff = month_start(before)
+    detached = []
+    for name in await list_partitions(conn):
+        month = partition_month(name)
+        if month is not None and next_month(month) <= cutoff:
+            await conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+            detached.append(name)
+    return detached
+
+
+async def partition_activities(
+    conn: AsyncConnection,
+    *,
+    months_ahead: int = 3,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Convert ``activities`` into a monthly partitioned table.
+
+    Returns the created partitions (none if already partitioned).
+    """
+    if await is_partitioned(conn):
+        return []
+
+    today = today or date.today()
+    oldest = (await conn.execute(select(func.min(Activity.created_at)))).scalar()
+    first = month_start(oldest.date() if oldest else today)
+    end = month_start(today)
+    for _ in range(months_ahead + 1):
+        end = next_month(end)
+
+    legacy = f"{TABLE}_unpartitioned"
+    await conn.execute(text(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE"))
+    await conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {legacy}"))
+    await conn.execute(text(
+        f"CREATE TABLE {TABLE} (LIKE {legacy} INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    ))
+    sequence = (await conn.execute(
+        text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": legacy}
+    )).scalar()
+    await conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id"))
+
+    await conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    created = await create_partitions(conn, first, end)
+    await conn.execute(text(f"INSERT INTO {TABLE} SELECT * FROM {legacy}"))
+    await conn.execute(text(f"DROP TABLE {legacy}"))
+
+    await conn.execute(text(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, created_at)"
+    ))
+    for constraint in Activity.__table__.foreign_key_constraints:
+        await conn.execute(AddConstraint(constraint))
+    for index in Activity.__table__.indexes:
+        await conn.execute(CreateIndex(index))
+    return [DEFAULT_PARTITION, *created]
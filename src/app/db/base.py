@@ -5,9 +5,15 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 class Base(DeclarativeBase):
-    """Base class for all SQLAlchemy models."""
+    """
+    Base class for all SQLAlchemy models.
 
-    pass
+    Server-generated values (ids, ``created_at``, ``updated_at``) are read
+    back with ``INSERT/UPDATE ... RETURNING`` during flush, so written
+    instances are complete without a refresh.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class TimestampMixin:
@@ -0,0 +1,56 @@
+"""
+Work deferred until a session's transaction commits.
+
+Cache invalidation must not run before the change it reflects is
+committed: a concurrent request could read the old rows in between and
+cache them again. ``after_commit`` queues a callback on the session; once
+the transaction commits it becomes due, and on rollback it's dropped.
+``get_session`` runs due callbacks with ``run_after_commit`` when the
+request's session closes.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+AfterCommit = Callable[[], Awaitable[None]]
+
+_PENDING = "after_commit.pending"
+_DUE = "after_commit.due"
+
+
+def after_commit(session: AsyncSession, callback: AfterCommit) -> None:
+    """Run callback once the session's current transaction commits."""
+    session.sync_session.info.setdefault(_PENDING, []).append(callback)
+
+
+async def run_after_commit(session: AsyncSession) -> None:
+    """
+    Run the callbacks of committed transactions, in order.
+
+    The changes are committed already, so a failing callback (e.g. the
+    cache is down) is logged rather than failing the request.
+    """
+    due = session.sync_session.info.pop(_DUE, [])
+    for callback in due:
+        try:
+            await callback()
+        except Exception:
+            logger.exception("After-commit callback failed")
+
+
+@event.listens_for(Session, "after_commit")
+def _transaction_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        session.info.setdefault(_DUE, []).extend(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _transaction_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING, None)
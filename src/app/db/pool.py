@@ -0,0 +1,94 @@
+"""
+Connection pool with checkout metrics.
+
+``InstrumentedPool`` is the application engine's queue pool, timing every
+checkout: the wait for a free connection, opening a new one when the pool
+has room, and the pre-ping if enabled. Its ``stats()`` are reported by
+``GET /metrics``.
+
+Saturation is checked-out connections over ``pool_size + max_overflow``.
+Near 1, requests queue for connections (see ``wait_ms_*``) and eventually
+fail after ``DB_POOL_TIMEOUT``.
+"""
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection
+
+
+class PoolMetrics:
+    """Checkout counters, kept across pool recreation (``engine.dispose()``)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+
+    def record_checkout(self, waited: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts take."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        assert isinstance(pool, InstrumentedPool)
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict[str, float]:
+        """Current usage and checkout counters since startup."""
+        checked_out = self.checkedout()
+        capacity = self.size() + max(self._max_overflow, 0)
+        metrics = self.metrics
+        with metrics._lock:
+            return {
+                "size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": checked_out,
+                "saturation": checked_out / capacity if capacity else 0.0,
+                "peak_checked_out": metrics.peak_checked_out,
+                "checkouts": metrics.checkouts,
+                "timeouts": metrics.timeouts,
+                "wait_ms_avg": (
+                    metrics.wait_total / metrics.checkouts * 1000
+                    if metrics.checkouts else 0.0
+                ),
+                "wait_ms_max": metrics.wait_max * 1000,
+            }
+
+
+def pool_stats(pool: Pool) -> dict[str, float]:
+    """``stats()`` of an instrumented pool; nothing for other pools."""
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return {}
@@ -1,4 +1,6 @@
+import uuid
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -6,17 +8,47 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.db.hooks import run_after_commit
+from app.db.pool import InstrumentedPool
 
 settings = get_settings()
 
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(settings: Settings) -> dict[str, Any]:
+    """Keyword arguments of ``create_async_engine`` for the application."""
+    if settings.DB_PGBOUNCER:
+        # PgBouncer in transaction mode may run each transaction on another
+        # server connection: a statement prepared on one is missing (or a
+        # different one under the same name) on the next
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    else:
+        connect_args = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+        "echo": settings.DB_ECHO,
+    }
+
+
 # Create async engine
-engine = create_async_engine(
-    str(settings.DATABASE_URL),
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    echo=settings.DB_ECHO,
-)
+engine = create_async_engine(str(settings.DATABASE_URL), **engine_options(settings))
 
 # Session factory
 async_session_factory = async_sessionmaker(
@@ -42,4 +74,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.commit()
         except Exception:
             await session.rollback()
-            raise
\ No newline at end of file
+            raise
+        finally:
+            # e.g. cache invalidation, once the changes are visible
+            await run_after_commit(session)
\ No newline at end of file
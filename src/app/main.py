@@ -5,16 +5,25 @@ Multi-tenant CRM backend service with FastAPI.
 """
 
 from contextlib import asynccontextmanager
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Mapping
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.v1.router import api_router
+from app.core.activity_sink import activity_sink
+from app.core.cache import analytics_cache
 from app.core.config import settings
 from app.core.exceptions import AppException
+from app.core.password_hasher import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.revocation import token_revocations
+from app.core.token_cache import token_cache
+from app.db.pool import pool_stats
 from app.db.session import engine
+from app.repositories.contact_search import check_contact_search
+from app.services.activity_outbox import activity_outbox_worker
 
 
 @asynccontextmanager
@@ -25,8 +34,20 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     Manages startup and shutdown events.
     """
     # Startup
+    async with engine.connect() as connection:
+        await check_contact_search(connection)
+    await analytics_cache.start()
+    await principal_cache.start()
+    await token_revocations.start()
+    if settings.ACTIVITY_SINK_MODE == "outbox":
+        activity_outbox_worker.start()
     yield
     # Shutdown
+    await activity_outbox_worker.close()
+    await analytics_cache.close()
+    await principal_cache.close()
+    await token_revocations.close()
+    password_hasher.close()
     await engine.dispose()
 
 
@@ -57,6 +78,7 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
     return JSONResponse(
         status_code=exc.status_code,
         content=exc.to_dict(),
+        headers=exc.headers,
     )
 
 
@@ -85,6 +107,21 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy"}
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics() -> dict[str, Mapping[str, float]]:
+    """Cache, auth, activity log, password hashing and pool counters of this worker."""
+    return {
+        "token_cache": token_cache.stats(),
+        "token_revocations": token_revocations.stats(),
+        "principal_cache": principal_cache.stats(),
+        "analytics_cache": analytics_cache.stats(),
+        "activity_sink": activity_sink.stats(),
+        "activity_outbox": activity_outbox_worker.stats(),
+        "password_hasher": password_hasher.stats(),
+        "db_pool": pool_stats(engine.pool),
+    }
+
+
 @app.get("/", tags=["Root"])
 async def root() -> dict[str, str]:
     """Root endpoint with API information."""
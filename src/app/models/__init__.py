@@ -1,6 +1,8 @@
 from app.models.activity import Activity
+from app.models.activity_outbox import ActivityOutbox
 from app.models.contact import Contact
 from app.models.deal import Deal
+from app.models.deal_stats import DealStats
 from app.models.enums import ActivityType, DealStage, DealStatus, OrganizationRole
 from app.models.organization import Organization
 from app.models.organization_member import OrganizationMember
@@ -10,8 +12,10 @@ from app.models.user import User
 __all__ = [
     # Models
     "Activity",
+    "ActivityOutbox",
     "Contact",
     "Deal",
+    "DealStats",
     "Organization",
     "OrganizationMember",
     "Task",
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.enums import ActivityType
+
+
+class ActivityOutbox(Base):
+    """
+    Activity outbox model.
+
+    Activities written by requests in ``ACTIVITY_SINK_MODE=outbox`` and
+    not yet moved to ``activities`` by the outbox worker. No foreign keys
+    or secondary indexes, so enqueueing is a cheap append.
+    """
+
+    __tablename__ = "activity_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    deal_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    organization_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    author_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    type: Mapped[ActivityType] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<ActivityOutbox(id={self.id}, type='{self.type}', deal_id={self.deal_id})>"
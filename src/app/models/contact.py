@@ -3,7 +3,16 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -14,6 +23,24 @@ if TYPE_CHECKING:
     from app.models.user import User
 
 
+# Full-text document of a contact, see FullTextContactSearch. Email is
+# indexed whole and split into its parts, so both "john@example.com" and
+# "example" match. Only an expression index (not a stored column): adding
+# a generated column would rewrite the table.
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, name || ' ' || coalesce(email, '') || ' ' "
+    "|| translate(coalesce(email, ''), '@.', '  '))"
+)
+
+
+def pg_trgm_available(ddl, target, bind, **kwargs) -> bool:
+    """Emit trigram DDL only where the pg_trgm extension can be installed."""
+    if bind is None:  # offline (--sql) migrations
+        return True
+    query = text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    return bind.execute(query).first() is not None
+
+
 class Contact(Base):
     """
     Contact model.
@@ -22,12 +49,32 @@ class Contact(Base):
     """
 
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_org_owner", "organization_id", "owner_id"),
+        # Search indexes, see app.repositories.contact_search
+        Index(
+            "ix_contacts_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(callable_=pg_trgm_available),
+        Index(
+            "ix_contacts_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(callable_=pg_trgm_available),
+        Index(
+            "ix_contacts_search_document",
+            text(SEARCH_DOCUMENT),
+            postgresql_using="gin",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     organization_id: Mapped[int] = mapped_column(
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     owner_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="RESTRICT"),
@@ -60,4 +107,13 @@ class Contact(Base):
     )
 
     def __repr__(self) -> str:
-        return f"<Contact(id={self.id}, name='{self.name}')>"
\ No newline at end of file
+        return f"<Contact(id={self.id}, name='{self.name}')>"
+
+
+event.listen(
+    Contact.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        callable_=pg_trgm_available
+    ),
+)
@@ -2,7 +2,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -24,12 +24,41 @@ class Deal(Base):
     """
 
     __tablename__ = "deals"
+    # Every listing is tenant-scoped, so indexes lead with organization_id
+    # and end with the columns the repository sorts or filters on
+    __table_args__ = (
+        Index(
+            "ix_deals_org_created_at",
+            "organization_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_deals_org_updated_at",
+            "organization_id",
+            text("updated_at DESC"),
+            text("id DESC"),
+        ),
+        Index("ix_deals_org_amount", "organization_id", "amount", "id"),
+        Index(
+            "ix_deals_org_status_created_at",
+            "organization_id",
+            "status",
+            text("created_at DESC"),
+        ),
+        Index(
+            "ix_deals_org_owner_created_at",
+            "organization_id",
+            "owner_id",
+            text("created_at DESC"),
+        ),
+        Index("ix_deals_org_stage_status", "organization_id", "stage", "status"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     organization_id: Mapped[int] = mapped_column(
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     contact_id: Mapped[int] = mapped_column(
         ForeignKey("contacts.id", ondelete="RESTRICT"),
@@ -0,0 +1,38 @@
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.enums import DealStage, DealStatus
+
+
+class DealStats(Base):
+    """
+    Deal rollup model.
+
+    Deal count and amount sum per organization, stage and status.
+    Maintained incrementally by DealService, so analytics reads cost
+    O(stages x statuses) instead of O(deals).
+    """
+
+    __tablename__ = "deal_stats"
+
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    stage: Mapped[DealStage] = mapped_column(String(50), primary_key=True)
+    status: Mapped[DealStatus] = mapped_column(String(50), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(precision=20, scale=2),
+        nullable=False,
+        default=Decimal("0.00"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<DealStats(org_id={self.organization_id}, stage='{self.stage}', "
+            f"status='{self.status}', count={self.count})>"
+        )
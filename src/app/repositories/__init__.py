@@ -2,6 +2,7 @@ from app.repositories.activity import ActivityRepository
 from app.repositories.base import BaseRepository
 from app.repositories.contact import ContactRepository
 from app.repositories.deal import DealRepository
+from app.repositories.deal_stats import DealStatsRepository
 from app.repositories.organization import (
         OrganizationMemberRepository,
         OrganizationRepository      
@@ -15,6 +16,7 @@ __all__ = [
     "ActivityRepository",
     "ContactRepository",
     "DealRepository",
+    "DealStatsRepository",
     "OrganizationRepository",
     "OrganizationMemberRepository",
     "TaskRepository",
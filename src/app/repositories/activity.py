@@ -1,9 +1,15 @@
 """Activity repository."""
 
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import RowMapping, Select, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.activity_sink import activity_sink
+from app.core.pagination import Cursor
 from app.models.activity import Activity
 from app.models.enums import ActivityType
 from app.repositories.base import BaseRepository
@@ -12,6 +18,16 @@ from app.repositories.base import BaseRepository
 class ActivityRepository(BaseRepository[Activity]):
     """Repository for Activity model."""
 
+    # Columns of exported activities (as in ActivityResponse)
+    EXPORT_COLUMNS = (
+        Activity.id,
+        Activity.deal_id,
+        Activity.author_id,
+        Activity.type,
+        Activity.payload,
+        Activity.created_at,
+    )
+
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(Activity, session)
 
@@ -21,28 +37,139 @@ class ActivityRepository(BaseRepository[Activity]):
         *,
         skip: int = 0,
         limit: int = 50,
+        cursor: Cursor | None = None,
     ) -> list[Activity]:
-        """Get activities for a deal (newest first)."""
+        """
+        Get activities for a deal (newest first).
+
+        With ``cursor`` the page starts right after the cursor row
+        (keyset pagination) and ``skip`` is ignored.
+        """
         query = (
             select(Activity)
             .where(Activity.deal_id == deal_id)
             .options(selectinload(Activity.author))
-            .order_by(Activity.created_at.desc())
-            .offset(skip)
-            .limit(limit)
         )
-        result = await self.session.execute(query)
+        result = await self.session.execute(self._page(query, skip, limit, cursor))
         return list(result.scalars().all())
 
+    async def get_by_deal_in_organization(
+        self,
+        deal_id: int,
+        organization_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Cursor | None = None,
+    ) -> list[Activity]:
+        """
+        Get activities for a deal of the organization (newest first).
+
+        The tenant check and authors are part of the activity query. An
+        empty list doesn't tell a deal without activities from a foreign
+        one; check the deal only in that case. Paging works as in
+        ``get_by_deal``.
+        """
+        query = (
+            select(Activity)
+            .where(
+                Activity.deal_id == deal_id,
+                Activity.organization_id == organization_id,
+            )
+            .options(joinedload(Activity.author))
+        )
+        result = await self.session.execute(self._page(query, skip, limit, cursor))
+        return list(result.scalars().all())
+
+    async def get_by_organization(
+        self,
+        organization_id: int,
+        *,
+        type: ActivityType | None = None,
+        author_id: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 50,
+        cursor: Cursor | None = None,
+    ) -> list[Activity]:
+        """
+        Get the organization's activity feed (newest first).
+
+        ``since`` is inclusive and ``until`` exclusive. Authors are loaded
+        with one batched query for the page.
+        """
+        query = (
+            select(Activity)
+            .where(Activity.organization_id == organization_id)
+            .options(selectinload(Activity.author))
+        )
+        if type:
+            query = query.where(Activity.type == type)
+        if author_id:
+            query = query.where(Activity.author_id == author_id)
+        if since:
+            query = query.where(Activity.created_at >= since)
+        if until:
+            query = query.where(Activity.created_at < until)
+        result = await self.session.execute(self._page(query, 0, limit, cursor))
+        return list(result.scalars().all())
+
+    def _page(
+        self,
+        query: Select,
+        skip: int,
+        limit: int,
+        cursor: Cursor | None,
+    ) -> Select:
+        """Order a timeline query and cut one page, by offset or cursor."""
+        query = query.order_by(Activity.created_at.desc(), Activity.id.desc())
+        if cursor is None:
+            return query.offset(skip).limit(limit)
+        cursor.check_ordering("created_at", "desc", datetime)
+        return query.where(
+            # The plain bound lets partitions newer than the cursor be pruned
+            Activity.created_at <= cursor.value,
+            tuple_(Activity.created_at, Activity.id) < tuple_(cursor.value, cursor.id),
+        ).limit(limit)
+
+    @staticmethod
+    def make_cursor(activity: Activity) -> Cursor:
+        """Build a timeline cursor pointing at the given activity."""
+        return Cursor(
+            order_by="created_at",
+            order="desc",
+            value=activity.created_at,
+            id=activity.id,
+        )
+
+    def stream_by_organization(
+        self,
+        organization_id: int,
+        *,
+        deal_id: int | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[RowMapping]:
+        """Stream ``EXPORT_COLUMNS`` of the organization's activities."""
+        query = (
+            select(Activity)
+            .where(Activity.organization_id == organization_id)
+            .order_by(Activity.id)
+        )
+        if deal_id:
+            query = query.where(Activity.deal_id == deal_id)
+        return self.stream_columns(query, self.EXPORT_COLUMNS, batch_size=batch_size)
+
     async def create_comment(
         self,
         deal_id: int,
+        organization_id: int,
         author_id: int,
         text: str,
     ) -> Activity:
         """Create a comment activity."""
         return await self.create(
             deal_id=deal_id,
+            organization_id=organization_id,
             author_id=author_id,
             type=ActivityType.COMMENT,
             payload={"text": text},
@@ -51,63 +178,110 @@ class ActivityRepository(BaseRepository[Activity]):
     async def create_status_changed(
         self,
         deal_id: int,
+        organization_id: int,
         author_id: int | None,
         old_status: str,
         new_status: str,
-    ) -> Activity:
-        """Create a status change activity."""
-        return await self.create(
-            deal_id=deal_id,
-            author_id=author_id,
-            type=ActivityType.STATUS_CHANGED,
-            payload={
-                "old_status": old_status,
-                "new_status": new_status,
-            },
+    ) -> None:
+        """Create a status change activity (not loaded back)."""
+        await self.log(
+            [self.status_changed_values(
+                deal_id, organization_id, author_id, old_status, new_status
+            )]
         )
 
     async def create_stage_changed(
         self,
         deal_id: int,
+        organization_id: int,
         author_id: int | None,
         old_stage: str,
         new_stage: str,
-    ) -> Activity:
-        """Create a stage change activity."""
-        return await self.create(
-            deal_id=deal_id,
-            author_id=author_id,
-            type=ActivityType.STAGE_CHANGED,
-            payload={
+    ) -> None:
+        """Create a stage change activity (not loaded back)."""
+        await self.log(
+            [self.stage_changed_values(
+                deal_id, organization_id, author_id, old_stage, new_stage
+            )]
+        )
+
+    async def log(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Write activities without loading them back.
+
+        Goes through the activity sink, so depending on
+        ``ACTIVITY_SINK_MODE`` the rows may only be written at commit.
+        """
+        await activity_sink.add(self.session, rows)
+
+    @staticmethod
+    def status_changed_values(
+        deal_id: int,
+        organization_id: int,
+        author_id: int | None,
+        old_status: str,
+        new_status: str,
+    ) -> dict[str, Any]:
+        """Column values of a status change activity (for ``log``)."""
+        return {
+            "deal_id": deal_id,
+            "organization_id": organization_id,
+            "author_id": author_id,
+            "type": ActivityType.STATUS_CHANGED,
+            "payload": {
+                "old_status": old_status,
+                "new_status": new_status,
+            },
+        }
+
+    @staticmethod
+    def stage_changed_values(
+        deal_id: int,
+        organization_id: int,
+        author_id: int | None,
+        old_stage: str,
+        new_stage: str,
+    ) -> dict[str, Any]:
+        """Column values of a stage change activity (for ``log``)."""
+        return {
+            "deal_id": deal_id,
+            "organization_id": organization_id,
+            "author_id": author_id,
+            "type": ActivityType.STAGE_CHANGED,
+            "payload": {
                 "old_stage": old_stage,
                 "new_stage": new_stage,
             },
-        )
+        }
 
     async def create_task_created(
         self,
         deal_id: int,
+        organization_id: int,
         author_id: int,
         task_title: str,
-    ) -> Activity:
-        """Create a task created activity."""
-        return await self.create(
-            deal_id=deal_id,
-            author_id=author_id,
-            type=ActivityType.TASK_CREATED,
-            payload={"task_title": task_title},
-        )
+    ) -> None:
+        """Create a task created activity (not loaded back)."""
+        await self.log([{
+            "deal_id": deal_id,
+            "organization_id": organization_id,
+            "author_id": author_id,
+            "type": ActivityType.TASK_CREATED,
+            "payload": {"task_title": task_title},
+        }])
 
     async def create_task_completed(
         self,
         deal_id: int,
+        organization_id: int,
         author_id: int,
         task_title: str,
-    ) -> Activity:
-        """Create a task completed activity."""
-        return await self.create(
-            deal_id=deal_id,
-            author_id=author_id,
-            type=ActivityType.TASK_COMPLETED,
-            payload={"task_title": task_title},
-        )
\ No newline at end of file
+    ) -> None:
+        """Create a task completed activity (not loaded back)."""
+        await self.log([{
+            "deal_id": deal_id,
+            "organization_id": organization_id,
+            "author_id": author_id,
+            "type": ActivityType.TASK_COMPLETED,
+            "payload": {"task_title": task_title},
+        }])
\ No newline at end of file
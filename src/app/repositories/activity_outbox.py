@@ -0,0 +1,81 @@
+"""Activity outbox repository."""
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.activity import Activity
+from app.models.activity_outbox import ActivityOutbox
+from app.models.deal import Deal
+from app.models.user import User
+from app.repositories.base import BaseRepository
+
+
+class ActivityOutboxRepository(BaseRepository[ActivityOutbox]):
+    """Repository for ActivityOutbox model."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(ActivityOutbox, session)
+
+    async def drain(self, limit: int) -> int:
+        """
+        Move up to limit of the oldest outbox rows to activities.
+
+        One statement deletes the rows and inserts them, so a batch moves
+        completely or not at all. Rows locked by a concurrent drain are
+        skipped. Activities of deals deleted meanwhile are dropped and
+        authors deleted meanwhile become NULL, as the foreign keys of
+        ``activities`` would have done. Returns the number of rows taken
+        from the outbox.
+        """
+        oldest = (
+            select(ActivityOutbox.id)
+            .order_by(ActivityOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        batch = (
+            delete(ActivityOutbox)
+            .where(ActivityOutbox.id.in_(oldest.scalar_subquery()))
+            .returning(
+                ActivityOutbox.id,
+                ActivityOutbox.deal_id,
+                ActivityOutbox.organization_id,
+                ActivityOutbox.author_id,
+                ActivityOutbox.type,
+                ActivityOutbox.payload,
+                ActivityOutbox.created_at,
+            )
+            .cte("batch")
+        )
+        moved = (
+            insert(Activity)
+            .from_select(
+                [
+                    "deal_id",
+                    "organization_id",
+                    "author_id",
+                    "type",
+                    "payload",
+                    "created_at",
+                ],
+                select(
+                    batch.c.deal_id,
+                    batch.c.organization_id,
+                    User.id,
+                    batch.c.type,
+                    batch.c.payload,
+                    batch.c.created_at,
+                )
+                .join(Deal, Deal.id == batch.c.deal_id)
+                .outerjoin(User, User.id == batch.c.author_id)
+                .order_by(batch.c.id),
+            )
+            .returning(Activity.id)
+            .cte("moved")
+        )
+        query = select(
+            select(func.count()).select_from(batch).scalar_subquery(),
+            select(func.count()).select_from(moved).scalar_subquery(),
+        )
+        drained, _ = (await self.session.execute(query)).one()
+        return drained
@@ -1,13 +1,32 @@
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import select, func
+from sqlalchemy import RowMapping, Select, insert, select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
+from app.core.pagination import CountMode
 from app.db.base import Base
+from app.db.hooks import AfterCommit, after_commit
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, with its parameters bound."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
 class BaseRepository(Generic[ModelType]):
     """
     Base repository with generic CRUD operations.
@@ -35,26 +54,61 @@ class BaseRepository(Generic[ModelType]):
         return list(result.scalars().all())
 
     async def create(self, **kwargs: Any) -> ModelType:
-        """Create a new record."""
+        """Create a new record (server defaults come back via RETURNING)."""
         instance = self.model(**kwargs)
         self.session.add(instance)
         await self.session.flush()
-        await self.session.refresh(instance)
         return instance
 
+    async def add(self, **kwargs: Any) -> None:
+        """
+        Insert a record without loading it back.
+
+        For fire-and-forget rows (e.g. activity log entries): a plain
+        INSERT with no RETURNING and no instance in the session.
+        """
+        await self.session.execute(insert(self.model).values(**kwargs))
+
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[int]:
+        """
+        Insert records in one statement and return their ids.
+
+        Skips the ORM unit of work: no instances are loaded and no
+        per-row refresh is done.
+        """
+        if not rows:
+            return []
+        result = await self.session.scalars(
+            insert(self.model).returning(self.model.id), rows
+        )
+        return list(result.all())
+
     async def update(
         self,
         instance: ModelType,
         **kwargs: Any,
     ) -> ModelType:
-        """Update an existing record."""
+        """Update an existing record (``onupdate`` values come back via RETURNING)."""
         for key, value in kwargs.items():
             if hasattr(instance, key):
                 setattr(instance, key, value)
         await self.session.flush()
-        await self.session.refresh(instance)
         return instance
 
+    async def update_many(self, ids: Sequence[int], **kwargs: Any) -> int:
+        """
+        Set the same values on records in one UPDATE; returns rows changed.
+
+        ``onupdate`` defaults apply and instances already in the session
+        are kept in sync.
+        """
+        if not ids:
+            return 0
+        result = await self.session.execute(
+            update(self.model).where(self.model.id.in_(ids)).values(**kwargs)
+        )
+        return result.rowcount
+
     async def delete(self, instance: ModelType) -> None:
         """Delete a record."""
         await self.session.delete(instance)
@@ -66,6 +120,93 @@ class BaseRepository(Generic[ModelType]):
         result = await self.session.execute(query)
         return result.scalar() or 0
 
+    async def paginate(
+        self,
+        query: Select,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        count_mode: CountMode = "exact",
+        total_query: Select | None = None,
+    ) -> tuple[list[ModelType], int, bool]:
+        """
+        Fetch a page of query, the total number of rows and whether that
+        total is exact.
+
+        In ``exact`` mode the total comes from ``count(*) OVER()`` in the
+        page statement itself; in ``estimated`` mode from the planner's
+        row estimate, unless the page shows where the rows end (then the
+        total is exact too).
+
+        ``total_query`` selects the rows to count when query narrows them
+        further (e.g. past a keyset cursor), which rules out the window.
+        """
+        page = query.offset(skip).limit(limit)
+
+        if count_mode == "exact" and total_query is None:
+            rows = (await self.session.execute(
+                page.add_columns(func.count().over().label("total"))
+            )).all()
+            items = [row[0] for row in rows]
+            if rows:
+                return items, rows[0].total, True
+            # Past the last page there are no rows to carry the total
+            return items, await self.count_rows(query) if skip else 0, True
+
+        items = list((await self.session.scalars(page)).all())
+        total_query = query if total_query is None else total_query
+        if count_mode == "exact":
+            return items, await self.count_rows(total_query), True
+        if total_query is query and len(items) < limit and (items or not skip):
+            return items, skip + len(items), True
+        estimate = await self.estimate_rows(total_query)
+        return items, max(estimate, skip + len(items)), False
+
+    async def count_rows(self, query: Select) -> int:
+        """Count rows a query returns."""
+        subquery = query.order_by(None).limit(None).offset(None).subquery()
+        result = await self.session.execute(select(func.count()).select_from(subquery))
+        return result.scalar() or 0
+
+    async def estimate_rows(self, query: Select) -> int:
+        """Planner's estimate of the rows a query returns (no execution)."""
+        query = query.order_by(None).limit(None).offset(None)
+        plan = (await self.session.execute(Explain(query))).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def stream_columns(
+        self,
+        query: Select,
+        columns: Sequence[Any],
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[RowMapping]:
+        """
+        Stream plain column rows of a query through a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time and no ORM instances
+        are built, so memory doesn't grow with the number of rows.
+        """
+        query = query.with_only_columns(*columns).execution_options(
+            yield_per=batch_size
+        )
+        result = await self.session.stream(query)
+        async for row in result.mappings():
+            yield row
+
+    async def release_connection(self) -> None:
+        """
+        Commit the open transaction so its connection returns to the pool.
+
+        For requests that wait on something slow after reading; loaded
+        objects stay usable, since sessions don't expire them on commit.
+        """
+        await self.session.commit()
+
+    def after_commit(self, callback: AfterCommit) -> None:
+        """Run callback (e.g. a cache invalidation) once the changes commit."""
+        after_commit(self.session, callback)
+
     async def exists(self, id: int) -> bool:
         """Check if a record exists by ID."""
         instance = await self.get_by_id(id)
@@ -1,15 +1,35 @@
-from sqlalchemy import select, func, or_
+from collections.abc import AsyncIterator
+
+from sqlalchemy import RowMapping, Select, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import CountMode
 from app.models.contact import Contact
 from app.repositories.base import BaseRepository
+from app.repositories.contact_search import ContactSearch, get_contact_search
 
 
 class ContactRepository(BaseRepository[Contact]):
     """Repository for Contact model."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    # Columns of exported contacts (as in ContactResponse)
+    EXPORT_COLUMNS = (
+        Contact.id,
+        Contact.organization_id,
+        Contact.owner_id,
+        Contact.name,
+        Contact.email,
+        Contact.phone,
+        Contact.created_at,
+    )
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        search: ContactSearch | None = None,
+    ) -> None:
         super().__init__(Contact, session)
+        self.search = search or get_contact_search()
 
     async def get_by_organization(
         self,
@@ -20,24 +40,70 @@ class ContactRepository(BaseRepository[Contact]):
         search: str | None = None,
         owner_id: int | None = None,
     ) -> list[Contact]:
-        """Get contacts for organization with filters."""
+        """
+        Get contacts for organization with filters.
+
+        With ``search`` results are ordered best match first.
+        """
+        query = self._filtered_query(organization_id, search, owner_id)
+        query = query.offset(skip).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_page_by_organization(
+        self,
+        organization_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        search: str | None = None,
+        owner_id: int | None = None,
+        count_mode: CountMode = "exact",
+    ) -> tuple[list[Contact], int, bool]:
+        """
+        Get a page of contacts (as ``get_by_organization``), the total
+        number of contacts matching the filters and whether it's exact.
+        """
+        return await self.paginate(
+            self._filtered_query(organization_id, search, owner_id),
+            skip=skip,
+            limit=limit,
+            count_mode=count_mode,
+        )
+
+    def stream_by_organization(
+        self,
+        organization_id: int,
+        *,
+        search: str | None = None,
+        owner_id: int | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[RowMapping]:
+        """Stream ``EXPORT_COLUMNS`` of all matching contacts (no paging)."""
+        query = self._filtered_query(organization_id, search, owner_id)
+        if not search:
+            query = query.order_by(Contact.id)
+        return self.stream_columns(query, self.EXPORT_COLUMNS, batch_size=batch_size)
+
+    def _filtered_query(
+        self,
+        organization_id: int,
+        search: str | None,
+        owner_id: int | None,
+    ) -> Select:
         query = select(Contact).where(
             Contact.organization_id == organization_id
         )
 
         if search:
-            search_filter = or_(
-                Contact.name.ilike(f"%{search}%"),
-                Contact.email.ilike(f"%{search}%"),
+            query = query.where(self.search.match(search)).order_by(
+                self.search.rank(search).desc(), Contact.id
             )
-            query = query.where(search_filter)
 
         if owner_id:
             query = query.where(Contact.owner_id == owner_id)
 
-        query = query.offset(skip).limit(limit)
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+        return query
 
     async def count_by_organization(
         self,
@@ -51,11 +117,7 @@ class ContactRepository(BaseRepository[Contact]):
         )
 
         if search:
-            search_filter = or_(
-                Contact.name.ilike(f"%{search}%"),
-                Contact.email.ilike(f"%{search}%"),
-            )
-            query = query.where(search_filter)
+            query = query.where(self.search.match(search))
 
         if owner_id:
             query = query.where(Contact.owner_id == owner_id)
@@ -63,6 +125,21 @@ class ContactRepository(BaseRepository[Contact]):
         result = await self.session.execute(query)
         return result.scalar() or 0
 
+    async def get_ids_in_organization(
+        self,
+        organization_id: int,
+        contact_ids: set[int],
+    ) -> set[int]:
+        """Return which of the given contact ids belong to organization."""
+        if not contact_ids:
+            return set()
+        query = select(Contact.id).where(
+            Contact.organization_id == organization_id,
+            Contact.id.in_(contact_ids),
+        )
+        result = await self.session.scalars(query)
+        return set(result.all())
+
     async def has_deals(self, contact_id: int) -> bool:
         """Check if contact has any deals."""
         from app.models.deal import Deal
@@ -0,0 +1,154 @@
+"""Contact search strategies."""
+
+import re
+from abc import ABC, abstractmethod
+
+from sqlalchemy import (
+    ColumnElement,
+    case,
+    false,
+    func,
+    literal,
+    literal_column,
+    or_,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.models.contact import SEARCH_DOCUMENT, Contact
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term matches literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class ContactSearch(ABC):
+    """
+    How a search term filters and ranks contacts.
+
+    ``match`` selects contacts whose name or email matches the term,
+    ``rank`` orders them best match first.
+    """
+
+    name: str
+    # PostgreSQL extension the backend needs, checked at startup
+    extension: str | None = None
+
+    @abstractmethod
+    def match(self, term: str) -> ColumnElement[bool]:
+        """Filter condition for contacts matching term."""
+
+    @abstractmethod
+    def rank(self, term: str) -> ColumnElement:
+        """Relevance of a contact to term (higher is better)."""
+
+
+class IlikeContactSearch(ContactSearch):
+    """
+    Substring match with ILIKE.
+
+    Needs no extension, but a leading wildcard can't use a btree index,
+    so every search scans the organization's contacts.
+    """
+
+    name = "ilike"
+
+    def match(self, term: str) -> ColumnElement[bool]:
+        pattern = f"%{escape_like(term)}%"
+        return or_(Contact.name.ilike(pattern), Contact.email.ilike(pattern))
+
+    def rank(self, term: str) -> ColumnElement:
+        # Names starting with the term first
+        return case((Contact.name.ilike(f"{escape_like(term)}%"), 1), else_=0)
+
+
+class TrigramContactSearch(IlikeContactSearch):
+    """
+    Substring match served by pg_trgm GIN indexes, ranked by similarity.
+
+    Same matches as ``ilike``; terms of three or more characters are
+    answered from the ``ix_contacts_*_trgm`` indexes.
+    """
+
+    name = "trigram"
+    extension = "pg_trgm"
+
+    def rank(self, term: str) -> ColumnElement:
+        similarity = func.greatest(
+            func.similarity(Contact.name, term),
+            func.similarity(func.coalesce(Contact.email, ""), term),
+        )
+        return super().rank(term) + similarity
+
+
+class FullTextContactSearch(ContactSearch):
+    """
+    Word-prefix match on the contact's tsvector (``SEARCH_DOCUMENT``).
+
+    Every word of the term must start a word of the name or email
+    ("jo sm" finds "John Smith"); ranked with ts_rank. The document is
+    written out exactly as in ``ix_contacts_search_document``, so the
+    planner can answer the match from that index.
+    """
+
+    name = "fulltext"
+
+    @staticmethod
+    def to_tsquery(term: str) -> str | None:
+        """Build a prefix tsquery from the words of term."""
+        words = re.findall(r"\w+", term.lower())
+        if not words:
+            return None
+        return " & ".join(f"{word}:*" for word in words)
+
+    def match(self, term: str) -> ColumnElement[bool]:
+        query = self.to_tsquery(term)
+        if query is None:
+            return false()
+        return self.document().op("@@")(func.to_tsquery("simple", query))
+
+    def rank(self, term: str) -> ColumnElement:
+        query = self.to_tsquery(term)
+        if query is None:
+            return literal(0)
+        return func.ts_rank(self.document(), func.to_tsquery("simple", query))
+
+    @staticmethod
+    def document() -> ColumnElement:
+        return literal_column(SEARCH_DOCUMENT)
+
+
+CONTACT_SEARCH_BACKENDS: dict[str, type[ContactSearch]] = {
+    backend.name: backend
+    for backend in (IlikeContactSearch, TrigramContactSearch, FullTextContactSearch)
+}
+
+
+def get_contact_search(kind: str | None = None) -> ContactSearch:
+    """Create the configured (or requested) contact search strategy."""
+    return CONTACT_SEARCH_BACKENDS[kind or settings.CONTACT_SEARCH_BACKEND]()
+
+
+async def check_contact_search(
+    connection: AsyncConnection, kind: str | None = None
+) -> None:
+    """
+    Fail fast if the configured (or requested) search backend can't work.
+
+    The migration skips the trigram indexes where pg_trgm isn't available;
+    without this check ``trigram`` would only fail on the first search.
+    """
+    backend = CONTACT_SEARCH_BACKENDS[kind or settings.CONTACT_SEARCH_BACKEND]
+    if backend.extension is None:
+        return
+    installed = await connection.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = :name"),
+        {"name": backend.extension},
+    )
+    if installed.first() is None:
+        raise RuntimeError(
+            f"CONTACT_SEARCH_BACKEND={backend.name} needs the "
+            f"{backend.extension} extension, which isn't installed"
+        )
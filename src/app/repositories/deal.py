@@ -1,11 +1,14 @@
 """Deal repository."""
 
+from collections.abc import AsyncIterator
+from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import RowMapping, Select, select, func, and_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.pagination import CountMode, Cursor
 from app.models.deal import Deal
 from app.models.enums import DealStatus, DealStage
 from app.repositories.base import BaseRepository
@@ -14,6 +17,31 @@ from app.repositories.base import BaseRepository
 class DealRepository(BaseRepository[Deal]):
     """Repository for Deal model."""
 
+    # Columns deals can be sorted by; ``id`` is always the tie-breaker
+    SORTABLE_COLUMNS = {
+        "created_at": Deal.created_at,
+        "updated_at": Deal.updated_at,
+        "amount": Deal.amount,
+        "title": Deal.title,
+        "status": Deal.status,
+        "stage": Deal.stage,
+    }
+    DEFAULT_ORDER_BY = "created_at"
+    # Columns of exported deals (as in DealResponse)
+    EXPORT_COLUMNS = (
+        Deal.id,
+        Deal.organization_id,
+        Deal.contact_id,
+        Deal.owner_id,
+        Deal.title,
+        Deal.amount,
+        Deal.currency,
+        Deal.status,
+        Deal.stage,
+        Deal.created_at,
+        Deal.updated_at,
+    )
+
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(Deal, session)
 
@@ -30,8 +58,134 @@ class DealRepository(BaseRepository[Deal]):
         max_amount: Decimal | None = None,
         order_by: str = "created_at",
         order: str = "desc",
+        cursor: Cursor | None = None,
+    ) -> list[Deal]:
+        """
+        Get deals for organization with filters.
+
+        With ``cursor`` the page starts right after the cursor row
+        (keyset pagination) and ``skip`` is ignored.
+        """
+        query = self._filtered_query(
+            organization_id, status, stage, owner_id, min_amount, max_amount
+        )
+        query = self._ordered(query, order_by, order)
+        if cursor is not None:
+            query = self._after(query, cursor, order_by, order)
+        else:
+            query = query.offset(skip)
+
+        query = query.limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_page_by_organization(
+        self,
+        organization_id: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        status: list[DealStatus] | None = None,
+        stage: DealStage | None = None,
+        owner_id: int | None = None,
+        min_amount: Decimal | None = None,
+        max_amount: Decimal | None = None,
+        order_by: str = "created_at",
+        order: str = "desc",
+        cursor: Cursor | None = None,
+        count_mode: CountMode = "exact",
+    ) -> tuple[list[Deal], int, bool]:
+        """
+        Get a page of deals (as ``get_by_organization``), the total
+        number of deals matching the filters and whether it's exact.
+        """
+        query = self._filtered_query(
+            organization_id, status, stage, owner_id, min_amount, max_amount
+        )
+        ordered = self._ordered(query, order_by, order)
+        if cursor is None:
+            return await self.paginate(
+                ordered, skip=skip, limit=limit, count_mode=count_mode
+            )
+        return await self.paginate(
+            self._after(ordered, cursor, order_by, order),
+            limit=limit,
+            count_mode=count_mode,
+            total_query=query,
+        )
+
+    def stream_by_organization(
+        self,
+        organization_id: int,
+        *,
+        status: list[DealStatus] | None = None,
+        stage: DealStage | None = None,
+        owner_id: int | None = None,
+        min_amount: Decimal | None = None,
+        max_amount: Decimal | None = None,
+        order_by: str = "created_at",
+        order: str = "desc",
+        batch_size: int = 1000,
+    ) -> AsyncIterator[RowMapping]:
+        """Stream ``EXPORT_COLUMNS`` of all matching deals (no paging)."""
+        query = self._filtered_query(
+            organization_id, status, stage, owner_id, min_amount, max_amount
+        )
+        return self.stream_columns(
+            self._ordered(query, order_by, order),
+            self.EXPORT_COLUMNS,
+            batch_size=batch_size,
+        )
+
+    async def get_for_update(self, deal_id: int, organization_id: int) -> Deal | None:
+        """
+        Lock and load an organization's deal.
+
+        Changes derived from its current values (e.g. rollup deltas) then
+        can't race with a concurrent update of the same deal, which waits.
+        """
+        query = (
+            select(Deal)
+            .where(Deal.id == deal_id, Deal.organization_id == organization_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_for_bulk_update(
+        self,
+        organization_id: int,
+        *,
+        ids: list[int] | None = None,
+        status: list[DealStatus] | None = None,
+        stage: DealStage | None = None,
+        owner_id: int | None = None,
+        limit: int = 1000,
     ) -> list[Deal]:
-        """Get deals for organization with filters."""
+        """
+        Lock and load the organization's deals among ids and/or matching
+        the filters.
+
+        Rows are locked in id order, so concurrent bulk updates of
+        overlapping sets wait for each other instead of deadlocking.
+        """
+        query = self._filtered_query(organization_id, status, stage, owner_id, None, None)
+        if ids is not None:
+            query = query.where(Deal.id.in_(ids))
+        query = query.order_by(Deal.id).limit(limit).with_for_update()
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    def _filtered_query(
+        self,
+        organization_id: int,
+        status: list[DealStatus] | None,
+        stage: DealStage | None,
+        owner_id: int | None,
+        min_amount: Decimal | None,
+        max_amount: Decimal | None,
+    ) -> Select:
         query = select(Deal).where(Deal.organization_id == organization_id)
 
         if status:
@@ -49,16 +203,61 @@ class DealRepository(BaseRepository[Deal]):
         if max_amount is not None:
             query = query.where(Deal.amount <= max_amount)
 
-        # Sorting
-        order_column = getattr(Deal, order_by, Deal.created_at)
+        return query
+
+    def _ordered(self, query: Select, order_by: str, order: str) -> Select:
+        order_column = self.SORTABLE_COLUMNS[self.resolve_order_by(order_by)]
         if order == "desc":
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+            return query.order_by(order_column.desc(), Deal.id.desc())
+        return query.order_by(order_column.asc(), Deal.id.asc())
 
-        query = query.offset(skip).limit(limit)
+    def _after(
+        self,
+        query: Select,
+        cursor: Cursor,
+        order_by: str,
+        order: str,
+    ) -> Select:
+        """Restrict an ordered query to rows past the cursor row."""
+        order_by = self.resolve_order_by(order_by)
+        column = self.SORTABLE_COLUMNS[order_by]
+        cursor.check_ordering(order_by, order, column.type.python_type)
+        position = tuple_(column, Deal.id)
+        boundary = tuple_(cursor.value, cursor.id)
+        if order == "desc":
+            return query.where(position < boundary)
+        return query.where(position > boundary)
+
+    @classmethod
+    def resolve_order_by(cls, order_by: str) -> str:
+        """Map requested sort field to a sortable one (defaults to created_at)."""
+        if order_by in cls.SORTABLE_COLUMNS:
+            return order_by
+        return cls.DEFAULT_ORDER_BY
+
+    @classmethod
+    def make_cursor(cls, deal: Deal, order_by: str, order: str) -> Cursor:
+        """Build a cursor pointing at the given deal."""
+        order_by = cls.resolve_order_by(order_by)
+        return Cursor(
+            order_by=order_by,
+            order=order,
+            value=getattr(deal, order_by),
+            id=deal.id,
+        )
+
+    async def get_owner_id_in_organization(
+        self,
+        deal_id: int,
+        organization_id: int,
+    ) -> int | None:
+        """Owner id of a deal, or None if it isn't in the organization."""
+        query = select(Deal.owner_id).where(
+            Deal.id == deal_id,
+            Deal.organization_id == organization_id,
+        )
         result = await self.session.execute(query)
-        return list(result.scalars().all())
+        return result.scalar_one_or_none()
 
     async def get_with_relations(self, deal_id: int) -> Deal | None:
         """Get deal with contact and owner loaded."""
@@ -89,6 +288,19 @@ class DealRepository(BaseRepository[Deal]):
         result = await self.session.execute(query)
         return result.scalar() or 0
 
+    async def count_created_since(
+        self,
+        organization_id: int,
+        created_since: datetime,
+    ) -> int:
+        """Count deals created since the given moment."""
+        query = select(func.count()).select_from(Deal).where(
+            Deal.organization_id == organization_id,
+            Deal.created_at >= created_since,
+        )
+        result = await self.session.execute(query)
+        return result.scalar() or 0
+
     async def get_summary_by_status(
         self,
         organization_id: int,
@@ -113,6 +325,50 @@ class DealRepository(BaseRepository[Deal]):
             for row in result.all()
         ]
 
+    async def get_summary(
+        self,
+        organization_id: int,
+        created_since: datetime,
+    ) -> dict:
+        """
+        Get deals summary in a single aggregate query.
+
+        Returns count and sum per status, average won amount and the
+        number of deals created since ``created_since``.
+        """
+        columns = []
+        for status in DealStatus:
+            is_status = Deal.status == status
+            columns.append(
+                func.count().filter(is_status).label(f"{status.value}_count")
+            )
+            columns.append(
+                func.sum(Deal.amount).filter(is_status).label(f"{status.value}_sum")
+            )
+        columns.append(
+            func.avg(Deal.amount).filter(Deal.status == DealStatus.WON).label("avg_won")
+        )
+        columns.append(
+            func.count()
+            .filter(Deal.created_at >= created_since)
+            .label("created_since_count")
+        )
+
+        query = select(*columns).where(Deal.organization_id == organization_id)
+        row = (await self.session.execute(query)).one()._mapping
+
+        return {
+            "by_status": {
+                status.value: {
+                    "count": row[f"{status.value}_count"],
+                    "total_amount": row[f"{status.value}_sum"] or Decimal("0"),
+                }
+                for status in DealStatus
+            },
+            "average_won_amount": row["avg_won"] or Decimal("0"),
+            "new_deals_count": row["created_since_count"],
+        }
+
     async def get_avg_won_amount(self, organization_id: int) -> Decimal:
         """Get average amount of won deals."""
         query = (
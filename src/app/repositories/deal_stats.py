@@ -0,0 +1,127 @@
+"""Deal rollup repository."""
+
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.deal import Deal
+from app.models.deal_stats import DealStats
+from app.repositories.base import BaseRepository
+
+# (stage, status) -> (count delta, amount delta)
+StatsDeltas = dict[tuple[str, str], tuple[int, Decimal]]
+
+
+def get_enum_value(value) -> str:
+    """Get string value from enum or return string as-is."""
+    return value.value if hasattr(value, 'value') else value
+
+
+class DealStatsRepository(BaseRepository[DealStats]):
+    """Repository for DealStats rollup."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(DealStats, session)
+
+    async def get_by_organization(self, organization_id: int) -> list[DealStats]:
+        """Get all rollup rows for organization."""
+        query = select(DealStats).where(DealStats.organization_id == organization_id)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def apply_deltas(self, organization_id: int, deltas: StatsDeltas) -> None:
+        """
+        Add count/amount deltas to rollup rows in one upsert.
+
+        Rows are upserted in key order, so concurrent moves between the
+        same buckets lock them in the same order instead of deadlocking.
+        """
+        rows = sorted(
+            (
+                {
+                    "organization_id": organization_id,
+                    "stage": get_enum_value(stage),
+                    "status": get_enum_value(status),
+                    "count": count,
+                    "total_amount": amount,
+                }
+                for (stage, status), (count, amount) in deltas.items()
+                if count or amount
+            ),
+            key=lambda row: (row["stage"], row["status"]),
+        )
+        if not rows:
+            return
+
+        statement = pg_insert(DealStats).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                DealStats.organization_id,
+                DealStats.stage,
+                DealStats.status,
+            ],
+            set_={
+                "count": DealStats.count + statement.excluded.count,
+                "total_amount": DealStats.total_amount
+                + statement.excluded.total_amount,
+            },
+        )
+        await self.session.execute(statement)
+
+    async def add_deal(self, deal: Deal) -> None:
+        """Account for a new deal."""
+        await self.apply_deltas(
+            deal.organization_id,
+            {(deal.stage, deal.status): (1, deal.amount)},
+        )
+
+    async def remove_deal(self, deal: Deal) -> None:
+        """Account for a deleted deal."""
+        await self.apply_deltas(
+            deal.organization_id,
+            {(deal.stage, deal.status): (-1, -deal.amount)},
+        )
+
+    async def move_deal(
+        self,
+        organization_id: int,
+        old: tuple[str, str, Decimal],
+        new: tuple[str, str, Decimal],
+    ) -> None:
+        """Move a deal between (stage, status) buckets and/or change its amount."""
+        old_key = (get_enum_value(old[0]), get_enum_value(old[1]))
+        new_key = (get_enum_value(new[0]), get_enum_value(new[1]))
+        if old_key == new_key:
+            deltas: StatsDeltas = {old_key: (0, new[2] - old[2])}
+        else:
+            deltas = {old_key: (-1, -old[2]), new_key: (1, new[2])}
+        await self.apply_deltas(organization_id, deltas)
+
+    async def rebuild(self, organization_id: int | None = None) -> None:
+        """Recompute rollup from deals (all organizations if not given)."""
+        remove = delete(DealStats)
+        source = select(
+            Deal.organization_id,
+            Deal.stage,
+            Deal.status,
+            func.count(),
+            func.coalesce(func.sum(Deal.amount), 0),
+        ).group_by(Deal.organization_id, Deal.stage, Deal.status)
+
+        if organization_id is not None:
+            remove = remove.where(DealStats.organization_id == organization_id)
+            source = source.where(Deal.organization_id == organization_id)
+
+        # Block concurrent delta upserts until the rebuild commits
+        await self.session.execute(
+            text("LOCK TABLE deal_stats IN SHARE ROW EXCLUSIVE MODE")
+        )
+        await self.session.execute(remove)
+        await self.session.execute(
+            insert(DealStats).from_select(
+                ["organization_id", "stage", "status", "count", "total_amount"],
+                source,
+            )
+        )
@@ -69,6 +69,15 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
         membership = await self.get_membership(organization_id, user_id)
         return membership.role if membership else None
 
+    async def get_user_roles(self, user_id: int) -> dict[int, OrganizationRole]:
+        """Get the user's role in each of their organizations."""
+        query = select(
+            OrganizationMember.organization_id,
+            OrganizationMember.role,
+        ).where(OrganizationMember.user_id == user_id)
+        result = await self.session.execute(query)
+        return {row.organization_id: row.role for row in result}
+
     async def add_member(
         self,
         organization_id: int,
@@ -15,6 +15,27 @@ class TaskRepository(BaseRepository[Task]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(Task, session)
 
+    async def get_with_owner_in_organization(
+        self,
+        task_id: int,
+        organization_id: int,
+    ) -> tuple[Task, int] | None:
+        """
+        Get a task with its deal's owner id, if the deal is in the organization.
+
+        Tenant check and owner lookup share the task query (one round trip).
+        """
+        from app.models.deal import Deal
+
+        query = (
+            select(Task, Deal.owner_id)
+            .join(Deal, Task.deal_id == Deal.id)
+            .where(Task.id == task_id, Deal.organization_id == organization_id)
+        )
+        result = await self.session.execute(query)
+        row = result.first()
+        return (row[0], row[1]) if row else None
+
     async def get_by_deal(
         self,
         deal_id: int,
@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
@@ -20,4 +20,18 @@ class UserRepository(BaseRepository[User]):
     async def email_exists(self, email: str) -> bool:
         """Check if email is already registered."""
         user = await self.get_by_email(email)
-        return user is not None
\ No newline at end of file
+        return user is not None
+
+    async def get_membership_version(self, user_id: int) -> int | None:
+        """Get the user's membership version (None if the user doesn't exist)."""
+        query = select(User.membership_version).where(User.id == user_id)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def bump_membership_version(self, user_id: int) -> None:
+        """Mark tokens with the user's current membership claims as stale."""
+        await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(membership_version=User.membership_version + 1)
+        )
@@ -0,0 +1,96 @@
+"""Background mover of outbox activities (``ACTIVITY_SINK_MODE=outbox``)."""
+
+import asyncio
+import contextlib
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.repositories.activity_outbox import ActivityOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityOutboxWorker:
+    """
+    Moves outbox rows to ``activities`` every ``interval`` seconds.
+
+    Each batch of up to ``batch_size`` rows is moved in its own
+    transaction; a full batch is followed by the next one right away.
+    Several workers (e.g. one per process) can drain concurrently.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        batch_size: int,
+        interval: float,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+        # Counters
+        self.moved = 0
+        self.batches = 0
+        self.errors = 0
+
+    async def drain_once(self) -> int:
+        """Move one batch; returns the number of rows taken."""
+        async with self.session_factory() as session:
+            drained = await ActivityOutboxRepository(session).drain(self.batch_size)
+            await session.commit()
+        if drained:
+            self.moved += drained
+            self.batches += 1
+        return drained
+
+    async def drain(self) -> int:
+        """Move batches until the outbox is empty."""
+        total = 0
+        while (drained := await self.drain_once()) > 0:
+            total += drained
+            if drained < self.batch_size:
+                break
+        return total
+
+    async def run(self) -> None:
+        """Drain every ``interval`` seconds until cancelled."""
+        while True:
+            try:
+                await self.drain()
+            except Exception:
+                self.errors += 1
+                logger.warning("Activity outbox drain failed", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background drain task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        """Stop the background task and move what is left."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        await self.drain()
+
+    def stats(self) -> dict[str, float]:
+        """Rows and batches moved since startup."""
+        return {"moved": self.moved, "batches": self.batches, "errors": self.errors}
+
+
+# Global outbox worker, started by the application in outbox mode
+activity_outbox_worker = ActivityOutboxWorker(
+    async_session_factory,
+    batch_size=settings.ACTIVITY_SINK_BATCH_SIZE,
+    interval=settings.ACTIVITY_SINK_FLUSH_INTERVAL,
+)
@@ -1,14 +1,29 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta, UTC
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import select, func, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.cache import analytics_cache
-from app.models.deal import Deal
+from app.core.cache import CACHE_BACKEND_ERRORS, CacheBackend, analytics_cache
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
 from app.models.enums import DealStage, DealStatus
 from app.repositories.deal import DealRepository
+from app.repositories.deal_stats import DealStatsRepository
+
+logger = logging.getLogger(__name__)
+
+# Coalesces concurrent cache misses for the same key within the process
+_flights = SingleFlight()
+# Strong references to background refreshes (the loop only keeps weak ones)
+_refresh_tasks: set[asyncio.Task[Any]] = set()
+
+LOCK_POLL_INTERVAL = 0.05
 
 
 def get_enum_value(value: Any) -> str:
@@ -29,18 +44,67 @@ def _serialize_decimals(data: dict) -> dict:
     return result
 
 
+def _is_entry(value: Any) -> bool:
+    """Check if a cached value is an entry written by AnalyticsService."""
+    return isinstance(value, dict) and "value" in value and "fresh_until" in value
+
+
+def _refresh_done(task: asyncio.Task[Any]) -> None:
+    _refresh_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(
+            "Analytics cache refresh failed", exc_info=task.exception()
+        )
+
+
 class AnalyticsService:
-    """Service for analytics with in-memory caching."""
+    """
+    Service for analytics with pluggable caching.
 
-    CACHE_TTL = 60  # Cache for 60 seconds
+    With ``use_rollup`` aggregates are read from the ``deal_stats``
+    rollup instead of grouping over all of the organization's deals.
+
+    Cache misses are computed once: concurrent requests in the process
+    share one computation, and with a shared backend other workers wait
+    for the holder of a short-lived lock to fill the cache. With
+    ``stale_ttl`` expired entries keep being served for that long while
+    a single background refresh runs.
+
+    Shared computations run on a session of their own, never on the
+    session of the request that started them: that request may be
+    cancelled while others wait for the result.
+
+    If the cache backend fails (e.g. Redis is down), values are computed
+    without it instead of failing the request.
+    """
+
+    CACHE_TTL = settings.ANALYTICS_CACHE_TTL
+    STALE_TTL = settings.ANALYTICS_CACHE_STALE_TTL
+    LOCK_TIMEOUT = settings.ANALYTICS_LOCK_TIMEOUT
 
     def __init__(
             self,
             deal_repo: DealRepository,
+            stats_repo: DealStatsRepository,
             session: AsyncSession,
+            cache: CacheBackend | None = None,
+            use_rollup: bool = settings.ANALYTICS_USE_ROLLUP,
+            stale_ttl: int | None = None,
+            session_factory: async_sessionmaker[AsyncSession] | None = None,
     ) -> None:
         self.deal_repo = deal_repo
+        self.stats_repo = stats_repo
         self.session = session
+        self.cache = cache or analytics_cache
+        self.use_rollup = use_rollup
+        self.stale_ttl = self.STALE_TTL if stale_ttl is None else stale_ttl
+        # Sessions for shared computations, on the request session's engine
+        self.session_factory = session_factory or async_sessionmaker(
+            bind=session.bind,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
 
     async def get_deals_summary(
             self,
@@ -56,58 +120,27 @@ class AnalyticsService:
             - average won amount
             - new deals in last N days
         """
-        # Check cache first
-        cache_key = f"summary:{organization_id}:{days}"
-        cached = analytics_cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        # Get summary by status
-        status_summary = await self.deal_repo.get_summary_by_status(organization_id)
-
-        # Build response
-        by_status = {
-            status.value: {"count": 0, "total_amount": Decimal("0")}
-            for status in DealStatus
-        }
-
-        for item in status_summary:
-            status_value = get_enum_value(item["status"])
-            by_status[status_value] = {
-                "count": item["count"],
-                "total_amount": item["total_amount"],
-            }
-
-        # Get average won amount
-        avg_won = await self.deal_repo.get_avg_won_amount(organization_id)
+        return await self._get_cached(
+            f"summary:{organization_id}:{days}",
+            lambda service: service._compute_summary(organization_id, days),
+        )
 
-        # Get new deals count in last N days
+    async def _compute_summary(self, organization_id: int, days: int) -> dict:
         cutoff_date = datetime.now(UTC) - timedelta(days=days)
-        query = (
-            select(func.count())
-            .select_from(Deal)
-            .where(
-                and_(
-                    Deal.organization_id == organization_id,
-                    Deal.created_at >= cutoff_date,
-                )
-            )
-        )
-        result = await self.session.execute(query)
-        new_deals_count = result.scalar() or 0
+        if self.use_rollup:
+            summary = await self._get_summary_from_rollup(organization_id, cutoff_date)
+        else:
+            summary = await self.deal_repo.get_summary(organization_id, cutoff_date)
 
         response = {
-            "by_status": by_status,
-            "average_won_amount": avg_won,
+            "by_status": summary["by_status"],
+            "average_won_amount": summary["average_won_amount"],
             "new_deals_last_n_days": {
-                "count": new_deals_count,
+                "count": summary["new_deals_count"],
                 "days": days,
             },
         }
 
-        # Cache the result (serialize decimals for JSON compatibility)
-        analytics_cache.set(cache_key, _serialize_decimals(response), self.CACHE_TTL)
-
         return response
 
     async def get_deals_funnel(self, organization_id: int) -> dict:
@@ -118,13 +151,20 @@ class AnalyticsService:
             - count by stage and status
             - conversion rates between stages
         """
-        # Check cache first
-        cache_key = f"funnel:{organization_id}"
-        cached = analytics_cache.get(cache_key)
-        if cached is not None:
-            return cached
+        return await self._get_cached(
+            f"funnel:{organization_id}",
+            lambda service: service._compute_funnel(organization_id),
+        )
 
-        funnel_data = await self.deal_repo.get_funnel_data(organization_id)
+    async def _compute_funnel(self, organization_id: int) -> dict:
+        if self.use_rollup:
+            funnel_data = [
+                {"stage": row.stage, "status": row.status, "count": row.count}
+                for row in await self.stats_repo.get_by_organization(organization_id)
+                if row.count > 0
+            ]
+        else:
+            funnel_data = await self.deal_repo.get_funnel_data(organization_id)
 
         # Build stages breakdown
         stages: dict[str, dict[str, int]] = {}
@@ -171,13 +211,147 @@ class AnalyticsService:
             "conversions": conversions,
         }
 
-        # Cache the result
-        analytics_cache.set(cache_key, response, self.CACHE_TTL)
-
         return response
 
+    async def _get_cached(
+            self,
+            key: str,
+            compute: Callable[["AnalyticsService"], Awaitable[dict]],
+    ) -> dict:
+        """
+        Read key from cache, computing it at most once on a miss.
+
+        ``compute`` receives the service to run on, so a background
+        refresh can execute it against its own session.
+        """
+        entry = await self._cache_get(key)
+        if _is_entry(entry):
+            if entry["fresh_until"] > time.time():
+                return entry["value"]
+            if self.stale_ttl > 0:
+                self._schedule_refresh(key, compute)
+                return entry["value"]
+
+        return await _flights.do(key, lambda: self._fill_detached(key, compute))
+
+    async def _fill(
+            self,
+            key: str,
+            compute: Callable[["AnalyticsService"], Awaitable[dict]],
+            service: "AnalyticsService",
+    ) -> dict:
+        """Compute and cache key, or wait for the worker holding its lock."""
+        try:
+            token = await self.cache.acquire_lock(key, self.LOCK_TIMEOUT)
+        except CACHE_BACKEND_ERRORS:
+            logger.warning("Analytics cache unavailable, computing %s", key, exc_info=True)
+            return await compute(service)
+
+        if token is None:
+            value = await self._wait_for_fill(key)
+            if value is not None:
+                return value
+        try:
+            response = await compute(service)
+            # Serialize decimals for JSON compatibility
+            entry = {
+                "value": _serialize_decimals(response),
+                "fresh_until": time.time() + self.CACHE_TTL,
+            }
+            try:
+                await self.cache.set(key, entry, self.CACHE_TTL + self.stale_ttl)
+            except CACHE_BACKEND_ERRORS:
+                logger.warning("Analytics cache unavailable, not caching %s", key, exc_info=True)
+            return response
+        finally:
+            if token is not None:
+                with contextlib.suppress(*CACHE_BACKEND_ERRORS):
+                    await self.cache.release_lock(key, token)
+
+    async def _cache_get(self, key: str) -> Any | None:
+        """Cached value of key; None on a miss or if the backend fails."""
+        try:
+            return await self.cache.get(key)
+        except CACHE_BACKEND_ERRORS:
+            logger.warning("Analytics cache unavailable, reading %s", key, exc_info=True)
+            return None
+
+    async def _wait_for_fill(self, key: str) -> dict | None:
+        """Poll the cache until another worker stores a fresh value."""
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            entry = await self._cache_get(key)
+            if _is_entry(entry) and entry["fresh_until"] > time.time():
+                return entry["value"]
+        return None
+
+    def _schedule_refresh(
+            self,
+            key: str,
+            compute: Callable[["AnalyticsService"], Awaitable[dict]],
+    ) -> None:
+        """Refresh a stale key in the background unless already refreshing."""
+        if _flights.in_flight(key):
+            return
+        task = asyncio.create_task(
+            _flights.do(key, lambda: self._fill_detached(key, compute))
+        )
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_done)
+
+    async def _fill_detached(
+            self,
+            key: str,
+            compute: Callable[["AnalyticsService"], Awaitable[dict]],
+    ) -> dict:
+        """Fill key on a session independent of any request."""
+        async with self.session_factory() as session:
+            service = AnalyticsService(
+                deal_repo=DealRepository(session),
+                stats_repo=DealStatsRepository(session),
+                session=session,
+                cache=self.cache,
+                use_rollup=self.use_rollup,
+                stale_ttl=self.stale_ttl,
+                session_factory=self.session_factory,
+            )
+            return await self._fill(key, compute, service)
+
+    async def _get_summary_from_rollup(
+            self,
+            organization_id: int,
+            created_since: datetime,
+    ) -> dict:
+        """Build summary (same shape as DealRepository.get_summary) from rollup."""
+        by_status = {
+            status.value: {"count": 0, "total_amount": Decimal("0")}
+            for status in DealStatus
+        }
+        for row in await self.stats_repo.get_by_organization(organization_id):
+            bucket = by_status[get_enum_value(row.status)]
+            bucket["count"] += row.count
+            bucket["total_amount"] += row.total_amount
+
+        won = by_status[DealStatus.WON.value]
+        average_won = Decimal("0")
+        if won["count"]:
+            average_won = won["total_amount"] / won["count"]
+
+        return {
+            "by_status": by_status,
+            "average_won_amount": average_won,
+            "new_deals_count": await self.deal_repo.count_created_since(
+                organization_id, created_since
+            ),
+        }
+
     @staticmethod
-    def invalidate_cache(organization_id: int) -> None:
-        """Invalidate analytics cache for organization."""
-        analytics_cache.invalidate_prefix(f"summary:{organization_id}")
-        analytics_cache.invalidate_prefix(f"funnel:{organization_id}")
\ No newline at end of file
+    async def invalidate_cache(
+            organization_id: int,
+            cache: CacheBackend | None = None,
+    ) -> None:
+        """Invalidate analytics cache for organization (on every worker)."""
+        cache = cache or analytics_cache
+        await cache.invalidate_prefix(f"summary:{organization_id}:")
+        await cache.delete(f"funnel:{organization_id}")
\ No newline at end of file
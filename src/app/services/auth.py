@@ -1,12 +1,16 @@
+from typing import Any
+
+from app.core.config import settings
 from app.core.exceptions import (
     EmailAlreadyExistsException,
     InvalidCredentialsException,
+    InvalidTokenException,
 )
+from app.core.password_hasher import password_hasher
+from app.core.revocation import token_revocations
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    hash_password,
-    verify_password,
     verify_refresh_token,
 )
 from app.models.enums import OrganizationRole
@@ -36,6 +40,10 @@ class AuthService:
         organization_name: str,
     ) -> tuple[User, Organization, dict[str, str]]:
         
+        # Hash before touching the database, so no connection is held
+        # while bcrypt runs
+        hashed_password = await password_hasher.hash(password)
+
         # Check if email exists
         if await self.user_repo.email_exists(email):
             raise EmailAlreadyExistsException()
@@ -43,7 +51,7 @@ class AuthService:
         # Create user
         user = await self.user_repo.create(
             email=email,
-            hashed_password=hash_password(password),
+            hashed_password=hashed_password,
             name=name,
         )
 
@@ -58,7 +66,7 @@ class AuthService:
         )
 
         # Generate tokens
-        tokens = self._generate_tokens(user.id)
+        tokens = await self._generate_tokens(user.id)
 
         return user, organization, tokens
 
@@ -69,11 +77,13 @@ class AuthService:
     ) -> tuple[User, dict[str, str]]:
        
         user = await self.user_repo.get_by_email(email)
+        # Don't hold the connection while bcrypt runs
+        await self.user_repo.release_connection()
 
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await password_hasher.verify(password, user.hashed_password):
             raise InvalidCredentialsException()
 
-        tokens = self._generate_tokens(user.id)
+        tokens = await self._generate_tokens(user.id)
 
         return user, tokens
 
@@ -81,11 +91,44 @@ class AuthService:
         payload = verify_refresh_token(refresh_token)
         user_id = int(payload["sub"])
 
-        return self._generate_tokens(user_id)
+        return await self._generate_tokens(user_id)
+
+    async def logout(
+        self,
+        access_payload: dict[str, Any],
+        refresh_token: str | None = None,
+    ) -> None:
+        """Revoke the access token and, if given, the user's refresh token."""
+        payloads = [access_payload]
+        if refresh_token:
+            refresh_payload = verify_refresh_token(refresh_token)
+            if refresh_payload["sub"] != access_payload["sub"]:
+                raise InvalidTokenException(message="Refresh token of another user")
+            payloads.append(refresh_payload)
+
+        # Tokens issued before revocation support have no jti
+        for payload in payloads:
+            if "jti" in payload:
+                await token_revocations.revoke_token(payload["jti"], payload["exp"])
+
+    async def _generate_tokens(self, user_id: int) -> dict[str, str]:
+        claims = None
+        if settings.TOKEN_MEMBERSHIP_CLAIMS:
+            claims = await self._membership_claims(user_id)
 
-    def _generate_tokens(self, user_id: int) -> dict[str, str]:
         return {
-            "access_token": create_access_token(user_id),
+            "access_token": create_access_token(user_id, extra_claims=claims),
             "refresh_token": create_refresh_token(user_id),
             "token_type": "bearer",
-        }
\ No newline at end of file
+        }
+
+    async def _membership_claims(self, user_id: int) -> dict[str, Any]:
+        """Roles by organization id, and the membership version they're at."""
+        # Version first: a change committed in between leaves newer roles
+        # under an older version, which just falls back to the database
+        version = await self.user_repo.get_membership_version(user_id)
+        roles = await self.member_repo.get_user_roles(user_id)
+        return {
+            "orgs": {str(org_id): role for org_id, role in roles.items()},
+            "mv": version,
+        }
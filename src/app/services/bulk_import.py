@@ -0,0 +1,76 @@
+"""Helpers shared by bulk imports."""
+
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.core.imports import ImportRow
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+
+@dataclass
+class ImportResult:
+    """
+    Outcome of a bulk import.
+
+    Only the first ``max_errors`` row errors are kept; ``failed`` counts
+    all rejected rows.
+    """
+
+    created: int = 0
+    failed: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    max_errors: int = settings.IMPORT_MAX_ERRORS
+
+    def reject(self, row: int, message: str, field_name: str | None = None) -> None:
+        """Record a rejected row."""
+        self.failed += 1
+        self._add_error(row, message, field_name)
+
+    def reject_invalid(self, row: int, exc: ValidationError) -> None:
+        """Record a row that failed schema validation (one error per field)."""
+        self.failed += 1
+        for error in exc.errors():
+            field_name = ".".join(str(part) for part in error["loc"]) or None
+            self._add_error(row, error["msg"], field_name)
+
+    def _add_error(self, row: int, message: str, field_name: str | None) -> None:
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "field": field_name, "message": message})
+
+
+async def chunked(
+    rows: AsyncIterable[ImportRow],
+    size: int,
+) -> AsyncIterator[list[ImportRow]]:
+    """Group rows into lists of up to size rows."""
+    chunk: list[ImportRow] = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_rows(
+    rows: list[ImportRow],
+    schema: type[SchemaType],
+    result: ImportResult,
+) -> list[tuple[int, SchemaType]]:
+    """Validate rows against schema, rejecting unparsable and invalid ones."""
+    valid = []
+    for row in rows:
+        if row.data is None:
+            result.reject(row.number, row.error or "Invalid row")
+            continue
+        try:
+            valid.append((row.number, schema.model_validate(row.data)))
+        except ValidationError as exc:
+            result.reject_invalid(row.number, exc)
+    return valid
@@ -1,11 +1,24 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import TYPE_CHECKING
+
+from sqlalchemy import RowMapping
+
+from app.core.config import settings
 from app.core.exceptions import (
     ContactHasDealsException,
     ContactNotFoundException,
     ForbiddenException,
 )
+from app.core.imports import ImportRow
+from app.core.pagination import CountMode
 from app.models.contact import Contact
 from app.models.organization_member import OrganizationMember
 from app.repositories.contact import ContactRepository
+from app.services.bulk_import import ImportResult, chunked, validate_rows
+
+if TYPE_CHECKING:
+    # Not imported at runtime: app.api.v1 imports the services
+    from app.api.v1.schemas.contact import ContactCreate
 
 
 class ContactService:
@@ -23,7 +36,8 @@ class ContactService:
         page_size: int = 20,
         search: str | None = None,
         owner_id: int | None = None,
-    ) -> tuple[list[Contact], int]:
+        count_mode: CountMode = "exact",
+    ) -> tuple[list[Contact], int, bool]:
         
         # Members can only filter by owner if it's themselves
         if not membership.can_manage_all_entities() and owner_id:
@@ -32,22 +46,35 @@ class ContactService:
 
         skip = (page - 1) * page_size
 
-        contacts = await self.contact_repo.get_by_organization(
+        return await self.contact_repo.get_page_by_organization(
             organization_id,
             skip=skip,
             limit=page_size,
             search=search,
             owner_id=owner_id,
+            count_mode=count_mode,
         )
 
-        total = await self.contact_repo.count_by_organization(
+    def export_contacts(
+        self,
+        organization_id: int,
+        membership: OrganizationMember,
+        *,
+        search: str | None = None,
+        owner_id: int | None = None,
+    ) -> AsyncIterator[RowMapping]:
+        """Stream all contacts matching the ``get_contacts`` filters."""
+        if not membership.can_manage_all_entities() and owner_id:
+            if owner_id != membership.user_id:
+                owner_id = membership.user_id
+
+        return self.contact_repo.stream_by_organization(
             organization_id,
             search=search,
             owner_id=owner_id,
+            batch_size=settings.EXPORT_BATCH_SIZE,
         )
 
-        return contacts, total
-
     async def get_contact(
         self,
         contact_id: int,
@@ -78,6 +105,35 @@ class ContactService:
             phone=phone,
         )
 
+    async def import_contacts(
+        self,
+        organization_id: int,
+        owner_id: int,
+        rows: AsyncIterable[ImportRow],
+        schema: type["ContactCreate"],
+        chunk_size: int | None = None,
+    ) -> ImportResult:
+        """
+        Create contacts from a stream of rows, one INSERT per chunk.
+
+        Rows failing ``schema`` validation are reported and skipped.
+        """
+        result = ImportResult()
+        chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        async for chunk in chunked(rows, chunk_size):
+            values = [
+                {
+                    "organization_id": organization_id,
+                    "owner_id": owner_id,
+                    "name": record.name,
+                    "email": record.email,
+                    "phone": record.phone,
+                }
+                for _, record in validate_rows(chunk, schema, result)
+            ]
+            result.created += len(await self.contact_repo.create_many(values))
+        return result
+
     async def update_contact(
         self,
         contact_id: int,
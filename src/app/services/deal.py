@@ -1,19 +1,38 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import RowMapping
+
+from app.core.config import settings
 
 from app.core.exceptions import (
+    AppException,
     ContactNotFoundException,
     CrossOrganizationException,
     DealNotFoundException,
     ForbiddenException,
     InvalidDealAmountException,
     InvalidStageTransitionException,
+    TooManyDealsException,
 )
+from app.core.imports import ImportRow
+from app.core.pagination import CountMode, Cursor
 from app.models.deal import Deal
 from app.models.enums import DealStage, DealStatus
 from app.models.organization_member import OrganizationMember
 from app.repositories.activity import ActivityRepository
 from app.repositories.contact import ContactRepository
 from app.repositories.deal import DealRepository
+from app.repositories.deal_stats import DealStatsRepository, StatsDeltas
+from app.repositories.organization import OrganizationMemberRepository
+from app.services.analytics import AnalyticsService
+from app.services.bulk_import import ImportResult, chunked, validate_rows
+
+if TYPE_CHECKING:
+    # Not imported at runtime: app.api.v1 imports the services
+    from app.api.v1.schemas.deal import DealCreate
 
 
 def get_enum_value(value) -> str:
@@ -21,6 +40,40 @@ def get_enum_value(value) -> str:
     return value.value if hasattr(value, 'value') else value
 
 
+def _add_delta(
+    deltas: StatsDeltas,
+    stage: DealStage,
+    status: DealStatus,
+    count: int,
+    amount: Decimal,
+) -> None:
+    key = (get_enum_value(stage), get_enum_value(status))
+    old_count, old_amount = deltas.get(key, (0, Decimal("0")))
+    deltas[key] = (old_count + count, old_amount + amount)
+
+
+@dataclass
+class BulkUpdateResult:
+    """
+    Outcome of a bulk deal update.
+
+    ``unchanged`` counts deals already in the requested state; deals that
+    failed a check are listed in ``errors`` and left as they were.
+    """
+
+    updated: int = 0
+    unchanged: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def reject(self, deal_id: int, exc: AppException) -> None:
+        """Record a deal that can't be changed."""
+        self.errors.append({"id": deal_id, "code": exc.error_code, "message": exc.message})
+
+
 class DealService:
 
     def __init__(
@@ -28,10 +81,14 @@ class DealService:
         deal_repo: DealRepository,
         contact_repo: ContactRepository,
         activity_repo: ActivityRepository,
+        stats_repo: DealStatsRepository,
+        member_repo: OrganizationMemberRepository,
     ) -> None:
         self.deal_repo = deal_repo
         self.contact_repo = contact_repo
         self.activity_repo = activity_repo
+        self.stats_repo = stats_repo
+        self.member_repo = member_repo
 
     async def get_deals(
         self,
@@ -47,7 +104,9 @@ class DealService:
         max_amount: Decimal | None = None,
         order_by: str = "created_at",
         order: str = "desc",
-    ) -> tuple[list[Deal], int]:
+        cursor: str | None = None,
+        count_mode: CountMode = "exact",
+    ) -> tuple[list[Deal], int, bool, str | None]:
 
         # Members can only see their own deals' owner filter
         if not membership.can_manage_all_entities() and owner_id:
@@ -55,8 +114,9 @@ class DealService:
                 owner_id = membership.user_id
 
         skip = (page - 1) * page_size
+        after = Cursor.decode(cursor) if cursor else None
 
-        deals = await self.deal_repo.get_by_organization(
+        deals, total, total_exact = await self.deal_repo.get_page_by_organization(
             organization_id,
             skip=skip,
             limit=page_size,
@@ -67,19 +127,58 @@ class DealService:
             max_amount=max_amount,
             order_by=order_by,
             order=order,
+            cursor=after,
+            count_mode=count_mode,
         )
 
-        total = await self.deal_repo.count_by_organization(organization_id, status)
+        next_cursor = None
+        if len(deals) == page_size:
+            next_cursor = DealRepository.make_cursor(deals[-1], order_by, order).encode()
 
-        return deals, total
+        return deals, total, total_exact, next_cursor
+
+    def export_deals(
+        self,
+        organization_id: int,
+        membership: OrganizationMember,
+        *,
+        status: list[DealStatus] | None = None,
+        stage: DealStage | None = None,
+        owner_id: int | None = None,
+        min_amount: Decimal | None = None,
+        max_amount: Decimal | None = None,
+        order_by: str = "created_at",
+        order: str = "desc",
+    ) -> AsyncIterator[RowMapping]:
+        """Stream all deals matching the ``get_deals`` filters."""
+        if not membership.can_manage_all_entities() and owner_id:
+            if owner_id != membership.user_id:
+                owner_id = membership.user_id
+
+        return self.deal_repo.stream_by_organization(
+            organization_id,
+            status=status,
+            stage=stage,
+            owner_id=owner_id,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            order_by=order_by,
+            order=order,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        )
 
     async def get_deal(
         self,
         deal_id: int,
         organization_id: int,
+        *,
+        for_update: bool = False,
     ) -> Deal:
 
-        deal = await self.deal_repo.get_by_id(deal_id)
+        if for_update:
+            deal = await self.deal_repo.get_for_update(deal_id, organization_id)
+        else:
+            deal = await self.deal_repo.get_by_id(deal_id)
 
         if not deal or deal.organization_id != organization_id:
             raise DealNotFoundException()
@@ -101,7 +200,7 @@ class DealService:
         if not contact or contact.organization_id != organization_id:
             raise ContactNotFoundException()
 
-        return await self.deal_repo.create(
+        deal = await self.deal_repo.create(
             organization_id=organization_id,
             owner_id=owner_id,
             contact_id=contact_id,
@@ -111,6 +210,68 @@ class DealService:
             status=DealStatus.NEW,
             stage=DealStage.QUALIFICATION,
         )
+        await self.stats_repo.add_deal(deal)
+        self._analytics_changed(organization_id)
+
+        return deal
+
+    async def import_deals(
+        self,
+        organization_id: int,
+        owner_id: int,
+        rows: AsyncIterable[ImportRow],
+        schema: type["DealCreate"],
+        chunk_size: int | None = None,
+    ) -> ImportResult:
+        """
+        Create deals from a stream of rows, one INSERT per chunk.
+
+        Rows failing ``schema`` validation or referencing a contact
+        outside the organization are reported and skipped. Contacts are
+        checked with one query per chunk.
+        """
+        result = ImportResult()
+        chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        async for chunk in chunked(rows, chunk_size):
+            records = validate_rows(chunk, schema, result)
+            owned = await self.contact_repo.get_ids_in_organization(
+                organization_id,
+                {record.contact_id for _, record in records},
+            )
+
+            values = []
+            for number, record in records:
+                if record.contact_id not in owned:
+                    result.reject(number, "Contact not found", "contact_id")
+                    continue
+                values.append({
+                    "organization_id": organization_id,
+                    "owner_id": owner_id,
+                    "contact_id": record.contact_id,
+                    "title": record.title,
+                    "amount": record.amount,
+                    "currency": record.currency,
+                    "status": DealStatus.NEW,
+                    "stage": DealStage.QUALIFICATION,
+                })
+            if not values:
+                continue
+
+            await self.deal_repo.create_many(values)
+            await self.stats_repo.apply_deltas(
+                organization_id,
+                {
+                    (DealStage.QUALIFICATION, DealStatus.NEW): (
+                        len(values),
+                        sum((value["amount"] for value in values), Decimal("0")),
+                    )
+                },
+            )
+            result.created += len(values)
+
+        if result.created:
+            self._analytics_changed(organization_id)
+        return result
 
     async def update_deal(
         self,
@@ -120,7 +281,8 @@ class DealService:
         **kwargs,
     ) -> Deal:
 
-        deal = await self.get_deal(deal_id, organization_id)
+        # Locked: the rollup deltas below are computed from the old values
+        deal = await self.get_deal(deal_id, organization_id, for_update=True)
 
         # Check permissions
         if not membership.can_manage_all_entities():
@@ -134,6 +296,7 @@ class DealService:
             # Create activity
             await self.activity_repo.create_status_changed(
                 deal_id=deal.id,
+                organization_id=deal.organization_id,
                 author_id=membership.user_id,
                 old_status=get_enum_value(deal.status),
                 new_status=get_enum_value(new_status),
@@ -146,6 +309,7 @@ class DealService:
             # Create activity
             await self.activity_repo.create_stage_changed(
                 deal_id=deal.id,
+                organization_id=deal.organization_id,
                 author_id=membership.user_id,
                 old_stage=get_enum_value(deal.stage),
                 new_stage=get_enum_value(new_stage),
@@ -158,7 +322,137 @@ class DealService:
             if not contact or contact.organization_id != organization_id:
                 raise CrossOrganizationException()
 
-        return await self.deal_repo.update(deal, **kwargs)
+        old_bucket = (deal.stage, deal.status, deal.amount)
+        deal = await self.deal_repo.update(deal, **kwargs)
+        await self.stats_repo.move_deal(
+            organization_id,
+            old_bucket,
+            (deal.stage, deal.status, deal.amount),
+        )
+        self._analytics_changed(organization_id)
+
+        return deal
+
+    async def bulk_update_deals(
+        self,
+        organization_id: int,
+        membership: OrganizationMember,
+        *,
+        ids: list[int] | None = None,
+        filters: dict[str, Any] | None = None,
+        status: DealStatus | None = None,
+        stage: DealStage | None = None,
+        owner_id: int | None = None,
+    ) -> BulkUpdateResult:
+        """
+        Apply one status / stage / owner change to many deals.
+
+        Deals are picked by ``ids`` and/or ``filters`` (``status``,
+        ``stage`` and ``owner_id`` as in ``get_deals``). Every deal goes
+        through the checks of ``update_deal`` in memory; deals failing
+        them are reported and skipped. The rest are written with one
+        UPDATE, their activities with one multi-row INSERT and the rollup
+        with one upsert.
+
+        Raises:
+            ForbiddenException: If a member tries to reassign deals
+            CrossOrganizationException: If the new owner isn't a member
+            TooManyDealsException: Over ``BULK_UPDATE_MAX_DEALS`` deals
+        """
+        max_deals = settings.BULK_UPDATE_MAX_DEALS
+        filters = dict(filters or {})
+        manages_all = membership.can_manage_all_entities()
+        if not manages_all:
+            if owner_id is not None:
+                raise ForbiddenException()
+            # A member's filter only ever matches their own deals
+            if ids is None:
+                filters["owner_id"] = membership.user_id
+
+        if owner_id is not None:
+            if not await self.member_repo.is_member(organization_id, owner_id):
+                raise CrossOrganizationException()
+
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))
+            if len(ids) > max_deals:
+                raise TooManyDealsException(details={"max_deals": max_deals})
+
+        deals = await self.deal_repo.get_for_bulk_update(
+            organization_id, ids=ids, **filters, limit=max_deals + 1
+        )
+        if len(deals) > max_deals:
+            raise TooManyDealsException(details={"max_deals": max_deals})
+
+        result = BulkUpdateResult()
+        if ids is not None:
+            found = {deal.id for deal in deals}
+            for deal_id in ids:
+                if deal_id not in found:
+                    result.reject(deal_id, DealNotFoundException())
+
+        changed: list[int] = []
+        activities: list[dict[str, Any]] = []
+        deltas: StatsDeltas = {}
+        for deal in deals:
+            status_changed = status is not None and status != deal.status
+            stage_changed = stage is not None and stage != deal.stage
+            owner_changed = owner_id is not None and owner_id != deal.owner_id
+            try:
+                if not manages_all and deal.owner_id != membership.user_id:
+                    raise ForbiddenException()
+                if status_changed:
+                    await self._validate_status_change(deal, status, None)
+                if stage_changed:
+                    self._validate_stage_change(deal.stage, stage, membership)
+            except AppException as exc:
+                result.reject(deal.id, exc)
+                continue
+            if not (status_changed or stage_changed or owner_changed):
+                result.unchanged += 1
+                continue
+
+            changed.append(deal.id)
+            if status_changed:
+                activities.append(self.activity_repo.status_changed_values(
+                    deal_id=deal.id,
+                    organization_id=deal.organization_id,
+                    author_id=membership.user_id,
+                    old_status=get_enum_value(deal.status),
+                    new_status=get_enum_value(status),
+                ))
+            if stage_changed:
+                activities.append(self.activity_repo.stage_changed_values(
+                    deal_id=deal.id,
+                    organization_id=deal.organization_id,
+                    author_id=membership.user_id,
+                    old_stage=get_enum_value(deal.stage),
+                    new_stage=get_enum_value(stage),
+                ))
+            if status_changed or stage_changed:
+                _add_delta(deltas, deal.stage, deal.status, -1, -deal.amount)
+                _add_delta(
+                    deltas,
+                    stage if stage_changed else deal.stage,
+                    status if status_changed else deal.status,
+                    1,
+                    deal.amount,
+                )
+
+        if not changed:
+            return result
+
+        values = {
+            name: value
+            for name, value in (("status", status), ("stage", stage), ("owner_id", owner_id))
+            if value is not None
+        }
+        result.updated = await self.deal_repo.update_many(changed, **values)
+        await self.activity_repo.log(activities)
+        await self.stats_repo.apply_deltas(organization_id, deltas)
+        self._analytics_changed(organization_id)
+
+        return result
 
     async def delete_deal(
         self,
@@ -167,13 +461,22 @@ class DealService:
         membership: OrganizationMember,
     ) -> None:
 
-        deal = await self.get_deal(deal_id, organization_id)
+        deal = await self.get_deal(deal_id, organization_id, for_update=True)
 
         if not membership.can_manage_all_entities():
             if deal.owner_id != membership.user_id:
                 raise ForbiddenException()
 
         await self.deal_repo.delete(deal)
+        await self.stats_repo.remove_deal(deal)
+        self._analytics_changed(organization_id)
+
+    def _analytics_changed(self, organization_id: int) -> None:
+        # Invalidated after commit: a cache miss in between would compute
+        # from the old rows and cache them for the whole TTL
+        self.deal_repo.after_commit(
+            lambda: AnalyticsService.invalidate_cache(organization_id)
+        )
 
     async def _validate_status_change(
         self,
@@ -4,6 +4,8 @@ from app.core.exceptions import (
     OrganizationNotFoundException,
     UserNotFoundException,
 )
+from app.core.principal_cache import principal_cache
+from app.core.revocation import token_revocations
 from app.models.enums import OrganizationRole
 from app.models.organization import Organization
 from app.models.organization_member import OrganizationMember
@@ -80,11 +82,13 @@ class OrganizationService:
             raise MemberAlreadyExistsException()
 
         # Add member
-        return await self.member_repo.add_member(
+        membership = await self.member_repo.add_member(
             organization_id=organization_id,
             user_id=user.id,
             role=role,
         )
+        await self._memberships_changed(user.id)
+        return membership
 
     async def update_member_role(
         self,
@@ -121,7 +125,9 @@ class OrganizationService:
         ):
             raise ForbiddenException()
 
-        return await self.member_repo.update(target_membership, role=new_role)
+        membership = await self.member_repo.update(target_membership, role=new_role)
+        await self._memberships_changed(target_user_id)
+        return membership
 
     async def remove_member(
         self,
@@ -152,4 +158,15 @@ class OrganizationService:
         if target_membership.role == OrganizationRole.OWNER:
             raise ForbiddenException(message="Cannot remove organization owner")
 
-        await self.member_repo.delete(target_membership)
\ No newline at end of file
+        await self.member_repo.delete(target_membership)
+        await self._memberships_changed(target_user_id)
+        # Issued tokens stop working; the user signs in again
+        await token_revocations.revoke_user(target_user_id)
+
+    async def _memberships_changed(self, user_id: int) -> None:
+        # Tokens with the old membership claims fall back to the database,
+        # and the cached user (with its version) and memberships are dropped.
+        # Dropped after commit: a request reading the old rows before then
+        # would cache them again
+        await self.user_repo.bump_membership_version(user_id)
+        self.user_repo.after_commit(lambda: principal_cache.invalidate_user(user_id))
@@ -54,17 +54,23 @@ class TaskService:
         task_id: int,
         organization_id: int,
     ) -> Task:
-        task = await self.task_repo.get_by_id(task_id)
+        task, _ = await self._get_task_with_owner(task_id, organization_id)
+        return task
 
-        if not task:
-            raise TaskNotFoundException()
+    async def _get_task_with_owner(
+        self,
+        task_id: int,
+        organization_id: int,
+    ) -> tuple[Task, int]:
+        # Task must belong to organization via deal; returns the deal owner
+        found = await self.task_repo.get_with_owner_in_organization(
+            task_id, organization_id
+        )
 
-        # Verify task belongs to organization via deal
-        deal = await self.deal_repo.get_by_id(task.deal_id)
-        if not deal or deal.organization_id != organization_id:
+        if not found:
             raise TaskNotFoundException()
 
-        return task
+        return found
 
     async def create_task(
         self,
@@ -76,13 +82,15 @@ class TaskService:
         due_date: date | None = None,
     ) -> Task:
         # Verify deal exists and belongs to organization
-        deal = await self.deal_repo.get_by_id(deal_id)
-        if not deal or deal.organization_id != organization_id:
+        deal_owner_id = await self.deal_repo.get_owner_id_in_organization(
+            deal_id, organization_id
+        )
+        if deal_owner_id is None:
             raise DealNotFoundException()
 
         # Members can only create tasks for their own deals
         if not membership.can_manage_all_entities():
-            if deal.owner_id != membership.user_id:
+            if deal_owner_id != membership.user_id:
                 raise ForbiddenException(
                     message="Cannot create task for another user's deal"
                 )
@@ -101,6 +109,7 @@ class TaskService:
         # Create activity
         await self.activity_repo.create_task_created(
             deal_id=deal_id,
+            organization_id=organization_id,
             author_id=membership.user_id,
             task_title=title,
         )
@@ -114,12 +123,11 @@ class TaskService:
         membership: OrganizationMember,
         **kwargs,
     ) -> Task:
-        task = await self.get_task(task_id, organization_id)
+        task, deal_owner_id = await self._get_task_with_owner(task_id, organization_id)
 
         # Check permissions via deal
-        deal = await self.deal_repo.get_by_id(task.deal_id)
         if not membership.can_manage_all_entities():
-            if deal.owner_id != membership.user_id:
+            if deal_owner_id != membership.user_id:
                 raise ForbiddenException()
 
         # Validate due_date if provided
@@ -135,6 +143,7 @@ class TaskService:
         if not was_done and updated_task.is_done:
             await self.activity_repo.create_task_completed(
                 deal_id=task.deal_id,
+                organization_id=organization_id,
                 author_id=membership.user_id,
                 task_title=task.title,
             )
@@ -147,12 +156,11 @@ class TaskService:
         organization_id: int,
         membership: OrganizationMember,
     ) -> None:
-        task = await self.get_task(task_id, organization_id)
+        task, deal_owner_id = await self._get_task_with_owner(task_id, organization_id)
 
         # Check permissions via deal
-        deal = await self.deal_repo.get_by_id(task.deal_id)
         if not membership.can_manage_all_entities():
-            if deal.owner_id != membership.user_id:
+            if deal_owner_id != membership.user_id:
                 raise ForbiddenException()
 
         await self.task_repo.delete(task)
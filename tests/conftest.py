@@ -12,12 +12,17 @@ from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
+from app.core.revocation import token_revocations
+from app.core.token_cache import token_cache
 from app.core.security import hash_password, create_access_token
 from app.db.base import Base
+from app.db.hooks import run_after_commit
 from app.db.session import get_session
 from app.main import app
 from app.models import Organization, OrganizationMember, User, Contact, Deal
 from app.models.enums import OrganizationRole, DealStatus, DealStage
+from tests.sql_recorder import SQLRecorder
 
 # Test database URL
 TEST_DATABASE_URL = settings.DATABASE_URL.replace("/mini_crm", "/mini_crm_test")
@@ -64,12 +69,17 @@ async def setup_database():
 async def cleanup_tables():
     """Clean up all tables before each test."""
     yield
+    await principal_cache.clear()
+    token_cache.clear()
+    await token_revocations.clear()
     # Cleanup after test
     async with TestSessionLocal() as session:
         # Delete in correct order due to foreign keys
         await session.execute(text("DELETE FROM activities"))
+        await session.execute(text("DELETE FROM activity_outbox"))
         await session.execute(text("DELETE FROM tasks"))
         await session.execute(text("DELETE FROM deals"))
+        await session.execute(text("DELETE FROM deal_stats"))
         await session.execute(text("DELETE FROM contacts"))
         await session.execute(text("DELETE FROM organization_members"))
         await session.execute(text("DELETE FROM organizations"))
@@ -93,21 +103,49 @@ async def get_test_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+        finally:
+            await run_after_commit(session)
+
+
+@pytest.fixture
+def sql_recorder() -> Generator[SQLRecorder, None, None]:
+    """Recorder of SQL statements, grouped by request."""
+    recorder = SQLRecorder(test_engine)
+    recorder.start()
+    yield recorder
+    recorder.stop()
 
 
 @pytest_asyncio.fixture
-async def client() -> AsyncGenerator[AsyncClient, None]:
-    """Create test HTTP client."""
+async def client(
+        request: pytest.FixtureRequest,
+        sql_recorder: SQLRecorder,
+) -> AsyncGenerator[AsyncClient, None]:
+    """
+    Create test HTTP client.
+
+    Requests are checked for repeated queries (unless marked
+    ``allow_repeated_queries``) and against ``max_queries(n)``.
+    """
     app.dependency_overrides[get_session] = get_test_session
 
     async with AsyncClient(
-            transport=ASGITransport(app=app),
+            transport=ASGITransport(app=sql_recorder.wrap(app)),
             base_url="http://test",
     ) as client:
         yield client
 
     app.dependency_overrides.clear()
 
+    max_queries = request.node.get_closest_marker("max_queries")
+    problems = sql_recorder.problems(
+        allow_repeated=request.node.get_closest_marker("allow_repeated_queries")
+        is not None,
+        limit=max_queries.args[0] if max_queries else None,
+    )
+    if problems:
+        pytest.fail("\n\n".join(problems), pytrace=False)
+
 
 @pytest_asyncio.fixture
 async def test_user(session: AsyncSession) -> User:
@@ -213,4 +251,39 @@ async def auth_headers_with_org(
     return {
         **auth_headers,
         "X-Organization-Id": str(test_organization.id),
-    }
\ No newline at end of file
+    }
+
+
+@pytest_asyncio.fixture
+async def member_user(
+        session: AsyncSession,
+        test_organization: Organization,
+        test_member: OrganizationMember,
+) -> User:
+    """A second user with the member role."""
+    user = User(
+        email="member@example.com",
+        hashed_password=hash_password("password123"),
+        name="Member",
+    )
+    session.add(user)
+    await session.flush()
+    session.add(OrganizationMember(
+        organization_id=test_organization.id,
+        user_id=user.id,
+        role=OrganizationRole.MEMBER,
+    ))
+    await session.commit()
+    return user
+
+
+@pytest_asyncio.fixture
+async def member_headers(
+        member_user: User,
+        test_organization: Organization,
+) -> dict[str, str]:
+    """Headers of the member user with organization context."""
+    return {
+        "Authorization": f"Bearer {create_access_token(subject=member_user.id)}",
+        "X-Organization-Id": str(test_organization.id),
+    }
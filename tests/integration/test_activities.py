@@ -0,0 +1,367 @@
+"""Integration tests for activities endpoints."""
+
+import csv
+import io
+import json
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, insert, select, text, update
+
+from app.core.pagination import Cursor
+from app.db.activity_partitions import (
+    DEFAULT_PARTITION,
+    create_partitions,
+    detach_partitions,
+    is_partitioned,
+    list_partitions,
+    partition_activities,
+)
+from app.models import Activity, Deal, Organization
+from app.models.enums import ActivityType
+from app.repositories.activity import ActivityRepository
+from tests.sql_recorder import SQLRecorder
+
+
+def activity_rows(deal: Deal, created_at: list[datetime]) -> list[dict]:
+    return [
+        {
+            "deal_id": deal.id,
+            "organization_id": deal.organization_id,
+            "type": ActivityType.COMMENT,
+            "payload": {"n": n},
+            "created_at": at,
+        }
+        for n, at in enumerate(created_at)
+    ]
+
+
+class TestListActivities:
+    """Tests for the deal activity timeline."""
+
+    @pytest.mark.asyncio
+    async def test_list_with_authors(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder: SQLRecorder,
+        test_deal: Deal,
+    ):
+        """Activities, authors and the tenant check share one query."""
+        await client.post(
+            f"/api/v1/deals/{test_deal.id}/activities",
+            headers=auth_headers_with_org,
+            json={"type": "comment", "payload": {"text": "Hi"}},
+        )
+
+        response = await client.get(
+            f"/api/v1/deals/{test_deal.id}/activities",
+            headers=auth_headers_with_org,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["items"][0]["author"]["name"] == "Test User"
+        # Principal is cached by the first request
+        assert len(sql_recorder.last) == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_and_foreign_deals(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_deal: Deal,
+    ):
+        """A deal without activities is empty; an unknown deal is 404."""
+        empty = await client.get(
+            f"/api/v1/deals/{test_deal.id}/activities",
+            headers=auth_headers_with_org,
+        )
+        missing = await client.get(
+            f"/api/v1/deals/{test_deal.id + 1000}/activities",
+            headers=auth_headers_with_org,
+        )
+
+        assert empty.json()["items"] == []
+        assert missing.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_through_timeline(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_deal: Deal,
+    ):
+        """Cursor pages cover the timeline once, including created_at ties."""
+        now = datetime.now(UTC)
+        await session.execute(insert(Activity), activity_rows(
+            test_deal, [now - timedelta(minutes=n // 2) for n in range(7)]
+        ))
+        await session.commit()
+        expected = list(await session.scalars(
+            select(Activity.id).order_by(Activity.created_at.desc(), Activity.id.desc())
+        ))
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+            body = (await client.get(
+                f"/api/v1/deals/{test_deal.id}/activities",
+                headers=auth_headers_with_org,
+                params=params,
+            )).json()
+            seen.extend(item["id"] for item in body["items"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "cursor",
+        ["not-a-cursor", Cursor("created_at", "desc", "yesterday", 1).encode()],
+    )
+    async def test_invalid_cursor(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_deal: Deal,
+        cursor: str,
+    ):
+        """A malformed cursor or one without a timestamp is rejected."""
+        response = await client.get(
+            f"/api/v1/deals/{test_deal.id}/activities",
+            headers=auth_headers_with_org,
+            params={"cursor": cursor},
+        )
+
+        assert response.status_code == 400
+
+
+class TestOrganizationFeed:
+    """Tests for the organization-wide activity feed."""
+
+    @pytest.mark.asyncio
+    async def test_feed_spans_deals_with_authors(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder: SQLRecorder,
+        member_headers: dict,
+        test_deal: Deal,
+    ):
+        """Comments on several deals are listed newest first, authors batched."""
+        other = await client.post(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            json={"contact_id": test_deal.contact_id, "title": "Other"},
+        )
+        for deal_id, headers in [
+            (test_deal.id, auth_headers_with_org),
+            (other.json()["id"], member_headers),
+            (test_deal.id, member_headers),
+        ]:
+            await client.post(
+                f"/api/v1/deals/{deal_id}/activities",
+                headers=headers,
+                json={"type": "comment", "payload": {"text": "Hi"}},
+            )
+
+        response = await client.get("/api/v1/activities", headers=auth_headers_with_org)
+
+        items = response.json()["items"]
+        assert [item["deal_id"] for item in items] == [
+            test_deal.id, other.json()["id"], test_deal.id
+        ]
+        assert [item["author"]["name"] for item in items] == [
+            "Member", "Member", "Test User"
+        ]
+        # Activities, then authors in one query
+        assert len(sql_recorder.last) == 2
+
+    @pytest.mark.asyncio
+    async def test_filters_and_cursor(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_deal: Deal,
+        test_user,
+    ):
+        """Type, author and time filters combine with cursor paging."""
+        now = datetime.now(UTC)
+        rows = activity_rows(test_deal, [now - timedelta(hours=n) for n in range(6)])
+        for n, row in enumerate(rows):
+            row["author_id"] = test_user.id if n % 2 else None
+        rows[1]["type"] = ActivityType.STAGE_CHANGED
+        await session.execute(insert(Activity), rows)
+        await session.commit()
+
+        params = {
+            "type": "comment",
+            "author_id": test_user.id,
+            "since": (now - timedelta(hours=5, minutes=30)).isoformat(),
+            "limit": 1,
+        }
+        first = (await client.get(
+            "/api/v1/activities", headers=auth_headers_with_org, params=params
+        )).json()
+        second = (await client.get(
+            "/api/v1/activities",
+            headers=auth_headers_with_org,
+            params=params | {"cursor": first["next_cursor"]},
+        )).json()
+
+        assert [item["payload"]["n"] for item in first["items"]] == [3]
+        assert [item["payload"]["n"] for item in second["items"]] == [5]
+
+    @pytest.mark.asyncio
+    async def test_other_organization_is_hidden(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_deal: Deal,
+    ):
+        """The feed only shows the current organization's activities."""
+        await session.execute(insert(Activity), activity_rows(test_deal, [datetime.now(UTC)]))
+        foreign = Organization(name="Foreign")
+        session.add(foreign)
+        await session.commit()
+        await session.execute(
+            update(Activity).values(organization_id=foreign.id)
+        )
+        await session.commit()
+
+        response = await client.get("/api/v1/activities", headers=auth_headers_with_org)
+
+        assert response.json()["items"] == []
+
+
+class TestActivityPartitions:
+    """Monthly partitioning of activities (rolled back after each test)."""
+
+    @pytest.mark.asyncio
+    async def test_partition_and_detach(self, session, test_deal: Deal):
+        """Rows survive conversion, prune by month and detach with partitions."""
+        months = [datetime(2026, month, 15, tzinfo=UTC) for month in (7, 8, 9)]
+        await session.execute(insert(Activity), activity_rows(test_deal, months))
+        conn = await session.connection()
+
+        created = await partition_activities(
+            conn, months_ahead=1, today=date(2026, 9, 20)
+        )
+
+        assert await is_partitioned(conn)
+        assert created == [
+            DEFAULT_PARTITION,
+            "activities_p202607",
+            "activities_p202608",
+            "activities_p202609",
+            "activities_p202610",
+        ]
+        assert await partition_activities(conn) == []
+        assert await session.scalar(select(func.count()).select_from(Activity)) == 3
+
+        # New rows keep taking ids from the same sequence
+        activity = await ActivityRepository(session).create_comment(
+            test_deal.id, test_deal.organization_id, test_deal.owner_id, "New"
+        )
+        assert activity.id > max(await session.scalars(select(Activity.id).where(
+            Activity.id != activity.id
+        )))
+
+        # A cursor in August only reads August and older partitions
+        cursor = ActivityRepository.make_cursor(
+            Activity(id=0, created_at=months[1])
+        )
+        query = ActivityRepository(session)._page(
+            select(Activity).where(Activity.deal_id == test_deal.id), 0, 10, cursor
+        )
+        plan = (await conn.execute(
+            text(f"EXPLAIN {query.compile(compile_kwargs={'literal_binds': True})}")
+        )).scalars().all()
+        scanned = "\n".join(plan)
+        assert "activities_p202607" in scanned
+        assert "activities_p202609" not in scanned
+
+        assert await detach_partitions(conn, date(2026, 8, 31)) == ["activities_p202607"]
+        assert "activities_p202607" not in await list_partitions(conn)
+        assert await session.scalar(select(func.count()).select_from(Activity)) == 3
+
+        await session.rollback()
+
+    @pytest.mark.asyncio
+    async def test_create_moves_rows_from_default(self, session, test_deal: Deal):
+        """A new month takes over its rows from the default partition."""
+        conn = await session.connection()
+        await partition_activities(conn, months_ahead=0, today=date(2026, 9, 1))
+        later = datetime(2026, 12, 1, tzinfo=UTC)
+        await session.execute(insert(Activity), activity_rows(test_deal, [later]))
+
+        assert await create_partitions(conn, date(2026, 10, 1), date(2027, 1, 1)) == [
+            "activities_p202610",
+            "activities_p202611",
+            "activities_p202612",
+        ]
+        moved = await conn.execute(text("SELECT count(*) FROM activities_p202612"))
+        assert moved.scalar() == 1
+        assert DEFAULT_PARTITION in await list_partitions(conn)
+
+        await session.rollback()
+
+
+class TestExportActivities:
+    """Tests for activity export."""
+
+    @pytest.mark.asyncio
+    async def test_export_organization_activities(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_deal: Deal,
+    ):
+        """Comments of the organization's deals are exported with payloads."""
+        for comment in ["First", "Second"]:
+            await client.post(
+                f"/api/v1/deals/{test_deal.id}/activities",
+                headers=auth_headers_with_org,
+                json={"type": "comment", "payload": {"text": comment}},
+            )
+
+        response = await client.get(
+            "/api/v1/activities/export",
+            headers=auth_headers_with_org,
+            params={"format": "ndjson", "deal_id": test_deal.id},
+        )
+
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["payload"] for row in rows] == [
+            {"text": "First"}, {"text": "Second"}
+        ]
+        assert rows[0]["type"] == "comment"
+
+    @pytest.mark.asyncio
+    async def test_export_csv_encodes_payload(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_deal: Deal,
+    ):
+        """CSV cells hold the payload as JSON."""
+        await client.post(
+            f"/api/v1/deals/{test_deal.id}/activities",
+            headers=auth_headers_with_org,
+            json={"type": "comment", "payload": {"text": "a, b"}},
+        )
+
+        response = await client.get(
+            "/api/v1/activities/export",
+            headers=auth_headers_with_org,
+        )
+
+        records = list(csv.DictReader(io.StringIO(response.text)))
+        assert json.loads(records[-1]["payload"]) == {"text": "a, b"}
@@ -0,0 +1,222 @@
+"""Integration tests for the activity sink and outbox worker."""
+
+import pytest
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.core.activity_sink import BUFFER_KEY, activity_sink
+from app.models import Activity, ActivityOutbox, Deal, User
+from app.models.enums import ActivityType, DealStatus
+from app.repositories.activity import ActivityRepository
+from app.services.activity_outbox import ActivityOutboxWorker
+from tests.conftest import TestSessionLocal
+from tests.sql_recorder import SQLRecorder
+
+
+async def count_rows(session, model) -> int:
+    return await session.scalar(select(func.count()).select_from(model))
+
+
+def inserts(recorder: SQLRecorder, table: str) -> list[str]:
+    return [
+        statement
+        for statement, _ in recorder.last.statements
+        if statement.startswith(f"INSERT INTO {table} ")
+    ]
+
+
+class TestCommitMode:
+    """Activities are written with one INSERT at commit."""
+
+    @pytest.fixture(autouse=True)
+    def commit_mode(self, monkeypatch):
+        monkeypatch.setattr(activity_sink, "mode", "commit")
+
+    @pytest.mark.asyncio
+    async def test_update_writes_activities_at_commit(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder: SQLRecorder,
+        test_deal: Deal,
+    ):
+        """Status and stage activities share one INSERT after the UPDATE."""
+        await client.patch(
+            f"/api/v1/deals/{test_deal.id}",
+            headers=auth_headers_with_org,
+            json={"status": "in_progress", "stage": "proposal"},
+        )
+
+        statements = [statement for statement, _ in sql_recorder.last.statements]
+        [insert] = inserts(sql_recorder, "activities")
+        assert statements.index(insert) > next(
+            i for i, s in enumerate(statements) if s.startswith("UPDATE deals")
+        )
+
+        response = await client.get(
+            f"/api/v1/deals/{test_deal.id}/activities",
+            headers=auth_headers_with_org,
+        )
+        assert {item["type"] for item in response.json()["items"]} == {
+            "status_changed",
+            "stage_changed",
+        }
+
+    @pytest.mark.asyncio
+    async def test_batch_size_splits_inserts(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder: SQLRecorder,
+        session,
+        test_organization,
+        test_user,
+        test_contact,
+        monkeypatch,
+    ):
+        """Buffers over ACTIVITY_SINK_BATCH_SIZE are written in batches."""
+        monkeypatch.setattr(activity_sink, "batch_size", 2)
+        deals = [
+            Deal(
+                organization_id=test_organization.id,
+                owner_id=test_user.id,
+                contact_id=test_contact.id,
+                title=f"Deal {i}",
+                amount=Decimal("100"),
+            )
+            for i in range(5)
+        ]
+        session.add_all(deals)
+        await session.commit()
+
+        await client.patch(
+            "/api/v1/deals/bulk",
+            headers=auth_headers_with_org,
+            json={"ids": [deal.id for deal in deals], "stage": "proposal"},
+        )
+
+        assert len(inserts(sql_recorder, "activities")) == 3
+        assert await count_rows(session, Activity) == 5
+
+    @pytest.mark.asyncio
+    async def test_rollback_drops_buffer(self, session, test_deal: Deal):
+        """Activities of a rolled back transaction are never written."""
+        repo = ActivityRepository(session)
+        await repo.create_status_changed(
+            test_deal.id, test_deal.organization_id, None, "new", "won"
+        )
+        assert session.info[BUFFER_KEY]
+
+        await session.rollback()
+        await session.commit()
+
+        assert BUFFER_KEY not in session.info
+        assert await count_rows(session, Activity) == 0
+
+
+class TestOutboxMode:
+    """Activities go to the outbox and are moved by the worker."""
+
+    @pytest.fixture(autouse=True)
+    def outbox_mode(self, monkeypatch):
+        monkeypatch.setattr(activity_sink, "mode", "outbox")
+
+    @pytest.fixture
+    def worker(self) -> ActivityOutboxWorker:
+        return ActivityOutboxWorker(TestSessionLocal, batch_size=2, interval=0.01)
+
+    @pytest.mark.asyncio
+    async def test_drain_moves_outbox_rows(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder: SQLRecorder,
+        session,
+        worker: ActivityOutboxWorker,
+        test_deal: Deal,
+    ):
+        """Requests append to the outbox; a drain moves rows in batches."""
+        for status in ("in_progress", "won", "lost"):
+            await client.patch(
+                f"/api/v1/deals/{test_deal.id}",
+                headers=auth_headers_with_org,
+                json={"status": status},
+            )
+        assert len(inserts(sql_recorder, "activity_outbox")) == 1
+        assert not inserts(sql_recorder, "activities")
+        assert await count_rows(session, Activity) == 0
+
+        assert await worker.drain() == 3
+        assert worker.stats() == {"moved": 3, "batches": 2, "errors": 0}
+
+        assert await count_rows(session, ActivityOutbox) == 0
+        response = await client.get(
+            f"/api/v1/deals/{test_deal.id}/activities",
+            headers=auth_headers_with_org,
+        )
+        assert [item["payload"]["new_status"] for item in response.json()["items"]] == [
+            "lost",
+            "won",
+            "in_progress",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_drain_follows_deleted_deals_and_authors(
+        self,
+        session,
+        worker: ActivityOutboxWorker,
+        test_deal: Deal,
+    ):
+        """Rows of deleted deals are dropped; deleted authors become NULL."""
+        gone = User(email="gone@example.com", hashed_password="x", name="Gone")
+        session.add(gone)
+        await session.flush()
+        session.add_all([
+            ActivityOutbox(
+                deal_id=test_deal.id,
+                organization_id=test_deal.organization_id,
+                author_id=gone.id,
+                type=ActivityType.STAGE_CHANGED,
+                payload={},
+            ),
+            ActivityOutbox(
+                deal_id=test_deal.id + 1000,
+                organization_id=test_deal.organization_id,
+                author_id=None,
+                type=ActivityType.STAGE_CHANGED,
+                payload={},
+            ),
+        ])
+        await session.delete(gone)
+        await session.commit()
+
+        assert await worker.drain() == 2
+
+        activities = (await session.scalars(select(Activity))).all()
+        assert [(a.deal_id, a.organization_id, a.author_id) for a in activities] == [
+            (test_deal.id, test_deal.organization_id, None)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_close_drains_remaining_rows(
+        self,
+        session,
+        worker: ActivityOutboxWorker,
+        test_deal: Deal,
+    ):
+        """Stopping the worker moves what is left in the outbox."""
+        worker.interval = 3600
+        worker.start()
+        session.add(ActivityOutbox(
+            deal_id=test_deal.id,
+            organization_id=test_deal.organization_id,
+            author_id=None,
+            type=ActivityType.STATUS_CHANGED,
+            payload={"old_status": DealStatus.NEW, "new_status": DealStatus.WON},
+        ))
+        await session.commit()
+
+        await worker.close()
+
+        assert await count_rows(session, Activity) == 1
@@ -1,9 +1,17 @@
 import pytest
 from decimal import Decimal
 from httpx import AsyncClient
+from sqlalchemy import select
 
-from app.models import Deal
+from app.core.cache import analytics_cache
+from app.db.hooks import run_after_commit
+from app.models import Deal, DealStats
 from app.models.enums import DealStage, DealStatus
+from app.api.v1.endpoints.deals import get_deal_service
+from app.repositories.deal import DealRepository
+from app.repositories.deal_stats import DealStatsRepository
+from app.services.analytics import AnalyticsService
+from tests.conftest import TestSessionLocal
 
 
 class TestDealsSummary:
@@ -125,6 +133,53 @@ class TestDealsSummary:
         assert Decimal(str(data["by_status"]["won"]["total_amount"])) >= Decimal("3000")
 
 
+    @pytest.mark.asyncio
+    async def test_summary_aggregates_in_one_query(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_organization,
+        test_user,
+        test_contact,
+    ):
+        """Summary returns exact per-status, average and new-deal figures."""
+        session.add_all([
+            Deal(
+                organization_id=test_organization.id,
+                owner_id=test_user.id,
+                contact_id=test_contact.id,
+                title=f"Deal {amount}",
+                amount=Decimal(amount),
+                currency="USD",
+                status=status,
+                stage=DealStage.CLOSED,
+            )
+            for amount, status in [
+                ("100", DealStatus.WON),
+                ("300", DealStatus.WON),
+                ("50", DealStatus.LOST),
+            ]
+        ])
+        await session.commit()
+
+        response = await client.get(
+            "/api/v1/analytics/deals/summary",
+            headers=auth_headers_with_org,
+            params={"days": 3},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["by_status"]["won"]["count"] == 2
+        assert Decimal(str(data["by_status"]["won"]["total_amount"])) == Decimal("400")
+        assert data["by_status"]["lost"]["count"] == 1
+        assert data["by_status"]["new"]["count"] == 0
+        assert Decimal(str(data["by_status"]["new"]["total_amount"])) == 0
+        assert Decimal(str(data["average_won_amount"])) == Decimal("200")
+        assert data["new_deals_last_n_days"]["count"] == 3
+
+
 class TestDealsFunnel:
     """Tests for deals funnel endpoint."""
 
@@ -219,4 +274,140 @@ class TestDealsFunnel:
         """Cannot get funnel without auth."""
         response = await client.get("/api/v1/analytics/deals/funnel")
 
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+
+class TestDealRollup:
+    """Tests for the deal_stats rollup."""
+
+    async def _rollup(self, session, organization_id: int) -> dict:
+        result = await session.execute(
+            select(DealStats).where(DealStats.organization_id == organization_id)
+        )
+        return {
+            (row.stage, row.status): (row.count, row.total_amount)
+            for row in result.scalars()
+            if row.count
+        }
+
+    @pytest.mark.asyncio
+    async def test_rollup_follows_deal_writes(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_organization,
+        test_contact,
+    ):
+        """Create, update and delete keep the rollup equal to a rebuild."""
+        created = []
+        for amount in ("100", "250"):
+            response = await client.post(
+                "/api/v1/deals",
+                headers=auth_headers_with_org,
+                json={"contact_id": test_contact.id, "title": "D", "amount": amount},
+            )
+            created.append(response.json()["id"])
+
+        await client.patch(
+            f"/api/v1/deals/{created[0]}",
+            headers=auth_headers_with_org,
+            json={"stage": "proposal", "status": "in_progress", "amount": "120"},
+        )
+        await client.patch(
+            f"/api/v1/deals/{created[1]}",
+            headers=auth_headers_with_org,
+            json={"amount": "300"},
+        )
+        await client.delete(
+            f"/api/v1/deals/{created[1]}",
+            headers=auth_headers_with_org,
+        )
+
+        incremental = await self._rollup(session, test_organization.id)
+        assert incremental == {("proposal", "in_progress"): (1, Decimal("120.00"))}
+
+        await DealStatsRepository(session).rebuild(test_organization.id)
+        await session.commit()
+
+        assert await self._rollup(session, test_organization.id) == incremental
+
+    @pytest.mark.asyncio
+    async def test_rollup_reads_match_deal_reads(
+        self,
+        session,
+        test_organization,
+        test_user,
+        test_contact,
+    ):
+        """Summary and funnel are the same whether read from rollup or deals."""
+        session.add_all([
+            Deal(
+                organization_id=test_organization.id,
+                owner_id=test_user.id,
+                contact_id=test_contact.id,
+                title="Deal",
+                amount=Decimal(amount),
+                currency="USD",
+                status=status,
+                stage=stage,
+            )
+            for amount, status, stage in [
+                ("100", DealStatus.WON, DealStage.CLOSED),
+                ("300", DealStatus.WON, DealStage.CLOSED),
+                ("50", DealStatus.IN_PROGRESS, DealStage.PROPOSAL),
+            ]
+        ])
+        await session.commit()
+        await DealStatsRepository(session).rebuild(test_organization.id)
+        await session.commit()
+
+        def make_service(use_rollup: bool) -> AnalyticsService:
+            return AnalyticsService(
+                deal_repo=DealRepository(session),
+                stats_repo=DealStatsRepository(session),
+                session=session,
+                use_rollup=use_rollup,
+            )
+
+        from_deals = make_service(False)
+        from_rollup = make_service(True)
+        await AnalyticsService.invalidate_cache(test_organization.id)
+        summary = await from_deals.get_deals_summary(test_organization.id)
+        funnel = await from_deals.get_deals_funnel(test_organization.id)
+        await AnalyticsService.invalidate_cache(test_organization.id)
+
+        assert await from_rollup.get_deals_summary(test_organization.id) == summary
+        assert await from_rollup.get_deals_funnel(test_organization.id) == funnel
+
+    @pytest.mark.asyncio
+    async def test_cache_invalidated_after_deal_write_commits(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_organization,
+        test_user,
+        test_contact,
+    ):
+        """A summary computed between a write and its commit doesn't outlive it."""
+        url = "/api/v1/analytics/deals/summary"
+        async with TestSessionLocal() as session:
+            await get_deal_service(session).create_deal(
+                organization_id=test_organization.id,
+                owner_id=test_user.id,
+                contact_id=test_contact.id,
+                title="Uncommitted",
+                amount=Decimal("100"),
+            )
+
+            # Concurrent miss: computes (and caches) without the new deal
+            response = await client.get(url, headers=auth_headers_with_org)
+            assert response.json()["by_status"]["new"]["count"] == 0
+            assert await analytics_cache.get(f"summary:{test_organization.id}:30")
+
+            await session.commit()
+            await run_after_commit(session)
+
+        assert await analytics_cache.get(f"summary:{test_organization.id}:30") is None
+        response = await client.get(url, headers=auth_headers_with_org)
+        assert response.json()["by_status"]["new"]["count"] == 1
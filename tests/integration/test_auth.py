@@ -3,6 +3,7 @@
 import pytest
 from httpx import AsyncClient
 
+from app.core.password_hasher import password_hasher
 from app.core.security import verify_access_token, verify_refresh_token
 
 
@@ -129,6 +130,23 @@ class TestLogin:
 
         assert response.status_code == 401
 
+    @pytest.mark.asyncio
+    async def test_login_when_hasher_busy(
+        self, client: AsyncClient, test_user, monkeypatch
+    ):
+        """A saturated password hasher answers 503 with Retry-After."""
+        monkeypatch.setattr(password_hasher, "max_waiting", 0)
+        monkeypatch.setattr(password_hasher._slots, "locked", lambda: True)
+
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "password123"},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.json()["error"]["code"] == "AUTH_BUSY"
+
 
 class TestRefreshToken:
     """Tests for token refresh endpoint."""
@@ -193,4 +211,51 @@ class TestRefreshToken:
             json={"refresh_token": "invalid.token.here"},
         )
 
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+class TestLogout:
+    """Tests for token revocation on logout."""
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_tokens(self, client: AsyncClient, test_user):
+        """After logout neither the access nor the refresh token works."""
+        tokens = (await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "password123"},
+        )).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        assert (await client.get("/api/v1/organizations/me", headers=headers)).status_code == 200
+
+        response = await client.post(
+            "/api/v1/auth/logout",
+            headers=headers,
+            json={"refresh_token": tokens["refresh_token"]},
+        )
+        assert response.status_code == 204
+
+        me = await client.get("/api/v1/organizations/me", headers=headers)
+        refresh = await client.post(
+            "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert me.status_code == 401
+        assert refresh.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_other_sessions_keep_working(self, client: AsyncClient, test_user):
+        """Logout only revokes the tokens it was given."""
+        first, second = [
+            (await client.post(
+                "/api/v1/auth/login",
+                json={"email": test_user.email, "password": "password123"},
+            )).json()["access_token"]
+            for _ in range(2)
+        ]
+
+        await client.post(
+            "/api/v1/auth/logout", headers={"Authorization": f"Bearer {first}"}
+        )
+
+        response = await client.get(
+            "/api/v1/organizations/me", headers={"Authorization": f"Bearer {second}"}
+        )
+        assert response.status_code == 200
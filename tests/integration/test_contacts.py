@@ -1,9 +1,18 @@
 """Integration tests for contacts endpoints."""
 
+import csv
+import io
+
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Contact
+from app.core.config import settings
+from app.models import Contact, Organization, User
+from app.repositories.contact import ContactRepository
+from app.repositories.contact_search import check_contact_search, get_contact_search
 
 
 class TestListContacts:
@@ -71,6 +80,267 @@ class TestListContacts:
         assert len(data["items"]) >= 1
 
 
+@pytest_asyncio.fixture
+async def search_contacts(
+    session: AsyncSession,
+    test_organization: Organization,
+    test_user: User,
+) -> list[Contact]:
+    """Contacts with overlapping names for search tests."""
+    contacts = [
+        Contact(
+            organization_id=test_organization.id,
+            owner_id=test_user.id,
+            name=name,
+            email=email,
+        )
+        for name, email in [
+            ("John Smith", "john.smith@acme.io"),
+            ("Johnny Appleseed", "johnny@orchard.com"),
+            ("Mary Johnson", "mary@acme.io"),
+            ("Bob 100% Real", None),
+        ]
+    ]
+    session.add_all(contacts)
+    await session.commit()
+    return contacts
+
+
+async def search_backends(session: AsyncSession) -> list[str]:
+    """Search backends usable on the test database."""
+    backends = ["ilike", "fulltext"]
+    trigram = await session.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    )
+    if trigram.first() is not None:
+        backends.append("trigram")
+    return backends
+
+
+class TestContactSearch:
+    """Tests for contact search backends."""
+
+    @pytest.mark.asyncio
+    async def test_backends_find_by_name_prefix(
+        self,
+        session: AsyncSession,
+        test_organization: Organization,
+        search_contacts: list[Contact],
+    ):
+        """Every backend matches word prefixes and ranks closer matches first."""
+        for backend in await search_backends(session):
+            repo = ContactRepository(session, search=get_contact_search(backend))
+
+            found = await repo.get_by_organization(test_organization.id, search="john")
+            names = [contact.name for contact in found]
+
+            assert set(names) >= {"John Smith", "Johnny Appleseed"}, backend
+            assert names[0].startswith("John"), backend
+            page, total, exact = await repo.get_page_by_organization(
+                test_organization.id, limit=1, search="john"
+            )
+            assert page == found[:1], backend
+            assert total == len(found), backend
+            assert exact, backend
+
+    @pytest.mark.asyncio
+    async def test_backends_find_by_email_domain(
+        self,
+        session: AsyncSession,
+        test_organization: Organization,
+        search_contacts: list[Contact],
+    ):
+        """Email domain finds every contact on it."""
+        for backend in await search_backends(session):
+            repo = ContactRepository(session, search=get_contact_search(backend))
+
+            found = await repo.get_by_organization(test_organization.id, search="acme")
+
+            assert {c.name for c in found} == {"John Smith", "Mary Johnson"}, backend
+
+    @pytest.mark.asyncio
+    async def test_fulltext_requires_every_word(
+        self,
+        session: AsyncSession,
+        test_organization: Organization,
+        search_contacts: list[Contact],
+    ):
+        """Full-text search matches all words of the term as prefixes."""
+        repo = ContactRepository(session, search=get_contact_search("fulltext"))
+
+        found = await repo.get_by_organization(test_organization.id, search="jo sm")
+
+        assert [c.name for c in found] == ["John Smith"]
+
+    @pytest.mark.asyncio
+    async def test_wildcards_are_literal(
+        self,
+        session: AsyncSession,
+        test_organization: Organization,
+        search_contacts: list[Contact],
+    ):
+        """LIKE wildcards in the term don't match everything."""
+        repo = ContactRepository(session, search=get_contact_search("ilike"))
+
+        assert await repo.count_by_organization(test_organization.id, search="%") == 1
+        assert await repo.count_by_organization(test_organization.id, search="_") == 0
+
+    @pytest.mark.asyncio
+    async def test_startup_check_requires_backend_extension(
+        self,
+        session: AsyncSession,
+    ):
+        """Trigram search without pg_trgm fails the startup check."""
+        connection = await session.connection()
+        for backend in ("ilike", "fulltext"):
+            await check_contact_search(connection, backend)
+
+        if "trigram" in await search_backends(session):
+            await check_contact_search(connection, "trigram")
+        else:
+            with pytest.raises(RuntimeError, match="pg_trgm"):
+                await check_contact_search(connection, "trigram")
+
+
+class TestImportContacts:
+    """Tests for bulk contact import."""
+
+    @pytest.mark.asyncio
+    async def test_import_ndjson(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_organization: Organization,
+        session: AsyncSession,
+    ):
+        """Valid rows are created, invalid rows reported with their number."""
+        body = "\n".join([
+            '{"name": "Alice", "email": "alice@example.com"}',
+            '{"name": ""}',
+            'not json',
+            '{"name": "Bob", "phone": "+1"}',
+        ])
+
+        response = await client.post(
+            "/api/v1/contacts/import",
+            headers={**auth_headers_with_org, "Content-Type": "application/x-ndjson"},
+            content=body,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed"] == 2
+        assert [error["row"] for error in data["errors"]] == [2, 3]
+        assert data["errors"][0]["field"] == "name"
+
+        repo = ContactRepository(session)
+        assert await repo.count_by_organization(test_organization.id) == 2
+
+    @pytest.mark.asyncio
+    async def test_import_csv_in_chunks(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_organization: Organization,
+        session: AsyncSession,
+        monkeypatch,
+    ):
+        """CSV rows are inserted across several chunks."""
+        monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+        rows = "\n".join(f"Contact {i},c{i}@example.com" for i in range(5))
+
+        response = await client.post(
+            "/api/v1/contacts/import",
+            headers={**auth_headers_with_org, "Content-Type": "text/csv"},
+            content=f"name,email\n{rows}\n",
+        )
+
+        assert response.json()["created"] == 5
+        repo = ContactRepository(session)
+        assert await repo.count_by_organization(test_organization.id) == 5
+
+    @pytest.mark.asyncio
+    async def test_import_unsupported_format(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+    ):
+        """Bodies other than NDJSON/CSV are rejected."""
+        response = await client.post(
+            "/api/v1/contacts/import",
+            headers=auth_headers_with_org,
+            json=[{"name": "Alice"}],
+        )
+
+        assert response.status_code == 415
+
+
+class TestExportContacts:
+    """Tests for contact export."""
+
+    @pytest.mark.asyncio
+    async def test_export_csv(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_organization: Organization,
+        test_user: User,
+        session: AsyncSession,
+    ):
+        """All contacts are exported in id order; missing values are empty."""
+        session.add_all(
+            Contact(
+                organization_id=test_organization.id,
+                owner_id=test_user.id,
+                name=f"Contact {i}",
+                email=f"c{i}@example.com" if i % 2 else None,
+            )
+            for i in range(3)
+        )
+        await session.commit()
+
+        response = await client.get(
+            "/api/v1/contacts/export",
+            headers=auth_headers_with_org,
+        )
+
+        assert response.status_code == 200
+        records = list(csv.DictReader(io.StringIO(response.text)))
+        assert [record["name"] for record in records] == [
+            "Contact 0", "Contact 1", "Contact 2"
+        ]
+        assert records[0]["email"] == ""
+        assert records[1]["email"] == "c1@example.com"
+
+    @pytest.mark.asyncio
+    async def test_export_with_search(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_contact: Contact,
+        test_organization: Organization,
+        test_user: User,
+        session: AsyncSession,
+    ):
+        """The search filter applies to exports."""
+        session.add(Contact(
+            organization_id=test_organization.id,
+            owner_id=test_user.id,
+            name="Jane Roe",
+        ))
+        await session.commit()
+
+        response = await client.get(
+            "/api/v1/contacts/export",
+            headers=auth_headers_with_org,
+            params={"format": "ndjson", "search": "john"},
+        )
+
+        assert response.text.count("\n") == 1
+        assert '"name":"John Doe"' in response.text
+
+
 class TestCreateContact:
     """Tests for create contact endpoint."""
 
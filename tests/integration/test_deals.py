@@ -1,11 +1,20 @@
 """Integration tests for deals endpoints."""
 
+import asyncio
+import csv
+import io
+import json
+
 import pytest
+import pytest_asyncio
 from decimal import Decimal
 from httpx import AsyncClient
+from sqlalchemy import delete, event
 
+from app.core.pagination import Cursor
 from app.models import Deal
 from app.models.enums import DealStage, DealStatus
+from tests.conftest import TestSessionLocal, test_engine
 
 
 class TestListDeals:
@@ -72,6 +81,386 @@ class TestListDeals:
             assert item["stage"] == "qualification"
 
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("order_by", "order"),
+        [("created_at", "desc"), ("amount", "asc"), ("title", "desc")],
+    )
+    async def test_list_deals_cursor_pagination(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_organization,
+        test_user,
+        test_contact,
+        order_by,
+        order,
+    ):
+        """Cursor pages walk through all deals without gaps or repeats."""
+        deals = [
+            Deal(
+                organization_id=test_organization.id,
+                owner_id=test_user.id,
+                contact_id=test_contact.id,
+                title=f"Deal {i % 3}",
+                amount=Decimal(100 * (i % 4)),
+                currency="USD",
+                status=DealStatus.NEW,
+                stage=DealStage.QUALIFICATION,
+            )
+            for i in range(7)
+        ]
+        session.add_all(deals)
+        await session.commit()
+
+        params = {"page_size": 3, "order_by": order_by, "order": order}
+        seen = []
+        cursor = None
+        for _ in range(5):
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get(
+                "/api/v1/deals",
+                headers=auth_headers_with_org,
+                params=params,
+            )
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert sorted(seen) == sorted(deal.id for deal in deals)
+
+        offset_response = await client.get(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            params={"page_size": 7, "order_by": order_by, "order": order},
+        )
+        assert [item["id"] for item in offset_response.json()["items"]] == seen
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "order_by, cursor",
+        [
+            ("created_at", "garbage"),
+            ("created_at", Cursor("created_at", "desc", "yesterday", 1).encode()),
+            ("amount", Cursor("amount", "desc", "many", 1).encode()),
+        ],
+    )
+    async def test_list_deals_invalid_cursor(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        order_by: str,
+        cursor: str,
+    ):
+        """Malformed cursors and values of the wrong type are rejected."""
+        response = await client.get(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            params={"order_by": order_by, "cursor": cursor},
+        )
+
+        assert response.status_code == 400
+
+
+@pytest_asyncio.fixture
+async def stage_deals(session, test_organization, test_user, test_contact) -> list[Deal]:
+    """Five deals, three of them in proposal stage."""
+    deals = [
+        Deal(
+            organization_id=test_organization.id,
+            owner_id=test_user.id,
+            contact_id=test_contact.id,
+            title=f"Deal {i}",
+            amount=Decimal(100 * i),
+            currency="USD",
+            status=DealStatus.NEW,
+            stage=DealStage.PROPOSAL if i % 2 == 0 else DealStage.QUALIFICATION,
+        )
+        for i in range(5)
+    ]
+    session.add_all(deals)
+    await session.commit()
+    return deals
+
+
+class TestListDealsTotal:
+    """Tests for list totals."""
+
+    @pytest.mark.asyncio
+    async def test_total_comes_from_page_query(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+    ):
+        """Page and filtered total are read with one statement on deals."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM deals" in statement:
+                statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            response = await client.get(
+                "/api/v1/deals",
+                headers=auth_headers_with_org,
+                params={"stage": "proposal", "page_size": 2},
+            )
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+        data = response.json()
+        assert response.status_code == 200
+        assert len(data["items"]) == 2
+        assert data["total"] == 3
+        assert data["pages"] == 2
+        assert data["total_estimated"] is False
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_total_past_last_page(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+    ):
+        """Total is still reported when the page is empty."""
+        response = await client.get(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            params={"page": 4, "page_size": 2},
+        )
+
+        data = response.json()
+        assert data["items"] == []
+        assert data["total"] == 5
+
+    @pytest.mark.asyncio
+    async def test_total_with_cursor(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+    ):
+        """Cursor pages report the total of all matching deals."""
+        first = await client.get(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            params={"page_size": 2},
+        )
+        second = await client.get(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            params={"page_size": 2, "cursor": first.json()["next_cursor"]},
+        )
+
+        assert second.json()["total"] == 5
+
+    @pytest.mark.asyncio
+    async def test_estimated_total(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+    ):
+        """Estimated totals are flagged, unless the page shows the end."""
+        last_page = await client.get(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            params={"count": "estimated", "page_size": 10},
+        )
+        full_page = await client.get(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            params={"count": "estimated", "page_size": 2},
+        )
+
+        assert last_page.json()["total"] == 5
+        assert last_page.json()["total_estimated"] is False
+        assert full_page.status_code == 200
+        assert full_page.json()["total"] >= 2
+        assert full_page.json()["total_estimated"] is True
+
+
+class TestImportDeals:
+    """Tests for bulk deal import."""
+
+    @pytest.mark.asyncio
+    async def test_import_checks_contact_ownership(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_organization,
+        test_user,
+        test_contact,
+    ):
+        """Deals on contacts of other organizations are rejected per row."""
+        from app.models import Contact, Organization
+        from app.repositories.deal_stats import DealStatsRepository
+
+        other_org = Organization(name="Other")
+        session.add(other_org)
+        await session.flush()
+        foreign = Contact(
+            organization_id=other_org.id, owner_id=test_user.id, name="Foreign"
+        )
+        session.add(foreign)
+        await session.commit()
+
+        body = "\n".join([
+            f'{{"contact_id": {test_contact.id}, "title": "A", "amount": "100"}}',
+            f'{{"contact_id": {foreign.id}, "title": "B"}}',
+            f'{{"contact_id": {test_contact.id}, "title": "C", "amount": "-1"}}',
+            f'{{"contact_id": {test_contact.id}, "title": "D", "amount": "50"}}',
+        ])
+
+        response = await client.post(
+            "/api/v1/deals/import",
+            headers={**auth_headers_with_org, "Content-Type": "application/x-ndjson"},
+            content=body,
+        )
+
+        data = response.json()
+        assert data["created"] == 2
+        assert sorted(error["row"] for error in data["errors"]) == [2, 3]
+
+        stats = await DealStatsRepository(session).get_by_organization(
+            test_organization.id
+        )
+        assert [(row.count, row.total_amount) for row in stats] == [
+            (2, Decimal("150.00"))
+        ]
+
+        summary = await client.get(
+            "/api/v1/analytics/deals/summary",
+            headers=auth_headers_with_org,
+        )
+        assert summary.json()["by_status"]["new"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_import_rejects_amounts_out_of_column_range(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        test_contact,
+    ):
+        """Amounts that don't fit the amount column are row errors."""
+        amounts = ["1e20", "1.005", "9999999999999.99"]
+        body = "\n".join(
+            f'{{"contact_id": {test_contact.id}, "title": "A", "amount": "{amount}"}}'
+            for amount in amounts
+        )
+
+        response = await client.post(
+            "/api/v1/deals/import",
+            headers={**auth_headers_with_org, "Content-Type": "application/x-ndjson"},
+            content=body,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 1
+        assert [(error["row"], error["field"]) for error in data["errors"]] == [
+            (1, "amount"),
+            (2, "amount"),
+        ]
+
+
+class TestExportDeals:
+    """Tests for deal export."""
+
+    @pytest.mark.asyncio
+    async def test_export_csv_with_filters(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+    ):
+        """CSV export has a header row and only the filtered deals."""
+        response = await client.get(
+            "/api/v1/deals/export",
+            headers=auth_headers_with_org,
+            params={"stage": "proposal", "order_by": "amount", "order": "asc"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="deals.csv"' in response.headers["content-disposition"]
+        records = list(csv.DictReader(io.StringIO(response.text)))
+        assert [record["title"] for record in records] == ["Deal 0", "Deal 2", "Deal 4"]
+        assert records[1]["amount"] == "200.00"
+        assert records[1]["stage"] == "proposal"
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+        monkeypatch,
+    ):
+        """NDJSON export streams every deal, one object per line."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+        response = await client.get(
+            "/api/v1/deals/export",
+            headers=auth_headers_with_org,
+            params={"format": "ndjson"},
+        )
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 5
+        assert {row["id"] for row in rows} == {deal.id for deal in stage_deals}
+        assert rows[0]["status"] == "new"
+
+    @pytest.mark.asyncio
+    async def test_export_is_tenant_scoped(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_user,
+        test_deal: Deal,
+    ):
+        """Deals of other organizations are not exported."""
+        from app.models import Contact, Organization
+
+        other_org = Organization(name="Other")
+        session.add(other_org)
+        await session.flush()
+        contact = Contact(
+            organization_id=other_org.id, owner_id=test_user.id, name="Foreign"
+        )
+        session.add(contact)
+        await session.flush()
+        session.add(Deal(
+            organization_id=other_org.id,
+            owner_id=test_user.id,
+            contact_id=contact.id,
+            title="Foreign deal",
+        ))
+        await session.commit()
+
+        response = await client.get(
+            "/api/v1/deals/export",
+            headers=auth_headers_with_org,
+            params={"format": "ndjson"},
+        )
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == [test_deal.id]
+
+
 class TestCreateDeal:
     """Tests for create deal endpoint."""
 
@@ -144,6 +533,33 @@ class TestUpdateDeal:
         data = response.json()
         assert data["title"] == "Updated Deal Title"
 
+    @pytest.mark.asyncio
+    async def test_update_returns_server_timestamp(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder,
+        test_deal: Deal,
+    ):
+        """updated_at is read back by the UPDATE itself, not a re-select."""
+        from datetime import datetime
+
+        response = await client.patch(
+            f"/api/v1/deals/{test_deal.id}",
+            headers=auth_headers_with_org,
+            json={"title": "Renamed", "stage": "proposal"},
+        )
+
+        updated_at = datetime.fromisoformat(response.json()["updated_at"])
+        assert updated_at > test_deal.updated_at
+        statements = [statement for statement, _ in sql_recorder.last.statements]
+        update = next(s for s in statements if s.startswith("UPDATE deals"))
+        assert "RETURNING deals.updated_at" in update
+        assert any(s.startswith("INSERT INTO activities") for s in statements)
+        # The deal is loaded once, before the update
+        assert sum(s.startswith("SELECT") and "FROM deals" in s for s in statements) == 1
+        assert not any("FROM activities" in s for s in statements)
+
     @pytest.mark.asyncio
     async def test_update_deal_status_to_won(
         self,
@@ -214,6 +630,302 @@ class TestUpdateDeal:
 
         assert response.status_code == 400
 
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_keep_stats_consistent(
+        self,
+        session,
+        test_organization,
+        test_member,
+        test_deal: Deal,
+    ):
+        """A second update of the same deal waits and moves it from the new bucket."""
+        from app.api.v1.endpoints.deals import get_deal_service
+        from app.models import DealStats
+        from app.repositories.deal_stats import DealStatsRepository
+
+        await DealStatsRepository(session).rebuild(test_organization.id)
+        await session.commit()
+
+        async with TestSessionLocal() as first, TestSessionLocal() as second:
+            await get_deal_service(first).update_deal(
+                test_deal.id,
+                test_organization.id,
+                test_member,
+                amount=Decimal("200"),
+                status=DealStatus.IN_PROGRESS,
+            )
+            waiting = asyncio.create_task(get_deal_service(second).update_deal(
+                test_deal.id,
+                test_organization.id,
+                test_member,
+                amount=Decimal("300"),
+                stage=DealStage.PROPOSAL,
+            ))
+            await asyncio.sleep(0.2)
+            assert not waiting.done()
+
+            await first.commit()
+            await waiting
+            await second.commit()
+
+        rollup = {
+            (row.stage, row.status): (row.count, row.total_amount)
+            for row in await DealStatsRepository(session).get_by_organization(
+                test_organization.id
+            )
+            if row.count
+        }
+        await session.execute(delete(DealStats))
+        await DealStatsRepository(session).rebuild(test_organization.id)
+        rebuilt = {
+            (row.stage, row.status): (row.count, row.total_amount)
+            for row in await DealStatsRepository(session).get_by_organization(
+                test_organization.id
+            )
+        }
+        assert rollup == rebuilt == {
+            ("proposal", "in_progress"): (1, Decimal("300.00"))
+        }
+
+
+class TestBulkUpdateDeals:
+    """Tests for bulk deal update endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_stage_move_by_ids(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder,
+        session,
+        test_organization,
+        stage_deals: list[Deal],
+    ):
+        """One UPDATE and one activity INSERT; the rollup matches a rebuild."""
+        from app.models import DealStats
+        from app.repositories.deal_stats import DealStatsRepository
+        from sqlalchemy import select
+
+        stats_repo = DealStatsRepository(session)
+        await stats_repo.rebuild(test_organization.id)
+        await session.commit()
+
+        response = await client.patch(
+            "/api/v1/deals/bulk",
+            headers=auth_headers_with_org,
+            json={"ids": [deal.id for deal in stage_deals], "stage": "negotiation"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "updated": 5,
+            "unchanged": 0,
+            "failed": 0,
+            "errors": [],
+        }
+        statements = [statement for statement, _ in sql_recorder.last.statements]
+        assert sum(s.startswith("UPDATE deals") for s in statements) == 1
+        assert sum(s.startswith("INSERT INTO activities") for s in statements) == 1
+
+        activities = await client.get(
+            f"/api/v1/deals/{stage_deals[0].id}/activities",
+            headers=auth_headers_with_org,
+        )
+        assert [item["payload"] for item in activities.json()["items"]] == [
+            {"old_stage": "proposal", "new_stage": "negotiation"}
+        ]
+
+        async def rollup() -> dict:
+            rows = await session.scalars(
+                select(DealStats).where(DealStats.organization_id == test_organization.id)
+            )
+            return {(row.stage, row.status): row.count for row in rows if row.count}
+
+        incremental = await rollup()
+        assert incremental == {("negotiation", "new"): 5}
+        await stats_repo.rebuild(test_organization.id)
+        await session.commit()
+        assert await rollup() == incremental
+
+    @pytest.mark.asyncio
+    async def test_bulk_reports_rejected_deals(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+    ):
+        """Deals failing validation or not found are skipped and reported."""
+        ids = [deal.id for deal in stage_deals]
+        missing = max(ids) + 1000
+
+        response = await client.patch(
+            "/api/v1/deals/bulk",
+            headers=auth_headers_with_org,
+            json={"ids": [*ids, missing], "status": "won"},
+        )
+
+        data = response.json()
+        assert data["updated"] == 4
+        assert data["failed"] == 2
+        assert sorted((error["id"], error["code"]) for error in data["errors"]) == [
+            (stage_deals[0].id, "INVALID_DEAL_AMOUNT"),
+            (missing, "DEAL_NOT_FOUND"),
+        ]
+
+        zero = await client.get(
+            f"/api/v1/deals/{stage_deals[0].id}",
+            headers=auth_headers_with_org,
+        )
+        assert zero.json()["status"] == "new"
+
+    @pytest.mark.asyncio
+    async def test_bulk_by_filter(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+    ):
+        """A filter selects the deals to change; repeats are no-ops."""
+        body = {"filter": {"stage": "proposal"}, "status": "in_progress"}
+
+        first = await client.patch(
+            "/api/v1/deals/bulk", headers=auth_headers_with_org, json=body
+        )
+        second = await client.patch(
+            "/api/v1/deals/bulk", headers=auth_headers_with_org, json=body
+        )
+
+        assert first.json()["updated"] == 3
+        assert second.json()["updated"] == 0
+        assert second.json()["unchanged"] == 3
+        listed = await client.get(
+            "/api/v1/deals",
+            headers=auth_headers_with_org,
+            params={"status": "in_progress"},
+        )
+        assert listed.json()["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_bulk_owner_change(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        member_user,
+        stage_deals: list[Deal],
+    ):
+        """Deals can be reassigned to members of the organization only."""
+        ids = [deal.id for deal in stage_deals[:2]]
+
+        response = await client.patch(
+            "/api/v1/deals/bulk",
+            headers=auth_headers_with_org,
+            json={"ids": ids, "owner_id": member_user.id},
+        )
+        assert response.json()["updated"] == 2
+
+        foreign = await client.patch(
+            "/api/v1/deals/bulk",
+            headers=auth_headers_with_org,
+            json={"ids": ids, "owner_id": member_user.id + 1000},
+        )
+        assert foreign.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_member_bulk_update(
+        self,
+        client: AsyncClient,
+        member_headers: dict,
+        member_user,
+        session,
+        test_organization,
+        test_contact,
+        stage_deals: list[Deal],
+    ):
+        """Members change only their own deals and can't roll stages back."""
+        own = Deal(
+            organization_id=test_organization.id,
+            owner_id=member_user.id,
+            contact_id=test_contact.id,
+            title="Member Deal",
+            amount=Decimal("100"),
+            stage=DealStage.PROPOSAL,
+        )
+        session.add(own)
+        await session.commit()
+
+        response = await client.patch(
+            "/api/v1/deals/bulk",
+            headers=member_headers,
+            json={"ids": [own.id, stage_deals[1].id], "stage": "qualification"},
+        )
+        data = response.json()
+        assert data["updated"] == 0
+        assert sorted((error["id"], error["code"]) for error in data["errors"]) == [
+            (stage_deals[1].id, "FORBIDDEN"),
+            (own.id, "INVALID_STAGE_TRANSITION"),
+        ]
+
+        # A member's filter matches their own deals only
+        response = await client.patch(
+            "/api/v1/deals/bulk",
+            headers=member_headers,
+            json={"filter": {}, "stage": "negotiation"},
+        )
+        assert response.json()["updated"] == 1
+
+        reassign = await client.patch(
+            "/api/v1/deals/bulk",
+            headers=member_headers,
+            json={"ids": [own.id], "owner_id": member_user.id},
+        )
+        assert reassign.status_code == 403
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"stage": "proposal"},
+            {"ids": [1], "filter": {}, "stage": "proposal"},
+            {"ids": [1]},
+            {"ids": [], "stage": "proposal"},
+        ],
+        ids=["no target", "ids and filter", "no change", "empty ids"],
+    )
+    async def test_bulk_rejects_invalid_body(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        body: dict,
+    ):
+        """Exactly one target and at least one change are required."""
+        response = await client.patch(
+            "/api/v1/deals/bulk", headers=auth_headers_with_org, json=body
+        )
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_bulk_limit(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        stage_deals: list[Deal],
+        monkeypatch,
+    ):
+        """Requests matching more than BULK_UPDATE_MAX_DEALS deals are refused."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "BULK_UPDATE_MAX_DEALS", 3)
+
+        response = await client.patch(
+            "/api/v1/deals/bulk",
+            headers=auth_headers_with_org,
+            json={"filter": {}, "stage": "proposal"},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "TOO_MANY_DEALS"
+
 
 class TestDeleteDeal:
     """Tests for delete deal endpoint."""
@@ -0,0 +1,313 @@
+"""Integration tests for organizations endpoints."""
+
+from collections.abc import Callable
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.principal_cache import principal_cache
+from app.core.security import decode_token
+from app.models import Organization, User
+from app.models.enums import OrganizationRole
+from app.db.hooks import run_after_commit
+from app.repositories.organization import OrganizationMemberRepository, OrganizationRepository
+from app.repositories.user import UserRepository
+from app.services.organization import OrganizationService
+from tests.conftest import TestSessionLocal, test_engine
+
+
+class TestPrincipalCache:
+    """Authentication reads users and memberships from the principal cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_requests_skip_auth_queries(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+    ):
+        """Only the first request loads the user and membership."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM users" in statement or "FROM organization_members" in statement:
+                statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            for _ in range(3):
+                response = await client.get(
+                    "/api/v1/contacts", headers=auth_headers_with_org
+                )
+                assert response.status_code == 200
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+        assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_removed_member_loses_access(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        member_user: User,
+        member_headers: dict,
+        test_organization: Organization,
+    ):
+        """Removing a member revokes their tokens on the next request."""
+        assert (
+            await client.get("/api/v1/contacts", headers=member_headers)
+        ).status_code == 200
+
+        response = await client.delete(
+            f"/api/v1/organizations/{test_organization.id}/members/{member_user.id}",
+            headers=auth_headers_with_org,
+        )
+        assert response.status_code == 204
+
+        response = await client.get("/api/v1/contacts", headers=member_headers)
+        assert response.status_code == 401
+        assert response.json()["error"]["message"] == "Token has been revoked"
+
+    @pytest.mark.asyncio
+    async def test_role_change_invalidates(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        member_user: User,
+        member_headers: dict,
+        test_organization: Organization,
+    ):
+        """A changed role is not served from the cache."""
+        user_id = member_user.id
+        await client.get("/api/v1/contacts", headers=member_headers)
+        assert await principal_cache.get_membership(user_id, test_organization.id)
+
+        response = await client.patch(
+            f"/api/v1/organizations/{test_organization.id}/members/{user_id}",
+            headers=auth_headers_with_org,
+            json={"role": "manager"},
+        )
+        assert response.status_code == 200
+        assert await principal_cache.get_membership(user_id, test_organization.id) is None
+
+        await client.get("/api/v1/contacts", headers=member_headers)
+        membership = await principal_cache.get_membership(user_id, test_organization.id)
+        assert membership.role == OrganizationRole.MANAGER
+
+
+    @pytest.mark.asyncio
+    async def test_read_before_commit_is_not_cached(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        member_user: User,
+        member_headers: dict,
+        test_organization: Organization,
+    ):
+        """A request between a role change and its commit can't keep the old role."""
+        user_id = member_user.id
+        async with TestSessionLocal() as session:
+            service = OrganizationService(
+                OrganizationRepository(session),
+                OrganizationMemberRepository(session),
+                UserRepository(session),
+            )
+            await service.update_member_role(
+                test_organization.id, user_id, OrganizationRole.MANAGER, test_user.id
+            )
+
+            # Concurrent request: still sees (and caches) the committed role
+            await client.get("/api/v1/contacts", headers=member_headers)
+            membership = await principal_cache.get_membership(user_id, test_organization.id)
+            assert membership.role == OrganizationRole.MEMBER
+
+            await session.commit()
+            await run_after_commit(session)
+
+        assert await principal_cache.get_membership(user_id, test_organization.id) is None
+        await client.get("/api/v1/contacts", headers=member_headers)
+        membership = await principal_cache.get_membership(user_id, test_organization.id)
+        assert membership.role == OrganizationRole.MANAGER
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_change_keeps_cache(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        member_user: User,
+        member_headers: dict,
+        test_organization: Organization,
+    ):
+        """Invalidations of a rolled back change are dropped."""
+        user_id = member_user.id
+        await client.get("/api/v1/contacts", headers=member_headers)
+        async with TestSessionLocal() as session:
+            service = OrganizationService(
+                OrganizationRepository(session),
+                OrganizationMemberRepository(session),
+                UserRepository(session),
+            )
+            await service.update_member_role(
+                test_organization.id, user_id, OrganizationRole.MANAGER, test_user.id
+            )
+            await session.rollback()
+            await session.commit()
+            await run_after_commit(session)
+
+        assert await principal_cache.get_membership(user_id, test_organization.id)
+
+
+class TestMembershipClaims:
+    """With TOKEN_MEMBERSHIP_CLAIMS, memberships are read from the token."""
+
+    @pytest.fixture(autouse=True)
+    def enable_claims(self, monkeypatch):
+        monkeypatch.setattr(settings, "TOKEN_MEMBERSHIP_CLAIMS", True)
+
+    @staticmethod
+    async def login(client: AsyncClient, organization: Organization) -> dict:
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "member@example.com", "password": "password123"},
+        )
+        assert response.status_code == 200
+        return {
+            "Authorization": f"Bearer {response.json()['access_token']}",
+            "X-Organization-Id": str(organization.id),
+        }
+
+    @staticmethod
+    def record_membership_queries() -> tuple[list[str], Callable]:
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM organization_members" in statement:
+                statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        return statements, record
+
+    @pytest.mark.asyncio
+    async def test_token_carries_roles(
+        self,
+        client: AsyncClient,
+        member_user: User,
+        test_organization: Organization,
+    ):
+        headers = await self.login(client, test_organization)
+        payload = decode_token(headers["Authorization"].split()[1])
+
+        assert payload["orgs"] == {str(test_organization.id): "member"}
+        assert payload["mv"] == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_skip_membership_lookup(
+        self,
+        client: AsyncClient,
+        member_user: User,
+        test_organization: Organization,
+    ):
+        headers = await self.login(client, test_organization)
+
+        statements, record = self.record_membership_queries()
+        try:
+            for _ in range(2):
+                response = await client.get("/api/v1/contacts", headers=headers)
+                assert response.status_code == 200
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+        assert statements == []
+        assert await principal_cache.get_membership(
+            member_user.id, test_organization.id
+        ) is None
+
+    @pytest.mark.asyncio
+    async def test_other_organization_denied_from_claims(
+        self,
+        client: AsyncClient,
+        member_user: User,
+        test_organization: Organization,
+        session,
+    ):
+        other = Organization(name="Other")
+        session.add(other)
+        await session.commit()
+        headers = await self.login(client, test_organization)
+
+        statements, record = self.record_membership_queries()
+        try:
+            response = await client.get(
+                "/api/v1/contacts",
+                headers={**headers, "X-Organization-Id": str(other.id)},
+            )
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+        assert response.status_code == 403
+        assert statements == []
+
+    @pytest.mark.asyncio
+    async def test_role_change_falls_back_to_database(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        member_user: User,
+        test_organization: Organization,
+    ):
+        """Claims issued before a role change are ignored."""
+        user_id = member_user.id
+        headers = await self.login(client, test_organization)
+
+        response = await client.patch(
+            f"/api/v1/organizations/{test_organization.id}/members/{user_id}",
+            headers=auth_headers_with_org,
+            json={"role": "manager"},
+        )
+        assert response.status_code == 200
+
+        assert (await client.get("/api/v1/contacts", headers=headers)).status_code == 200
+        membership = await principal_cache.get_membership(user_id, test_organization.id)
+        assert membership.role == OrganizationRole.MANAGER
+
+        # Tokens issued after the change carry the new role and version
+        payload = decode_token(
+            (await self.login(client, test_organization))["Authorization"].split()[1]
+        )
+        assert payload["orgs"] == {str(test_organization.id): "manager"}
+        assert payload["mv"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_before_commit_does_not_keep_old_version(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        member_user: User,
+        test_organization: Organization,
+    ):
+        """A request between a role change and its commit can't keep old claims valid."""
+        user_id = member_user.id
+        headers = await self.login(client, test_organization)
+        async with TestSessionLocal() as session:
+            service = OrganizationService(
+                OrganizationRepository(session),
+                OrganizationMemberRepository(session),
+                UserRepository(session),
+            )
+            await service.update_member_role(
+                test_organization.id, user_id, OrganizationRole.MANAGER, test_user.id
+            )
+
+            # Concurrent request: caches the user at the committed version
+            await client.get("/api/v1/contacts", headers=headers)
+            assert (await principal_cache.get_user(user_id)).membership_version == 0
+
+            await session.commit()
+            await run_after_commit(session)
+
+        await client.get("/api/v1/contacts", headers=headers)
+        assert (await principal_cache.get_user(user_id)).membership_version == 1
+        membership = await principal_cache.get_membership(user_id, test_organization.id)
+        assert membership.role == OrganizationRole.MANAGER
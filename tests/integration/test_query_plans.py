@@ -0,0 +1,331 @@
+"""
+Query plan checks for repository queries.
+
+Every repository read is executed against a seeded dataset and each
+captured statement is re-run under EXPLAIN with ``enable_seqscan`` off.
+With sequential scans disabled the planner still picks one when no index
+can serve the query, so a ``Seq Scan`` node means a missing index.
+"""
+
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import Cursor
+from app.models import (
+    Activity,
+    Contact,
+    Deal,
+    Organization,
+    OrganizationMember,
+    Task,
+    User,
+)
+from app.models.enums import ActivityType, DealStage, DealStatus, OrganizationRole
+from app.repositories import (
+    ActivityRepository,
+    ContactRepository,
+    DealRepository,
+    DealStatsRepository,
+    OrganizationMemberRepository,
+    OrganizationRepository,
+    TaskRepository,
+    UserRepository,
+)
+from app.repositories.contact_search import get_contact_search
+from tests.conftest import test_engine
+
+DEALS_PER_ORG = 2000
+CONTACTS_PER_ORG = 200
+
+
+@dataclass
+class Seed:
+    """Ids of seeded rows used as query arguments."""
+
+    organization_id: int
+    user_id: int
+    user_email: str
+    contact_id: int
+    deal_id: int
+    task_id: int
+
+
+@pytest_asyncio.fixture
+async def seed(session: AsyncSession) -> Seed:
+    """Two organizations with enough deals, contacts and tasks to plan on."""
+    now = datetime.now(UTC)
+    user = User(email="plans@example.com", hashed_password="x", name="Planner")
+    orgs = [Organization(name="Plans A"), Organization(name="Plans B")]
+    session.add_all([user, *orgs])
+    await session.flush()
+    session.add_all(
+        OrganizationMember(
+            organization_id=org.id, user_id=user.id, role=OrganizationRole.OWNER
+        )
+        for org in orgs
+    )
+
+    statuses = list(DealStatus)
+    stages = list(DealStage)
+    for org in orgs:
+        contact_ids = (await session.scalars(
+            insert(Contact).returning(Contact.id),
+            [
+                {
+                    "organization_id": org.id,
+                    "owner_id": user.id,
+                    "name": f"Contact {i}",
+                    "email": f"contact{i}@example.com",
+                }
+                for i in range(CONTACTS_PER_ORG)
+            ],
+        )).all()
+        deal_ids = (await session.scalars(
+            insert(Deal).returning(Deal.id),
+            [
+                {
+                    "organization_id": org.id,
+                    "owner_id": user.id,
+                    "contact_id": contact_ids[i % len(contact_ids)],
+                    "title": f"Deal {i}",
+                    "amount": Decimal(i * 10),
+                    "status": statuses[i % len(statuses)],
+                    "stage": stages[i % len(stages)],
+                    "created_at": now - timedelta(hours=i),
+                }
+                for i in range(DEALS_PER_ORG)
+            ],
+        )).all()
+        task_ids = (await session.scalars(insert(Task).returning(Task.id), [
+            {
+                "deal_id": deal_ids[i % len(deal_ids)],
+                "title": f"Task {i}",
+                "due_date": date.today() + timedelta(days=i % 30),
+                "is_done": i % 3 == 0,
+            }
+            for i in range(DEALS_PER_ORG)
+        ])).all()
+        await session.execute(insert(Activity), [
+            {
+                "deal_id": deal_ids[i % len(deal_ids)],
+                "organization_id": org.id,
+                "author_id": user.id,
+                "type": ActivityType.COMMENT,
+                "payload": {"text": "note"},
+            }
+            for i in range(DEALS_PER_ORG)
+        ])
+    await session.commit()
+
+    async with test_engine.connect() as conn:
+        await conn.execute(text("ANALYZE"))
+
+    return Seed(
+        organization_id=orgs[0].id,
+        user_id=user.id,
+        user_email=user.email,
+        contact_id=contact_ids[0],
+        deal_id=deal_ids[0],
+        task_id=task_ids[0],
+    )
+
+
+async def drain(rows: AsyncIterator[Any]) -> None:
+    """Consume a streamed result."""
+    async for _ in rows:
+        pass
+
+
+QueryFactory = Callable[[AsyncSession, Seed], Awaitable[Any]]
+
+# Repository reads that must be served by an index
+QUERIES: dict[str, QueryFactory] = {
+    "deals.list": lambda s, d: DealRepository(s).get_by_organization(d.organization_id),
+    "deals.list_asc": lambda s, d: DealRepository(s).get_by_organization(
+        d.organization_id, order="asc"
+    ),
+    "deals.list_by_updated_at": lambda s, d: DealRepository(s).get_by_organization(
+        d.organization_id, order_by="updated_at"
+    ),
+    "deals.list_by_amount": lambda s, d: DealRepository(s).get_by_organization(
+        d.organization_id, order_by="amount", min_amount=Decimal("100")
+    ),
+    "deals.list_by_status": lambda s, d: DealRepository(s).get_by_organization(
+        d.organization_id, status=[DealStatus.WON]
+    ),
+    "deals.list_by_owner": lambda s, d: DealRepository(s).get_by_organization(
+        d.organization_id, owner_id=d.user_id
+    ),
+    "deals.list_by_stage": lambda s, d: DealRepository(s).get_by_organization(
+        d.organization_id, stage=DealStage.PROPOSAL
+    ),
+    "deals.list_after_cursor": lambda s, d: DealRepository(s).get_by_organization(
+        d.organization_id,
+        cursor=Cursor("created_at", "desc", datetime.now(UTC), d.deal_id),
+    ),
+    "deals.page_with_total": lambda s, d: DealRepository(
+        s
+    ).get_page_by_organization(d.organization_id, status=[DealStatus.WON]),
+    "deals.export": lambda s, d: drain(DealRepository(s).stream_by_organization(
+        d.organization_id, status=[DealStatus.WON]
+    )),
+    "deals.count": lambda s, d: DealRepository(s).count_by_organization(
+        d.organization_id
+    ),
+    "deals.count_by_status": lambda s, d: DealRepository(s).count_by_organization(
+        d.organization_id, status=[DealStatus.NEW]
+    ),
+    "deals.count_created_since": lambda s, d: DealRepository(s).count_created_since(
+        d.organization_id, datetime.now(UTC) - timedelta(days=7)
+    ),
+    "deals.summary": lambda s, d: DealRepository(s).get_summary(
+        d.organization_id, datetime.now(UTC) - timedelta(days=30)
+    ),
+    "deals.funnel": lambda s, d: DealRepository(s).get_funnel_data(d.organization_id),
+    "deals.owner_id": lambda s, d: DealRepository(s).get_owner_id_in_organization(
+        d.deal_id, d.organization_id
+    ),
+    "deals.with_relations": lambda s, d: DealRepository(s).get_with_relations(
+        d.deal_id
+    ),
+    "deal_stats.by_organization": lambda s, d: DealStatsRepository(
+        s
+    ).get_by_organization(d.organization_id),
+    "contacts.list": lambda s, d: ContactRepository(s).get_by_organization(
+        d.organization_id
+    ),
+    "contacts.list_by_owner": lambda s, d: ContactRepository(s).get_by_organization(
+        d.organization_id, owner_id=d.user_id
+    ),
+    "contacts.search_fulltext": lambda s, d: ContactRepository(
+        s, search=get_contact_search("fulltext")
+    ).get_by_organization(d.organization_id, search="contact 1"),
+    "contacts.page_with_total": lambda s, d: ContactRepository(
+        s
+    ).get_page_by_organization(d.organization_id, owner_id=d.user_id),
+    "contacts.export": lambda s, d: drain(ContactRepository(
+        s
+    ).stream_by_organization(d.organization_id)),
+    "contacts.count": lambda s, d: ContactRepository(s).count_by_organization(
+        d.organization_id
+    ),
+    "contacts.has_deals": lambda s, d: ContactRepository(s).has_deals(d.contact_id),
+    "tasks.with_owner": lambda s, d: TaskRepository(
+        s
+    ).get_with_owner_in_organization(d.task_id, d.organization_id),
+    "tasks.by_deal": lambda s, d: TaskRepository(s).get_by_deal(d.deal_id),
+    "tasks.open_by_deal": lambda s, d: TaskRepository(s).get_by_deal(
+        d.deal_id, only_open=True
+    ),
+    "tasks.by_organization": lambda s, d: TaskRepository(s).get_by_organization(
+        d.organization_id
+    ),
+    "tasks.open_by_organization": lambda s, d: TaskRepository(s).get_by_organization(
+        d.organization_id, only_open=True, due_before=date.today()
+    ),
+    "tasks.count_open_by_deal": lambda s, d: TaskRepository(s).count_by_deal(
+        d.deal_id, only_open=True
+    ),
+    "activities.by_deal": lambda s, d: ActivityRepository(s).get_by_deal(d.deal_id),
+    "activities.by_deal_in_organization": lambda s, d: ActivityRepository(
+        s
+    ).get_by_deal_in_organization(d.deal_id, d.organization_id),
+    "activities.by_deal_after_cursor": lambda s, d: ActivityRepository(
+        s
+    ).get_by_deal_in_organization(d.deal_id, d.organization_id, cursor=Cursor(
+        order_by="created_at", order="desc", value=datetime.now(UTC), id=0
+    )),
+    "activities.by_organization": lambda s, d: ActivityRepository(
+        s
+    ).get_by_organization(d.organization_id),
+    "activities.by_organization_filtered": lambda s, d: ActivityRepository(
+        s
+    ).get_by_organization(
+        d.organization_id,
+        type=ActivityType.COMMENT,
+        author_id=d.user_id,
+        since=datetime.now(UTC) - timedelta(days=1),
+    ),
+    "activities.export": lambda s, d: drain(ActivityRepository(
+        s
+    ).stream_by_organization(d.organization_id)),
+    "users.by_email": lambda s, d: UserRepository(s).get_by_email(d.user_email),
+    "organizations.by_user": lambda s, d: OrganizationRepository(
+        s
+    ).get_user_organizations(d.user_id),
+    "organizations.membership": lambda s, d: OrganizationMemberRepository(
+        s
+    ).get_membership(d.organization_id, d.user_id),
+}
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    """Collect relations read with a sequential scan anywhere in a plan."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+async def capture_statements(
+    session: AsyncSession,
+    run: Callable[[], Awaitable[Any]],
+) -> list[tuple[str, Any]]:
+    """Run a repository call and return the SELECT statements it executed."""
+    statements: list[tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    sync_engine = test_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        await run()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+class TestQueryPlans:
+    """Every repository query is index-backed."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", list(QUERIES))
+    async def test_no_sequential_scans(
+        self,
+        session: AsyncSession,
+        seed: Seed,
+        name: str,
+    ):
+        """Query doesn't need a sequential scan on a seeded dataset."""
+        statements = await capture_statements(
+            session, lambda: QUERIES[name](session, seed)
+        )
+        assert statements, f"{name} executed no SELECT"
+
+        conn = await session.connection()
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            seq_scans = find_seq_scans(plan[0]["Plan"])
+            assert not seq_scans, (
+                f"{name} scans {', '.join(seq_scans)} sequentially:\n{statement}"
+            )
+        await session.rollback()
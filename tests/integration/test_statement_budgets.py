@@ -0,0 +1,184 @@
+"""
+SQL statement budgets per route.
+
+Each route is called once with a cold principal cache (the worst case:
+user and membership are loaded from the database) and the statements it
+issues are counted. A route going over its budget usually means a new
+lazy load or a query repeated per row; raise the budget only when the
+extra statement is intended.
+"""
+
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principal_cache import principal_cache
+from app.db.session import get_session
+from app.main import app
+from app.models import Contact, Deal, Organization, Task
+from tests.conftest import get_test_session
+from tests.sql_recorder import SQLRecorder
+
+
+@pytest_asyncio.fixture
+async def ids(
+    session: AsyncSession,
+    test_organization: Organization,
+    test_contact: Contact,
+    test_deal: Deal,
+) -> dict[str, int]:
+    """Ids substituted into route paths."""
+    task = Task(
+        deal_id=test_deal.id,
+        title="Call",
+        due_date=date.today() + timedelta(days=1),
+    )
+    spare_contact = Contact(
+        organization_id=test_organization.id,
+        owner_id=test_contact.owner_id,
+        name="Spare",
+    )
+    session.add_all([task, spare_contact])
+    await session.commit()
+    return {
+        "contact_id": test_contact.id,
+        "spare_contact_id": spare_contact.id,
+        "deal_id": test_deal.id,
+        "task_id": task.id,
+    }
+
+
+def route(
+    method: str,
+    path: str,
+    body: dict[str, Any] | None,
+    budget: int,
+    *marks: pytest.MarkDecorator,
+) -> Any:
+    return pytest.param(method, path, body, budget, id=f"{method} {path}", marks=marks)
+
+
+# Paths and bodies are formatted with ids
+ROUTE_BUDGETS = [
+    route("GET", "/api/v1/organizations/me", None, 4),
+    route("GET", "/api/v1/contacts", None, 3),
+    route("POST", "/api/v1/contacts", {"name": "New"}, 3),
+    route("GET", "/api/v1/contacts/export", None, 3),
+    route("GET", "/api/v1/contacts/{contact_id}", None, 3),
+    route("PATCH", "/api/v1/contacts/{contact_id}", {"name": "Renamed"}, 4),
+    route("DELETE", "/api/v1/contacts/{spare_contact_id}", None, 6),
+    route("GET", "/api/v1/deals", None, 3),
+    route("POST", "/api/v1/deals", {"contact_id": "{contact_id}", "title": "New"}, 5),
+    route("GET", "/api/v1/deals/export", None, 3),
+    route("GET", "/api/v1/deals/{deal_id}", None, 3),
+    route("PATCH", "/api/v1/deals/{deal_id}", {"stage": "proposal"}, 6),
+    route("PATCH", "/api/v1/deals/bulk", {"ids": ["{deal_id}"], "stage": "proposal"}, 6),
+    route("DELETE", "/api/v1/deals/{deal_id}", None, 8),
+    route("GET", "/api/v1/tasks", None, 3),
+    route(
+        "POST",
+        "/api/v1/tasks",
+        {"deal_id": "{deal_id}", "title": "New", "due_date": "{tomorrow}"},
+        5,
+    ),
+    route("GET", "/api/v1/tasks/{task_id}", None, 3),
+    route("PATCH", "/api/v1/tasks/{task_id}", {"is_done": True}, 5),
+    route("DELETE", "/api/v1/tasks/{task_id}", None, 4),
+    route("GET", "/api/v1/deals/{deal_id}/activities", None, 4),
+    route(
+        "POST",
+        "/api/v1/deals/{deal_id}/activities",
+        {"type": "comment", "payload": {"text": "Hi"}},
+        4,
+    ),
+    route("GET", "/api/v1/activities", None, 4),
+    route("GET", "/api/v1/activities/export", None, 3),
+    route("GET", "/api/v1/analytics/deals/summary", None, 3),
+    route("GET", "/api/v1/analytics/deals/funnel", None, 3),
+]
+
+
+def fill(value: Any, ids: dict[str, Any]) -> Any:
+    """Substitute ``{name}`` placeholders in a path or body."""
+    if isinstance(value, dict):
+        return {key: fill(item, ids) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, ids) for item in value]
+    if isinstance(value, str) and value.startswith("{") and value.endswith("}"):
+        return ids[value[1:-1]]
+    if isinstance(value, str):
+        return value.format(**ids)
+    return value
+
+
+class TestStatementBudgets:
+    """Routes stay within their SQL statement budgets."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "method,path,body,budget",
+        ROUTE_BUDGETS,
+    )
+    async def test_route_budget(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder: SQLRecorder,
+        ids: dict[str, int],
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        budget: int,
+    ):
+        """Route issues at most its budgeted number of statements."""
+        values = {**ids, "tomorrow": (date.today() + timedelta(days=1)).isoformat()}
+        await principal_cache.clear()
+
+        response = await client.request(
+            method,
+            fill(path, values),
+            headers=auth_headers_with_org,
+            json=fill(body, values),
+        )
+
+        assert response.status_code < 400, response.text
+        sql_recorder.assert_max_queries(budget)
+
+
+class TestDependencyResolution:
+    """Shared dependencies are resolved once per request."""
+
+    @pytest.mark.asyncio
+    async def test_one_session_and_one_auth_lookup(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        sql_recorder: SQLRecorder,
+        test_deal: Deal,
+    ):
+        """Session, user and membership are shared by all dependencies."""
+        sessions = []
+
+        async def counting_session():
+            async for session in get_test_session():
+                sessions.append(session)
+                yield session
+
+        app.dependency_overrides[get_session] = counting_session
+        await principal_cache.clear()
+
+        response = await client.get(
+            f"/api/v1/deals/{test_deal.id}", headers=auth_headers_with_org
+        )
+        statements = [statement for statement, _ in sql_recorder.last.statements]
+
+        assert response.status_code == 200
+        assert len(sessions) == 1
+        assert sum("FROM users" in statement for statement in statements) == 1
+        assert sum(
+            "FROM organization_members" in statement for statement in statements
+        ) == 1
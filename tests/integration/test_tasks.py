@@ -279,4 +279,49 @@ class TestDeleteTask:
             headers=auth_headers_with_org,
         )
 
-        assert response.status_code == 204
\ No newline at end of file
+        assert response.status_code == 204
+
+class TestTaskTenantScope:
+    """Tasks of other organizations are not reachable."""
+
+    @pytest.mark.asyncio
+    async def test_foreign_task_not_found(
+        self,
+        client: AsyncClient,
+        auth_headers_with_org: dict,
+        session,
+        test_user,
+    ):
+        """Get, update and delete of another organization's task return 404."""
+        from app.models import Contact, Deal, Organization
+
+        other_org = Organization(name="Other")
+        session.add(other_org)
+        await session.flush()
+        contact = Contact(
+            organization_id=other_org.id, owner_id=test_user.id, name="Foreign"
+        )
+        session.add(contact)
+        await session.flush()
+        deal = Deal(
+            organization_id=other_org.id,
+            owner_id=test_user.id,
+            contact_id=contact.id,
+            title="Foreign deal",
+        )
+        session.add(deal)
+        await session.flush()
+        task = Task(deal_id=deal.id, title="Foreign task")
+        session.add(task)
+        await session.commit()
+
+        url = f"/api/v1/tasks/{task.id}"
+        responses = [
+            await client.get(url, headers=auth_headers_with_org),
+            await client.patch(url, headers=auth_headers_with_org, json={"is_done": True}),
+            await client.delete(url, headers=auth_headers_with_org),
+        ]
+
+        assert [response.status_code for response in responses] == [404, 404, 404]
+        await session.refresh(task)
+        assert task.is_done is False
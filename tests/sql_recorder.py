@@ -0,0 +1,164 @@
+"""
+Per-request SQL recording for integration tests.
+
+``SQLRecorder`` listens to ``before_cursor_execute`` on the test engine and
+attributes every statement to the HTTP request being served (tests issue
+requests one at a time). It is used by the ``client`` fixture, so every
+request of every integration test is checked for:
+
+- repeated identical queries: the same SQL with the same parameters run
+  more than once in one request, which is always redundant (opt out with
+  ``@pytest.mark.allow_repeated_queries``);
+- N+1 patterns: the same SELECT run with different parameters
+  ``N_PLUS_ONE_THRESHOLD`` times or more in one request;
+- ceilings set with ``@pytest.mark.max_queries(n)`` or asserted with
+  ``SQLRecorder.assert_max_queries``.
+"""
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Same SELECT this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = 3
+
+
+@dataclass
+class RequestQueries:
+    """Statements issued while serving one request."""
+
+    method: str
+    path: str
+    route: str | None = None
+    statements: list[tuple[str, Any]] = field(default_factory=list)
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.method} {self.route or self.path}"
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def duplicates(self) -> dict[str, int]:
+        """SELECTs run more than once with identical parameters."""
+        counts = Counter(
+            (statement, repr(parameters))
+            for statement, parameters in self.statements
+            if _is_select(statement)
+        )
+        return {
+            statement: count for (statement, _), count in counts.items() if count > 1
+        }
+
+    def n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """SELECTs run with at least threshold different parameter sets."""
+        variants: dict[str, set[str]] = {}
+        for statement, parameters in self.statements:
+            if _is_select(statement):
+                variants.setdefault(statement, set()).add(repr(parameters))
+        return {
+            statement: len(params)
+            for statement, params in variants.items()
+            if len(params) >= threshold
+        }
+
+    def describe(self) -> str:
+        return f"{self.endpoint} ran {len(self)} statements:\n" + "\n".join(
+            statement for statement, _ in self.statements
+        )
+
+
+def _is_select(statement: str) -> bool:
+    return statement.lstrip().upper().startswith(("SELECT", "WITH"))
+
+
+class SQLRecorder:
+    """Records SQL statements of the test engine, grouped by request."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.requests: list[RequestQueries] = []
+        self.outside: list[tuple[str, Any]] = []
+        self._current: RequestQueries | None = None
+        self._depth = 0
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current is not None:
+            self._current.statements.append((statement, parameters))
+        else:
+            self.outside.append((statement, parameters))
+
+    def start(self) -> None:
+        if self._depth == 0:
+            event.listen(self.engine.sync_engine, "before_cursor_execute", self._record)
+        self._depth += 1
+
+    def stop(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            event.remove(self.engine.sync_engine, "before_cursor_execute", self._record)
+
+    @contextmanager
+    def record(self) -> Iterator[list[tuple[str, Any]]]:
+        """Record statements issued outside requests inside the block."""
+        self.outside = []
+        self.start()
+        try:
+            yield self.outside
+        finally:
+            self.stop()
+
+    def wrap(self, app: ASGIApp) -> ASGIApp:
+        """ASGI app that attributes statements to the request being served."""
+
+        async def recording_app(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != "http":
+                await app(scope, receive, send)
+                return
+            request = RequestQueries(scope["method"], scope["path"])
+            self.requests.append(request)
+            self._current = request
+            try:
+                await app(scope, receive, send)
+            finally:
+                self._current = None
+                route = scope.get("route")
+                request.route = getattr(route, "path", None)
+
+        return recording_app
+
+    @property
+    def last(self) -> RequestQueries:
+        """The most recent request."""
+        return self.requests[-1]
+
+    def reset(self) -> None:
+        self.requests = []
+
+    def assert_max_queries(self, limit: int, request: RequestQueries | None = None) -> None:
+        """Fail if the request (default: the last one) ran over limit statements."""
+        request = request or self.last
+        assert len(request) <= limit, f"over budget of {limit}: " + request.describe()
+
+    def problems(self, *, allow_repeated: bool = False, limit: int | None = None) -> list[str]:
+        """Describe requests with repeated queries, N+1 patterns or over limit."""
+        found = []
+        for request in self.requests:
+            if not allow_repeated:
+                for statement, count in request.duplicates().items():
+                    found.append(
+                        f"{request.endpoint} ran the same query {count} times:\n{statement}"
+                    )
+                for statement, count in request.n_plus_one().items():
+                    found.append(
+                        f"{request.endpoint} ran a query {count} times (N+1?):\n{statement}"
+                    )
+            if limit is not None and len(request) > limit:
+                found.append(f"over budget of {limit}: " + request.describe())
+        return found
@@ -0,0 +1,184 @@
+"""Tests for analytics cache stampede protection."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, SimpleCache
+from app.services import analytics
+from app.services.analytics import AnalyticsService
+
+SUMMARY = {
+    "by_status": {"new": {"count": 1, "total_amount": 100}},
+    "average_won_amount": 0,
+    "new_deals_count": 1,
+}
+
+
+@pytest.fixture(autouse=True)
+def session_repos(monkeypatch):
+    """Repositories built on a fake session are the ones it carries."""
+    monkeypatch.setattr(analytics, "DealRepository", lambda session: session.deal_repo)
+    monkeypatch.setattr(analytics, "DealStatsRepository", lambda session: AsyncMock())
+
+
+def make_service(cache, deal_repo=None, **kwargs) -> AnalyticsService:
+    deal_repo = deal_repo or AsyncMock()
+    sessions = []
+
+    @asynccontextmanager
+    async def session_factory():
+        # Cache fills run on sessions of their own, not the request's
+        session = AsyncMock(deal_repo=deal_repo)
+        sessions.append(session)
+        yield session
+
+    service = AnalyticsService(
+        deal_repo=AsyncMock(),
+        stats_repo=AsyncMock(),
+        session=AsyncMock(),
+        cache=cache,
+        use_rollup=False,
+        session_factory=session_factory,
+        **kwargs,
+    )
+    service.sessions = sessions
+    return service
+
+
+def slow_summary_repo(delay: float = 0.05) -> AsyncMock:
+    """Deal repo whose summary query takes a while."""
+    async def get_summary(*args):
+        await asyncio.sleep(delay)
+        return SUMMARY
+
+    repo = AsyncMock()
+    repo.get_summary.side_effect = get_summary
+    return repo
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent cache misses."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self):
+        """Concurrent requests for a missing key share one query."""
+        repo = slow_summary_repo()
+        service = make_service(MemoryCacheBackend(SimpleCache()), repo)
+
+        results = await asyncio.gather(
+            *(service.get_deals_summary(1, 30) for _ in range(20))
+        )
+
+        assert repo.get_summary.await_count == 1
+        assert all(r["new_deals_last_n_days"]["count"] == 1 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_workers_sharing_redis_compute_once(self):
+        """A worker missing a key waits for the worker holding its lock."""
+        server = FakeServer()
+        repo_a, repo_b = slow_summary_repo(0.2), slow_summary_repo(0.2)
+        # Fill directly: the in-process single-flight would otherwise
+        # coalesce the two "workers" before they reach Redis
+        service_a = make_service(RedisCacheBackend(FakeRedis(server=server)), repo_a)
+        service_b = make_service(RedisCacheBackend(FakeRedis(server=server)), repo_b)
+
+        first = asyncio.create_task(service_a._fill_detached(
+            "summary:1:30",
+            lambda s: s._compute_summary(1, 30),
+        ))
+        await asyncio.sleep(0.05)
+        second = await service_b._fill_detached(
+            "summary:1:30",
+            lambda s: s._compute_summary(1, 30),
+        )
+        await first
+
+        assert repo_a.get_summary.await_count == 1
+        assert repo_b.get_summary.await_count == 0
+        assert second["new_deals_last_n_days"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_first_caller_does_not_fail_waiters(self):
+        """The shared computation doesn't run on the first caller's session."""
+        repo = slow_summary_repo(0.1)
+        service = make_service(MemoryCacheBackend(SimpleCache()), repo)
+
+        first = asyncio.create_task(service.get_deals_summary(1, 30))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(service.get_deals_summary(1, 30))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        result = await second
+        assert result["new_deals_last_n_days"]["count"] == 1
+        assert repo.get_summary.await_count == 1
+        assert len(service.sessions) == 1
+        service.session.execute.assert_not_called()
+
+
+class TestStaleWhileRevalidate:
+    """Tests for serving stale entries while refreshing."""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed_once(self):
+        """Stale value is returned immediately; one refresh replaces it."""
+        cache = MemoryCacheBackend(SimpleCache())
+        await cache.set(
+            "summary:1:30",
+            {"value": {"stale": True}, "fresh_until": time.time() - 1},
+            ttl=60,
+        )
+        refresh_repo = slow_summary_repo()
+        service = make_service(cache, refresh_repo, stale_ttl=60)
+
+        results = await asyncio.gather(
+            *(service.get_deals_summary(1, 30) for _ in range(5))
+        )
+        assert all(r == {"stale": True} for r in results)
+
+        await asyncio.gather(*analytics._refresh_tasks)
+
+        assert refresh_repo.get_summary.await_count == 1
+        fresh = await service.get_deals_summary(1, 30)
+        assert fresh["new_deals_last_n_days"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_miss_without_swr(self):
+        """With stale serving off, an expired entry is recomputed inline."""
+        cache = MemoryCacheBackend(SimpleCache())
+        await cache.set(
+            "summary:1:30",
+            {"value": {"stale": True}, "fresh_until": time.time() - 1},
+            ttl=60,
+        )
+        repo = slow_summary_repo(0)
+        service = make_service(cache, repo, stale_ttl=0)
+
+        result = await service.get_deals_summary(1, 30)
+
+        assert repo.get_summary.await_count == 1
+        assert result["new_deals_last_n_days"]["count"] == 1
+
+
+class TestCacheOutage:
+    """Tests for computing without an unavailable cache."""
+
+    @pytest.mark.asyncio
+    async def test_redis_down_computes_uncached(self):
+        """With Redis unreachable, values are still computed."""
+        server = FakeServer()
+        server.connected = False
+        repo = slow_summary_repo(0)
+        service = make_service(RedisCacheBackend(FakeRedis(server=server)), repo)
+
+        summary = await service.get_deals_summary(1, 30)
+        await service.get_deals_summary(1, 30)
+
+        assert summary["new_deals_last_n_days"]["count"] == 1
+        assert repo.get_summary.await_count == 2
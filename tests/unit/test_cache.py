@@ -0,0 +1,306 @@
+"""Tests for analytics cache backends."""
+
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.core.cache import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    SimpleCache,
+    TieredCacheBackend,
+    dumps,
+    loads,
+)
+
+
+@pytest.fixture
+def redis_server():
+    """Shared fake Redis server (one per test)."""
+    return FakeServer()
+
+
+def make_redis(server: FakeServer) -> FakeRedis:
+    return FakeRedis(server=server)
+
+
+class TestSimpleCache:
+    """Tests for bounded in-memory LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Oldest unused entry is evicted when entry limit is exceeded."""
+        cache = SimpleCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_budget(self):
+        """Entries are evicted to stay within the byte budget."""
+        cache = SimpleCache(max_bytes=2_000)
+
+        for i in range(50):
+            cache.set(f"k:{i}", {"payload": "x" * 100})
+
+        assert 0 < len(cache) < 50
+        assert cache.stats()["bytes"] <= 2_000
+
+    def test_sweep_removes_expired(self, monkeypatch):
+        """Sweep drops expired entries that are never read again."""
+        cache = SimpleCache(default_ttl=10)
+        cache.set("old", 1)
+        cache.set("fresh", 2, ttl=100)
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 50)
+
+        assert cache.sweep() == 1
+        assert len(cache) == 1
+        assert cache.get("fresh") == 2
+
+    def test_invalidate_prefix_uses_segments(self):
+        """Segment prefix invalidation doesn't touch other organizations."""
+        cache = SimpleCache()
+        cache.set("summary:5:30", 1)
+        cache.set("summary:5:7", 1)
+        cache.set("summary:50:30", 2)
+
+        cache.invalidate_prefix("summary:5:")
+
+        assert cache.get("summary:5:30") is None
+        assert cache.get("summary:5:7") is None
+        assert cache.get("summary:50:30") == 2
+        assert cache._prefix_index.get("summary:5:") is None
+
+    def test_hit_miss_counters(self):
+        """Hits and misses are counted."""
+        cache = SimpleCache()
+        cache.set("a", 1)
+
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+
+class TestSerialization:
+    """Tests for compact cache serialization."""
+
+    def test_roundtrip_small_value(self):
+        """Small values are stored as plain JSON."""
+        value = {"count": 1, "total_amount": 10.5}
+
+        data = dumps(value)
+
+        assert data.startswith(b"j")
+        assert loads(data) == value
+
+    def test_large_value_is_compressed(self):
+        """Large values are zlib-compressed."""
+        value = {"stages": {f"stage_{i}": {"new": i} for i in range(200)}}
+
+        data = dumps(value)
+
+        assert data.startswith(b"z")
+        assert loads(data) == value
+
+
+class TestMemoryBackend:
+    """Tests for process-local backend."""
+
+    @pytest.mark.asyncio
+    async def test_get_set_invalidate(self):
+        """Values can be set, read and invalidated by prefix."""
+        cache = MemoryCacheBackend(SimpleCache(default_ttl=60))
+
+        await cache.set("summary:1:30", {"a": 1})
+        await cache.set("summary:2:30", {"a": 2})
+        await cache.invalidate_prefix("summary:1:")
+
+        assert await cache.get("summary:1:30") is None
+        assert await cache.get("summary:2:30") == {"a": 2}
+
+
+class TestRedisBackend:
+    """Tests for shared Redis backend."""
+
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, redis_server):
+        """Values written by one worker are visible to another."""
+        worker_a = RedisCacheBackend(make_redis(redis_server), namespace="t:")
+        worker_b = RedisCacheBackend(make_redis(redis_server), namespace="t:")
+
+        await worker_a.set("funnel:1", {"stages": {}}, ttl=30)
+
+        assert await worker_b.get("funnel:1") == {"stages": {}}
+
+    @pytest.mark.asyncio
+    async def test_ttl_is_applied(self, redis_server):
+        """Keys are written with expiry."""
+        redis = make_redis(redis_server)
+        cache = RedisCacheBackend(redis, namespace="t:", default_ttl=60)
+
+        await cache.set("funnel:1", 1)
+
+        assert 0 < await redis.ttl("t:funnel:1") <= 60
+
+    @pytest.mark.asyncio
+    async def test_invalidate_prefix(self, redis_server):
+        """Prefix invalidation only removes matching keys in namespace."""
+        redis = make_redis(redis_server)
+        cache = RedisCacheBackend(redis, namespace="t:")
+        await redis.set("other:summary:1:30", b"x")
+
+        await cache.set("summary:1:30", 1)
+        await cache.set("summary:1:7", 1)
+        await cache.set("summary:2:30", 2)
+        await cache.invalidate_prefix("summary:1:")
+
+        assert await cache.get("summary:1:30") is None
+        assert await cache.get("summary:1:7") is None
+        assert await cache.get("summary:2:30") == 2
+        assert await redis.get("other:summary:1:30") == b"x"
+
+    @pytest.mark.asyncio
+    async def test_lock_is_exclusive_across_workers(self, redis_server):
+        """Only one worker holds a key's lock until it is released."""
+        worker_a = RedisCacheBackend(make_redis(redis_server), namespace="t:")
+        worker_b = RedisCacheBackend(make_redis(redis_server), namespace="t:")
+
+        token = await worker_a.acquire_lock("funnel:1", ttl=5)
+        assert token is not None
+        assert await worker_b.acquire_lock("funnel:1", ttl=5) is None
+
+        # A foreign token doesn't release someone else's lock
+        await worker_b.release_lock("funnel:1", "not-the-token")
+        assert await worker_b.acquire_lock("funnel:1", ttl=5) is None
+
+        await worker_a.release_lock("funnel:1", token)
+        assert await worker_b.acquire_lock("funnel:1", ttl=5) is not None
+
+    @pytest.mark.asyncio
+    async def test_release_after_expiry_keeps_new_holders_lock(self, redis_server):
+        """Releasing an expired lock doesn't delete the lock another worker took."""
+        worker_a = RedisCacheBackend(make_redis(redis_server), namespace="t:")
+        worker_b = RedisCacheBackend(make_redis(redis_server), namespace="t:")
+
+        token = await worker_a.acquire_lock("funnel:1", ttl=0.05)
+        await asyncio.sleep(0.1)
+        assert await worker_b.acquire_lock("funnel:1", ttl=5) is not None
+
+        await worker_a.release_lock("funnel:1", token)
+        assert await worker_a.acquire_lock("funnel:1", ttl=5) is None
+
+
+class TestTieredBackend:
+    """Tests for L1 + Redis L2 backend."""
+
+    @pytest.mark.asyncio
+    async def test_reads_through_l2(self, redis_server):
+        """A miss in L1 falls back to L2 and populates L1."""
+        worker_a = TieredCacheBackend(make_redis(redis_server), namespace="t:")
+        worker_b = TieredCacheBackend(make_redis(redis_server), namespace="t:")
+
+        await worker_a.set("funnel:1", {"x": 1})
+
+        assert worker_b.l1.get("funnel:1") is None
+        assert await worker_b.get("funnel:1") == {"x": 1}
+        assert worker_b.l1.get("funnel:1") == {"x": 1}
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers(self, redis_server):
+        """Invalidation on one worker clears L1 on the others via pub/sub."""
+        worker_a = TieredCacheBackend(make_redis(redis_server), namespace="t:")
+        worker_b = TieredCacheBackend(make_redis(redis_server), namespace="t:")
+        await worker_b.start()
+        try:
+            await worker_a.set("summary:1:30", {"x": 1})
+            assert await worker_b.get("summary:1:30") == {"x": 1}
+
+            await worker_a.invalidate_prefix("summary:1:")
+
+            for _ in range(50):
+                if worker_b.l1.get("summary:1:30") is None:
+                    break
+                await asyncio.sleep(0.01)
+            assert worker_b.l1.get("summary:1:30") is None
+            assert await worker_b.get("summary:1:30") is None
+        finally:
+            await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_listener_resubscribes_and_clears_l1(self, redis_server):
+        """A dropped connection is resubscribed and possibly stale L1 is dropped."""
+        worker_a = TieredCacheBackend(make_redis(redis_server), namespace="t:")
+        worker_b = TieredCacheBackend(
+            make_redis(redis_server), namespace="t:", reconnect_delay=0.2
+        )
+
+        # The first subscription's connection drops when killed
+        killed = asyncio.Event()
+        pubsub = worker_b.l2.redis.pubsub
+
+        def dropping_pubsub():
+            subscription = pubsub()
+            if not worker_b.subscriptions:
+                async def listen():
+                    await killed.wait()
+                    raise ConnectionError("Connection closed by server")
+                    yield
+                subscription.listen = listen
+            return subscription
+
+        worker_b.l2.redis.pubsub = dropping_pubsub
+        await worker_b.start()
+        try:
+            await worker_a.set("summary:1:30", {"x": 1})
+            assert await worker_b.get("summary:1:30") == {"x": 1}
+            killed.set()
+            await asyncio.sleep(0.05)
+            assert worker_b.stats()["listener_connected"] == 0
+
+            # Invalidated while disconnected: the broadcast is missed
+            await worker_a.invalidate_prefix("summary:1:")
+            assert worker_b.l1.get("summary:1:30") == {"x": 1}
+
+            for _ in range(100):
+                if worker_b.stats()["listener_connected"]:
+                    break
+                await asyncio.sleep(0.01)
+            assert worker_b.l1.get("summary:1:30") is None
+            assert worker_b.stats()["listener_disconnects"] == 1
+
+            # Later broadcasts arrive on the new subscription
+            await worker_a.set("summary:2:30", {"x": 2})
+            assert await worker_b.get("summary:2:30") == {"x": 2}
+            await worker_a.delete("summary:2:30")
+            for _ in range(50):
+                if worker_b.l1.get("summary:2:30") is None:
+                    break
+                await asyncio.sleep(0.01)
+            assert worker_b.l1.get("summary:2:30") is None
+        finally:
+            await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_start_fails_when_redis_unreachable(self, redis_server):
+        """Startup fails after start_timeout instead of waiting forever."""
+        redis_server.connected = False
+        worker = TieredCacheBackend(
+            make_redis(redis_server), namespace="t:", start_timeout=0.2
+        )
+
+        with pytest.raises(RuntimeError, match="couldn't subscribe"):
+            await worker.start()
+        assert worker._listener is None
@@ -0,0 +1,84 @@
+"""Tests for the application engine options and pool metrics."""
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.pool import InstrumentedPool, pool_stats
+from app.db.session import engine_options
+from tests.conftest import TEST_DATABASE_URL
+
+
+class TestEngineOptions:
+    """Tests for engine_options."""
+
+    def test_pool_settings(self):
+        options = engine_options(settings.model_copy(update={
+            "DB_POOL_SIZE": 7,
+            "DB_POOL_TIMEOUT": 2.5,
+            "DB_POOL_RECYCLE": 600,
+            "DB_POOL_PRE_PING": True,
+            "DB_STATEMENT_CACHE_SIZE": 250,
+        }))
+
+        assert options["poolclass"] is InstrumentedPool
+        assert options["pool_size"] == 7
+        assert options["pool_timeout"] == 2.5
+        assert options["pool_recycle"] == 600
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"] == {"prepared_statement_cache_size": 250}
+
+    def test_pgbouncer_disables_statement_caches(self):
+        options = engine_options(settings.model_copy(update={"DB_PGBOUNCER": True}))
+        connect_args = options["connect_args"]
+
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        name = connect_args["prepared_statement_name_func"]
+        assert name() != name()
+
+
+class TestInstrumentedPool:
+    """Tests for InstrumentedPool."""
+
+    @pytest.mark.asyncio
+    async def test_checkout_metrics(self):
+        """Checkouts, saturation and timeouts are counted across dispose."""
+        engine = create_async_engine(
+            TEST_DATABASE_URL,
+            poolclass=InstrumentedPool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                stats = engine.pool.stats()
+                assert stats["checked_out"] == 1
+                assert stats["saturation"] == 1.0
+
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+
+            await engine.dispose()
+            stats = engine.pool.stats()
+            assert stats["checked_out"] == 0
+            assert stats["checkouts"] == 1
+            assert stats["timeouts"] == 1
+            assert stats["peak_checked_out"] == 1
+            assert stats["wait_ms_max"] >= stats["wait_ms_avg"] > 0
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_of_other_pools_are_empty(self):
+        """Engines without the instrumented pool (e.g. NullPool) report nothing."""
+        engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+        try:
+            assert pool_stats(engine.pool) == {}
+        finally:
+            await engine.dispose()
@@ -25,6 +25,8 @@ class TestDealStatusValidation:
             deal_repo=AsyncMock(),
             contact_repo=AsyncMock(),
             activity_repo=AsyncMock(),
+            stats_repo=AsyncMock(),
+            member_repo=AsyncMock(),
         )
 
     @pytest.fixture
@@ -111,6 +113,8 @@ class TestDealStageValidation:
             deal_repo=AsyncMock(),
             contact_repo=AsyncMock(),
             activity_repo=AsyncMock(),
+            stats_repo=AsyncMock(),
+            member_repo=AsyncMock(),
         )
 
     @pytest.fixture
@@ -0,0 +1,76 @@
+"""Tests for export serializers."""
+
+import csv
+import io
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.core import exports
+from app.core.exports import stream_csv, stream_ndjson
+from app.models.enums import DealStatus
+
+COLUMNS = ["id", "amount", "status", "payload", "created_at"]
+
+
+async def rows(count: int):
+    for i in range(count):
+        yield {
+            "id": i,
+            "amount": Decimal("10.50"),
+            "status": DealStatus.WON,
+            "payload": {"text": "a, \"quoted\"\nnote"} if i % 2 else None,
+            "created_at": datetime(2024, 1, 1, tzinfo=UTC),
+        }
+
+
+async def collect(chunks) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+class TestCsvExport:
+    """Tests for CSV serialization."""
+
+    @pytest.mark.asyncio
+    async def test_values_round_trip(self):
+        """Header comes first; enums, decimals, dates and JSON are text."""
+        body = b"".join(await collect(stream_csv(COLUMNS, rows(2)))).decode()
+        records = list(csv.reader(io.StringIO(body)))
+
+        assert records[0] == COLUMNS
+        assert records[1] == ["0", "10.50", "won", "", "2024-01-01T00:00:00+00:00"]
+        assert json.loads(records[2][3]) == {"text": "a, \"quoted\"\nnote"}
+
+    @pytest.mark.asyncio
+    async def test_output_is_chunked(self, monkeypatch):
+        """Rows are flushed in pieces instead of one buffer."""
+        monkeypatch.setattr(exports, "FLUSH_BYTES", 100)
+
+        chunks = await collect(stream_csv(COLUMNS, rows(20)))
+
+        assert len(chunks) > 5
+        assert len(b"".join(chunks).decode().splitlines()) > 20
+
+
+class TestNdjsonExport:
+    """Tests for NDJSON serialization."""
+
+    @pytest.mark.asyncio
+    async def test_one_object_per_line(self, monkeypatch):
+        """Each row is one JSON line, even across flushes."""
+        monkeypatch.setattr(exports, "FLUSH_BYTES", 100)
+
+        chunks = await collect(stream_ndjson(COLUMNS, rows(10)))
+        lines = b"".join(chunks).decode().splitlines()
+
+        assert len(chunks) > 1
+        assert [json.loads(line)["id"] for line in lines] == list(range(10))
+        assert json.loads(lines[1])["amount"] == "10.50"
+        assert json.loads(lines[1])["status"] == "won"
+
+    @pytest.mark.asyncio
+    async def test_no_rows(self):
+        """An empty export is an empty body."""
+        assert await collect(stream_ndjson(COLUMNS, rows(0))) == []
@@ -0,0 +1,66 @@
+"""Tests for bulk import body readers."""
+
+import pytest
+
+from app.core.exceptions import UnsupportedMediaTypeException
+from app.core.imports import read_csv, read_import_rows, read_ndjson
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+class TestNdjsonReader:
+    """Tests for NDJSON reader."""
+
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        """Records split across network chunks are reassembled."""
+        rows = await collect(read_ndjson(stream(b'{"name": "A"}\n{"na', b'me": "B"}')))
+
+        assert [row.data for row in rows] == [{"name": "A"}, {"name": "B"}]
+        assert [row.number for row in rows] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_bad_lines_are_reported(self):
+        """Malformed lines become row errors; later lines still parse."""
+        rows = await collect(read_ndjson(stream(b'{oops\n\n[1]\n{"name": "C"}\n')))
+
+        assert rows[0].data is None and rows[0].error.startswith("Invalid JSON")
+        assert rows[1].error == "Expected a JSON object"
+        assert rows[2].data == {"name": "C"}
+        assert rows[2].number == 3
+
+
+class TestCsvReader:
+    """Tests for CSV reader."""
+
+    @pytest.mark.asyncio
+    async def test_header_and_quoted_newlines(self):
+        """Header maps columns; quoted values may contain newlines."""
+        body = '﻿name,email\n"Smith, John",\n"Multi\nline",a@b.io\n'.encode()
+        rows = await collect(read_csv(stream(body[:20], body[20:])))
+
+        assert [row.data for row in rows] == [
+            {"name": "Smith, John", "email": None},
+            {"name": "Multi\nline", "email": "a@b.io"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_column_mismatch(self):
+        """Rows with a wrong number of columns are reported."""
+        rows = await collect(read_csv(stream(b"name,email\nonly-one\n")))
+
+        assert rows[0].data is None
+        assert rows[0].error == "Expected 2 columns, got 1"
+
+
+def test_unsupported_content_type():
+    """Only NDJSON and CSV bodies are accepted."""
+    with pytest.raises(UnsupportedMediaTypeException):
+        read_import_rows(stream(), "application/json")
@@ -0,0 +1,78 @@
+"""Tests for keyset pagination cursors."""
+
+import base64
+import json
+
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.core.exceptions import InvalidCursorException
+from app.core.pagination import Cursor
+
+
+def encode_payload(data: dict) -> str:
+    """Encode a hand-made cursor payload the way Cursor.encode does."""
+    raw = json.dumps(data).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            Decimal("1234.50"),
+            "proposal",
+            42,
+        ],
+    )
+    def test_roundtrip(self, value):
+        """Cursor survives encode/decode for every sort value type."""
+        cursor = Cursor(order_by="amount", order="asc", value=value, id=7)
+
+        decoded = Cursor.decode(cursor.encode())
+
+        assert decoded == cursor
+
+    def test_encoded_cursor_is_url_safe(self):
+        """Encoded cursor can be passed as a query parameter as-is."""
+        cursor = Cursor(order_by="title", order="desc", value="a/b+c?", id=1)
+
+        encoded = cursor.encode()
+
+        assert all(c.isalnum() or c in "-_" for c in encoded)
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            "",
+            "not-a-cursor",
+            "e30",
+            "!!!!",
+            encode_payload({"o": ["amount", "asc"], "v": ["dec", "abc"], "id": 1}),
+            encode_payload({"o": ["amount", "asc"], "v": ["dec", 1.5], "id": 1}),
+            encode_payload({"o": ["title", "asc"], "v": ["int", True], "id": 1}),
+            encode_payload({"o": ["title", "asc"], "v": ["str", "a"], "id": True}),
+        ],
+    )
+    def test_malformed_cursor_rejected(self, raw):
+        """Malformed cursor raises validation error."""
+        with pytest.raises(InvalidCursorException):
+            Cursor.decode(raw)
+
+    def test_ordering_mismatch_rejected(self):
+        """Cursor cannot be reused with a different ordering."""
+        cursor = Cursor(order_by="amount", order="asc", value=Decimal("1"), id=1)
+
+        with pytest.raises(InvalidCursorException):
+            cursor.check_ordering("amount", "desc", Decimal)
+
+    def test_value_type_mismatch_rejected(self):
+        """A cursor value of another type than the sort column is rejected."""
+        cursor = Cursor(order_by="created_at", order="desc", value="today", id=1)
+
+        with pytest.raises(InvalidCursorException):
+            cursor.check_ordering("created_at", "desc", datetime)
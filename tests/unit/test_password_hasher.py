@@ -0,0 +1,61 @@
+"""Tests for the password hashing pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.exceptions import PasswordHasherBusyException
+from app.core.password_hasher import PasswordHasher
+
+
+class TestPasswordHasher:
+    """Tests for PasswordHasher."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        """Hashes made on the pool verify on the pool."""
+        hasher = PasswordHasher(workers=2, max_waiting=2, queue_timeout=5)
+
+        hashed = await hasher.hash("password123")
+
+        assert await hasher.verify("password123", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+        assert hasher.stats() == {"calls": 3, "rejected": 0, "waiting": 0}
+        hasher.close()
+
+    @pytest.mark.asyncio
+    async def test_refuses_calls_beyond_waiting_limit(self):
+        """With the thread busy and the queue full, calls fail fast."""
+        hasher = PasswordHasher(workers=1, max_waiting=1, queue_timeout=5)
+        release = threading.Event()
+
+        running = asyncio.create_task(hasher._run(release.wait))
+        await asyncio.sleep(0.01)
+        waiting = asyncio.create_task(hasher._run(lambda: True))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(PasswordHasherBusyException):
+            await hasher._run(lambda: True)
+
+        release.set()
+        assert await running is True
+        assert await waiting is True
+        assert hasher.stats() == {"calls": 2, "rejected": 1, "waiting": 0}
+        hasher.close()
+
+    @pytest.mark.asyncio
+    async def test_waiting_times_out(self):
+        """A call waiting longer than queue_timeout is refused."""
+        hasher = PasswordHasher(workers=1, max_waiting=1, queue_timeout=0.05)
+        release = threading.Event()
+        running = asyncio.create_task(hasher._run(release.wait))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(PasswordHasherBusyException):
+            await hasher._run(lambda: True)
+
+        release.set()
+        await running
+        assert hasher.stats()["rejected"] == 1
+        hasher.close()
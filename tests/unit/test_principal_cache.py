@@ -0,0 +1,89 @@
+"""Tests for the principal cache."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.cache import MemoryCacheBackend, SimpleCache
+from app.core.principal_cache import PrincipalCache
+from app.models.enums import OrganizationRole
+from app.models.organization_member import OrganizationMember
+from app.models.user import User
+
+
+def make_cache(ttl: int = 30) -> PrincipalCache:
+    return PrincipalCache(MemoryCacheBackend(SimpleCache()), ttl=ttl)
+
+
+def make_membership(user_id: int, organization_id: int) -> OrganizationMember:
+    return OrganizationMember(
+        id=organization_id * 10,
+        organization_id=organization_id,
+        user_id=user_id,
+        role=OrganizationRole.MANAGER,
+    )
+
+
+class TestPrincipalCache:
+    """Tests for PrincipalCache."""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip_without_password(self):
+        """Users and memberships come back as equal detached copies."""
+        cache = make_cache()
+        created_at = datetime(2024, 1, 1, tzinfo=UTC)
+        await cache.set_user(User(
+            id=1, email="a@example.com", name="A",
+            hashed_password="secret", created_at=created_at,
+        ))
+        await cache.set_membership(make_membership(1, 7))
+
+        user = await cache.get_user(1)
+        membership = await cache.get_membership(1, 7)
+
+        assert (user.id, user.email, user.created_at) == (1, "a@example.com", created_at)
+        assert user.hashed_password is None
+        assert membership.role == OrganizationRole.MANAGER
+        assert membership.can_manage_all_entities()
+        assert await cache.get_membership(1, 8) is None
+
+    @pytest.mark.asyncio
+    async def test_hit_rate(self):
+        """Lookups are counted as hits and misses."""
+        cache = make_cache()
+        await cache.get_membership(1, 7)
+        await cache.set_membership(make_membership(1, 7))
+        for _ in range(3):
+            await cache.get_membership(1, 7)
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (3, 1)
+        assert stats["hit_rate"] == 0.75
+
+    @pytest.mark.asyncio
+    async def test_invalidation(self):
+        """Memberships are dropped one by one or with their user."""
+        cache = make_cache()
+        await cache.set_user(User(id=1, email="a@example.com", name="A"))
+        await cache.set_user(User(id=11, email="b@example.com", name="B"))
+        for organization_id in (7, 8):
+            await cache.set_membership(make_membership(1, organization_id))
+
+        await cache.invalidate_membership(1, 7)
+        assert await cache.get_membership(1, 7) is None
+        assert await cache.get_membership(1, 8) is not None
+
+        await cache.invalidate_user(1)
+        assert await cache.get_user(1) is None
+        assert await cache.get_membership(1, 8) is None
+        assert await cache.get_user(11) is not None
+        assert cache.stats()["invalidations"] == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables(self):
+        """With TTL 0 nothing is stored or counted."""
+        cache = make_cache(ttl=0)
+        await cache.set_membership(make_membership(1, 7))
+
+        assert await cache.get_membership(1, 7) is None
+        assert cache.stats()["misses"] == 0
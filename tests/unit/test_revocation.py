@@ -0,0 +1,149 @@
+"""Tests for token revocation stores."""
+
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.core.exceptions import InvalidTokenException
+from app.core.revocation import RedisRevocationStore, RevocationStore
+
+
+def payload(jti: str = "a", sub: int = 1, iat: float | None = None) -> dict:
+    return {"sub": str(sub), "jti": jti, "iat": iat or time.time(), "exp": time.time() + 60}
+
+
+class TestRevocationStore:
+    """Tests for the process-local store."""
+
+    @pytest.mark.asyncio
+    async def test_revoke_token(self):
+        """A revoked jti is rejected, other tokens of the user are not."""
+        store = RevocationStore()
+        await store.revoke_token("a", time.time() + 60)
+
+        with pytest.raises(InvalidTokenException):
+            store.check(payload("a"))
+        store.check(payload("b"))
+        assert store.stats() == {"tokens": 1, "users": 0, "rejected": 1}
+
+    @pytest.mark.asyncio
+    async def test_revoke_user_cuts_off_older_tokens(self):
+        """User revocation rejects tokens issued before it only."""
+        store = RevocationStore()
+        issued_before = time.time()
+        await store.revoke_user(1)
+
+        assert store.is_revoked(payload(iat=issued_before))
+        assert not store.is_revoked(payload(iat=time.time() + 0.001))
+        assert not store.is_revoked(payload(sub=2, iat=issued_before))
+
+    @pytest.mark.asyncio
+    async def test_sweep_drops_expired_entries(self):
+        """Entries go once the revoked tokens expire anyway."""
+        store = RevocationStore()
+        await store.revoke_token("old", time.time() - 1)
+        await store.revoke_token("new", time.time() + 60)
+
+        assert store.sweep() == 1
+        assert store.stats()["tokens"] == 1
+
+
+class TestRedisRevocationStore:
+    """Tests for the Redis-backed store."""
+
+    @pytest.mark.asyncio
+    async def test_revocation_reaches_other_workers(self):
+        """A revocation on one worker is applied by the others via pub/sub."""
+        server = FakeServer()
+        worker_a = RedisRevocationStore(FakeRedis(server=server))
+        worker_b = RedisRevocationStore(FakeRedis(server=server))
+        await worker_b.start()
+        try:
+            await worker_a.revoke_token("a", time.time() + 60)
+
+            for _ in range(50):
+                if worker_b.is_revoked(payload("a")):
+                    break
+                await asyncio.sleep(0.01)
+            assert worker_b.is_revoked(payload("a"))
+        finally:
+            await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_start_loads_stored_revocations(self):
+        """A worker starting later picks up revocations from Redis."""
+        server = FakeServer()
+        worker_a = RedisRevocationStore(FakeRedis(server=server))
+        issued_before = time.time()
+        await worker_a.revoke_token("a", time.time() + 60)
+        await worker_a.revoke_user(7)
+
+        worker_b = RedisRevocationStore(FakeRedis(server=server))
+        await worker_b.start()
+        try:
+            assert worker_b.is_revoked(payload("a"))
+            assert worker_b.is_revoked(payload("b", sub=7, iat=issued_before))
+            assert worker_b.stats()["users"] == 1
+        finally:
+            await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_listener_resubscribes_after_disconnect(self):
+        """A dropped connection is resubscribed, catching up on missed revocations."""
+        server = FakeServer()
+        worker_a = RedisRevocationStore(FakeRedis(server=server))
+        worker_b = RedisRevocationStore(FakeRedis(server=server), reconnect_delay=0.2)
+
+        # The first subscription's connection drops when killed
+        killed = asyncio.Event()
+        pubsub = worker_b.redis.pubsub
+
+        def dropping_pubsub():
+            subscription = pubsub()
+            if not worker_b.subscriptions:
+                async def listen():
+                    await killed.wait()
+                    raise ConnectionError("Connection closed by server")
+                    yield
+                subscription.listen = listen
+            return subscription
+
+        worker_b.redis.pubsub = dropping_pubsub
+        await worker_b.start()
+        try:
+            assert worker_b.stats()["listener_connected"] == 1
+            killed.set()
+            await asyncio.sleep(0.05)
+            assert worker_b.stats()["listener_connected"] == 0
+
+            # Broadcast while disconnected: missed, but loaded on resubscribe
+            await worker_a.revoke_token("a", time.time() + 60)
+            for _ in range(100):
+                if worker_b.stats()["listener_connected"]:
+                    break
+                await asyncio.sleep(0.01)
+            assert worker_b.is_revoked(payload("a"))
+
+            # Later broadcasts arrive on the new subscription
+            await worker_a.revoke_token("b", time.time() + 60)
+            for _ in range(50):
+                if worker_b.is_revoked(payload("b")):
+                    break
+                await asyncio.sleep(0.01)
+            assert worker_b.is_revoked(payload("b"))
+            assert worker_b.stats()["listener_disconnects"] == 1
+        finally:
+            await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_start_fails_when_redis_unreachable(self):
+        """Startup fails after start_timeout instead of waiting forever."""
+        server = FakeServer()
+        server.connected = False
+        store = RedisRevocationStore(FakeRedis(server=server), start_timeout=0.2)
+
+        with pytest.raises(RuntimeError, match="couldn't subscribe"):
+            await store.start()
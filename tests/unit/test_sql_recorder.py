@@ -0,0 +1,35 @@
+"""Tests for the per-request SQL recorder used by integration tests."""
+
+from tests.sql_recorder import RequestQueries
+
+SELECT_DEAL = "SELECT deals.id FROM deals WHERE deals.id = $1"
+
+
+def make_request(*statements: tuple[str, tuple]) -> RequestQueries:
+    return RequestQueries("GET", "/api/v1/deals/1", "/deals/{deal_id}", list(statements))
+
+
+class TestRequestQueries:
+    """Tests for repeated query detection."""
+
+    def test_identical_selects_are_duplicates(self):
+        """The same SELECT with the same parameters is reported."""
+        request = make_request((SELECT_DEAL, (1,)), (SELECT_DEAL, (1,)))
+
+        assert request.duplicates() == {SELECT_DEAL: 2}
+        assert request.endpoint == "GET /deals/{deal_id}"
+
+    def test_writes_are_not_duplicates(self):
+        """Repeated writes are not flagged."""
+        insert = "INSERT INTO activities (deal_id) VALUES ($1)"
+        request = make_request((insert, (1,)), (insert, (1,)))
+
+        assert request.duplicates() == {}
+
+    def test_n_plus_one(self):
+        """One SELECT per row is reported once the threshold is reached."""
+        request = make_request(*((SELECT_DEAL, (i,)) for i in range(3)))
+
+        assert request.duplicates() == {}
+        assert request.n_plus_one() == {SELECT_DEAL: 3}
+        assert make_request((SELECT_DEAL, (1,)), (SELECT_DEAL, (2,))).n_plus_one() == {}
@@ -0,0 +1,74 @@
+"""Tests for the verified token cache."""
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.core import security
+from app.core.cache import SimpleCache
+from app.core.exceptions import InvalidTokenException
+from app.core.security import create_access_token, verify_access_token
+from app.core.token_cache import TokenCache
+
+
+@pytest.fixture
+def token_cache(monkeypatch) -> TokenCache:
+    cache = TokenCache(SimpleCache(max_entries=10))
+    monkeypatch.setattr(security, "token_cache", cache)
+    return cache
+
+
+class TestTokenCache:
+    """Tests for TokenCache in verify_access_token."""
+
+    def test_second_verify_skips_decode(self, token_cache, monkeypatch):
+        """A verified token is served from the cache."""
+        token = create_access_token(subject=1)
+        payload = verify_access_token(token)
+
+        monkeypatch.setattr(security, "decode_token", pytest.fail)
+
+        assert verify_access_token(token) == payload
+        assert token_cache.stats()["hits"] == 1
+
+    def test_entry_expires_with_token(self, token_cache):
+        """Entries live until the token's exp, not longer."""
+        token = create_access_token(subject=1, expires_delta=timedelta(seconds=5))
+        verify_access_token(token)
+
+        _, expires_at, _ = next(iter(token_cache.cache._cache.values()))
+        assert expires_at <= time.time() + 5
+
+    def test_short_lived_and_invalid_tokens_are_not_cached(self, token_cache):
+        """Tokens about to expire and rejected tokens leave no entry."""
+        verify_access_token(
+            create_access_token(subject=1, expires_delta=timedelta(seconds=1))
+        )
+        with pytest.raises(InvalidTokenException):
+            verify_access_token(security.create_refresh_token(subject=1))
+
+        assert len(token_cache.cache) == 0
+
+    def test_checks_run_on_cached_tokens(self, token_cache):
+        """Checks can reject a token after it was cached."""
+        token = create_access_token(subject=1)
+        verify_access_token(token)
+        revoked = set()
+
+        def check(payload):
+            if payload["sub"] in revoked:
+                raise InvalidTokenException(message="Token has been revoked")
+
+        token_cache.add_check(check)
+        revoked.add("1")
+
+        with pytest.raises(InvalidTokenException):
+            verify_access_token(token)
+
+    def test_disabled_cache(self, monkeypatch):
+        """Without a cache every call decodes."""
+        monkeypatch.setattr(security, "token_cache", TokenCache(None))
+        token = create_access_token(subject=1)
+
+        assert verify_access_token(token) == verify_access_token(token)